@@ -4,6 +4,7 @@ from . import dicom, electronfactors, metersetmap, mosaiq, mudensity, trf
 from ._data import data_path, zenodo_data_paths, zip_data_paths
 from ._delivery import Delivery
 from ._gamma.implementation.shell import gamma_shell as gamma
+from ._gamma.implementation.tiles import gamma_shell_tiles as gamma_tiles
 from ._trf.decode import read_trf as _read_trf
 from ._vendor.deprecated import deprecated as _deprecated
 from ._version import __version__, version_info
@@ -14,15 +14,13 @@
 
 
 import functools
+import hashlib
 from collections import namedtuple
 from typing import Dict, List, Tuple, Type, TypeVar, Union
 
 from pymedphys._imports import numpy as np
 
-from pymedphys._utilities.controlpoints import (
-    remove_irrelevant_control_points,
-    to_tuple,
-)
+from pymedphys._utilities.controlpoints import remove_irrelevant_control_points
 
 # https://stackoverflow.com/a/44644576/3912576
 # Create a generic variable that can be 'Parent', or any subclass.
@@ -35,6 +33,14 @@ DeliveryNamedTuple = namedtuple(
 
 
 class DeliveryBase(DeliveryNamedTuple):
+    """The control point data of a delivery.
+
+    Each field is stored as a read-only, contiguous, float64 NumPy array.
+    Deliveries are hashed and compared by the contents of these arrays so
+    that they can still be used as keys, such as by the
+    ``functools.lru_cache`` methods below.
+    """
+
     @property
     def mu(self):
         return self.monitor_units
@@ -71,18 +77,53 @@ class DeliveryBase(DeliveryNamedTuple):
         return merged
 
     def __new__(cls, *args, **kwargs):
-        new_args = (to_tuple(arg) for arg in args)
-        new_kwargs = {key: to_tuple(item) for key, item in kwargs.items()}
+        new_args = (_to_read_only_array(arg) for arg in args)
+        new_kwargs = {key: _to_read_only_array(item) for key, item in kwargs.items()}
         return super().__new__(cls, *new_args, **new_kwargs)
 
+    def __hash__(self):
+        try:
+            return self.__dict__["_content_hash"]
+        except KeyError:
+            pass
+
+        content_hash = hashlib.blake2b(digest_size=8)
+        for item in self:
+            content_hash.update(str(item.shape).encode())
+            content_hash.update(memoryview(item))
+
+        self.__dict__["_content_hash"] = int.from_bytes(
+            content_hash.digest(), "little", signed=True
+        )
+
+        return self.__dict__["_content_hash"]
+
+    def __eq__(self, other):
+        if not isinstance(other, DeliveryBase):
+            return NotImplemented
+
+        if self is other:
+            return True
+
+        return hash(self) == hash(other) and all(
+            np.array_equal(item, other_item) for item, other_item in zip(self, other)
+        )
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+
+        return not equal
+
     @classmethod
     def _empty(cls: Type[DeliveryGeneric]) -> DeliveryGeneric:
         return cls(
-            tuple(),
-            tuple(),
-            tuple(),
-            tuple((tuple((tuple(), tuple())),)),
-            tuple((tuple(), tuple())),
+            np.zeros(0),
+            np.zeros(0),
+            np.zeros(0),
+            np.zeros((0, 0, 2)),
+            np.zeros((0, 2)),
         )
 
     @functools.lru_cache()
@@ -168,7 +209,7 @@ class DeliveryBase(DeliveryNamedTuple):
         except AssertionError:
             if not allow_missing_angles:
                 print("Allowable gantry angles = {}".format(gantry_angles))
-                gantry = np.array(self.gantry, copy=False)
+                gantry = self.gantry
                 out_of_tolerance = np.unique(
                     gantry[np.sum(masks, axis=0) == 0]
                 ).tolist()
@@ -183,7 +224,7 @@ class DeliveryBase(DeliveryNamedTuple):
         return masks
 
     def _gantry_angle_mask(self, gantry_angle, gantry_angle_tol):
-        near_angle = np.abs(np.array(self.gantry) - gantry_angle) <= gantry_angle_tol
+        near_angle = np.abs(self.gantry - gantry_angle) <= gantry_angle_tol
         assert np.all(np.diff(np.where(near_angle)[0]) == 1)
 
         return near_angle
@@ -191,9 +232,7 @@ class DeliveryBase(DeliveryNamedTuple):
     def _apply_mask_to_delivery_data(self: DeliveryGeneric, mask) -> DeliveryGeneric:
         cls = type(self)
 
-        new_delivery_data = []
-        for item in self:
-            new_delivery_data.append(np.array(item)[mask])
+        new_delivery_data = [item[mask] for item in self]
 
         new_monitor_units = new_delivery_data[0]
         try:
@@ -202,8 +241,7 @@ class DeliveryBase(DeliveryNamedTuple):
             return cls(*new_delivery_data)
 
         new_delivery_data[0] = np.round(
-            np.array(new_delivery_data[0], copy=False) - first_monitor_unit_item,
-            decimals=7,
+            new_delivery_data[0] - first_monitor_unit_item, decimals=7
         )
 
         return cls(*new_delivery_data)
@@ -211,8 +249,21 @@ class DeliveryBase(DeliveryNamedTuple):
     def _strip_delivery_data(self: DeliveryGeneric, skip_size) -> DeliveryGeneric:
         cls = type(self)
 
-        new_delivery_data = []
-        for item in self:
-            new_delivery_data.append(np.array(item)[::skip_size])
+        new_delivery_data = [item[::skip_size] for item in self]
 
         return cls(*new_delivery_data)
+
+
+def _to_read_only_array(item):
+    if (
+        isinstance(item, np.ndarray)
+        and item.dtype == np.float64
+        and item.flags.c_contiguous
+        and not item.flags.writeable
+    ):
+        return item
+
+    array = np.array(item, dtype=np.float64, order="C")
+    array.flags.writeable = False
+
+    return array
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 
+import concurrent.futures
 import functools
 import json
 import logging
@@ -24,13 +25,14 @@ import zipfile
 
 from pymedphys._imports import tqdm
 
-import pymedphys._utilities.filehash
 from pymedphys import _config as pmp_config
+from pymedphys._utilities.parallel import resolve_workers
 
-from . import retry, zenodo
+from . import hashcache, retry, zenodo
 
 HERE = pathlib.Path(__file__).resolve().parent
 DEFAULT_HASHES_PATH = HERE.joinpath("hashes.json")
+VERIFIED_HASHES_FILENAME = "verified-hashes.json"
 
 
 @functools.lru_cache()
@@ -62,7 +64,7 @@ def get_data_dir():
 
 
 def get_file_within_data_zip(zip_name, file_name):
-    dose_data_files = pymedphys.zip_data_paths(zip_name)
+    dose_data_files = zip_data_paths(zip_name)
     path_match = [path for path in dose_data_files if path.name == file_name]
 
     if len(path_match) != 1:
@@ -93,14 +95,53 @@ def get_url(filename):
     return url
 
 
-def download_all():
+@functools.lru_cache()
+def get_verified_hashes():
+    """The record of the hashes of the files within the data directory
+    which have already been verified."""
+    return hashcache.VerifiedHashes(get_data_dir().joinpath(VERIFIED_HASHES_FILENAME))
+
+
+def download_all(workers=None):
+    """Download all of the data files recorded within ``urls.json``.
+
+    Parameters
+    ----------
+    workers : int, optional
+        When more than one, files that have already been downloaded are
+        first hashed on this many threads, with ``-1`` using one per
+        core. By default files are hashed one at a time as they are
+        checked.
+    """
+    file_names = list(get_url_map().keys())
+
+    workers = resolve_workers(workers)
+    if workers > 1:
+        prewarm_hashes(file_names, workers)
+
     paths = []
-    for file_name in get_url_map().keys():
+    for file_name in file_names:
         paths.append(data_path(file_name))
 
+    get_verified_hashes().save()
+
     return paths
 
 
+def prewarm_hashes(file_names, workers):
+    """Hash the already downloaded files among ``file_names`` on a thread
+    pool, so that later hash checks of unchanged files do not need to
+    read them."""
+    filepaths = [get_data_dir().joinpath(file_name) for file_name in file_names]
+    filepaths = [filepath for filepath in filepaths if filepath.exists()]
+
+    verified_hashes = get_verified_hashes()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(verified_hashes.hash_file, filepaths))
+
+    verified_hashes.save()
+
+
 def data_path(
     filename,
     check_hash=True,
@@ -157,14 +198,21 @@ class NoHashFound(KeyError):
     pass
 
 
+@functools.lru_cache()
+def get_hashes(hash_filepath):
+    """The recorded hashes of the data files, loaded once per process."""
+    with open(hash_filepath, "r") as hash_file:
+        hashes = json.load(hash_file)
+
+    return hashes
+
+
 def get_cached_filehash(filename, hash_filepath=None):
     if hash_filepath is None:
         hash_filepath = DEFAULT_HASHES_PATH
 
     filename = str(filename).replace(os.sep, "/")
-
-    with open(hash_filepath, "r") as hash_file:
-        hashes = json.load(hash_file)
+    hashes = get_hashes(hash_filepath)
 
     try:
         cached_filehash = hashes[filename]
@@ -183,11 +231,7 @@ def data_file_hash_check(filename, hash_filepath=None):
     filename = str(filename).replace(os.sep, "/")
 
     filepath = get_data_dir().joinpath(filename)
-    calculated_filehash = (
-        pymedphys._utilities.filehash.hash_file(  # pylint: disable = protected-access
-            filepath
-        )
-    )
+    calculated_filehash = get_verified_hashes().hash_file(filepath)
 
     logging.debug("Calculated filehash is %s", calculated_filehash)
 
@@ -197,9 +241,7 @@ def data_file_hash_check(filename, hash_filepath=None):
         logging.debug("Cached filehash is %s", cached_filehash)
     except NoHashFound:
         logging.warning("Hash not found in %s. File will be updated.", hash_filepath)
-        with open(hash_filepath, "r") as hash_file:
-            hashes = json.load(hash_file)
-
+        hashes = get_hashes(hash_filepath)
         hashes[filename] = calculated_filehash
 
         with open(hash_filepath, "w") as hash_file:
@@ -0,0 +1,127 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""A record of the hashes of previously hashed files, so that a file is
+only hashed again once it has changed.
+"""
+
+import atexit
+import json
+import os
+import pathlib
+import tempfile
+import threading
+
+from pymedphys._utilities.filehash import hash_file
+
+
+class VerifiedHashes:
+    """The SHA1 hashes of files, stored within a JSON file.
+
+    Each hash is recorded along with the size, modification time and
+    inode of the file at the time it was hashed. The file is only hashed
+    again once any of these have changed.
+
+    Newly found hashes are kept in memory until :meth:`save` is called,
+    which is also done at exit. Saving merges them with the record on
+    disk, so that hashes saved by other processes in the meantime are
+    kept, and drops the entries of files that no longer exist.
+
+    Parameters
+    ----------
+    filepath : pathlike
+        The JSON file in which to store the hashes.
+    """
+
+    def __init__(self, filepath):
+        self.filepath = pathlib.Path(filepath)
+
+        self._lock = threading.Lock()
+        self._entries = None
+        self._unsaved = {}
+        self._save_registered = False
+
+    def hash_file(self, filepath) -> str:
+        """The SHA1 of a file, only read from disk should the file have
+        changed since it was last hashed."""
+        key = str(pathlib.Path(filepath).resolve())
+        file_stat = _stat(filepath)
+
+        with self._lock:
+            entry = self._load().get(key)
+
+        if entry is not None and entry["stat"] == file_stat:
+            return entry["sha1"]
+
+        filehash = hash_file(filepath)
+
+        # A file that changed while it was being hashed is not recorded
+        if _stat(filepath) == file_stat:
+            with self._lock:
+                entry = {"stat": file_stat, "sha1": filehash}
+                self._load()[key] = entry
+                self._unsaved[key] = entry
+
+                if not self._save_registered:
+                    atexit.register(self.save)
+                    self._save_registered = True
+
+        return filehash
+
+    def save(self):
+        """Merge any newly found hashes into the record on disk."""
+        with self._lock:
+            if not self._unsaved:
+                return
+
+            entries = _read_entries(self.filepath)
+            entries.update(self._unsaved)
+            entries = {
+                key: entry for key, entry in entries.items() if os.path.exists(key)
+            }
+
+            self.filepath.parent.mkdir(parents=True, exist_ok=True)
+
+            # Written to a temporary file first so that other processes
+            # never read a partially written record
+            with tempfile.NamedTemporaryFile(
+                "w", dir=self.filepath.parent, suffix=".tmp", delete=False
+            ) as f:
+                json.dump(entries, f, indent=2, sort_keys=True)
+
+            os.replace(f.name, self.filepath)
+
+            self._entries = entries
+            self._unsaved = {}
+
+    def _load(self):
+        if self._entries is None:
+            self._entries = _read_entries(self.filepath)
+
+        return self._entries
+
+
+def _read_entries(filepath):
+    try:
+        with open(filepath, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _stat(filepath):
+    stat = os.stat(filepath)
+
+    return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
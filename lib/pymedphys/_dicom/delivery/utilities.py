@@ -47,7 +47,7 @@ def angle_dd2dcm(angle):
     movement[diff < 0] = "CC"
     movement[diff == 0] = "NONE"
 
-    converted_angle = np.array(angle, copy=False)
+    converted_angle = np.array(angle, copy=True)
     converted_angle[converted_angle < 0] = converted_angle[converted_angle < 0] + 360
 
     converted_angle = converted_angle.astype(str).tolist()
@@ -16,9 +16,22 @@
 """Model insert factors and parameterise inserts as equivalent ellipses."""
 
 
+import functools
+from concurrent import futures
+
 from pymedphys._imports import numpy as np
 from pymedphys._imports import scipy, shapely
 
+from pymedphys._utilities.parallel import resolve_workers
+
+from . import pole
+
+CIRCLE_SEARCH_METHODS = ("pole", "basinhopping")
+
+DEFORMABILITY_DEVIATION = 0.02
+DEFORMABILITY_CACHE_SIZE = 32
+MIN_POINTS_PER_WORKER = 64
+
 
 def spline_model(
     width_test, ratio_perim_area_test, width_data, ratio_perim_area_data, factor_data
@@ -101,7 +114,7 @@ def _single_calculate_deformability(x_test, y_test, x_data, y_data, z_data):
         question.
 
     """
-    deviation = 0.02
+    deviation = DEFORMABILITY_DEVIATION
 
     adjusted_x_data = np.append(x_data, x_test)
     adjusted_y_data = np.append(y_data, y_test)
@@ -137,18 +150,25 @@ def _single_calculate_deformability(x_test, y_test, x_data, y_data, z_data):
     return deformability
 
 
-def calculate_deformability(x_test, y_test, x_data, y_data, z_data):
+def calculate_deformability(x_test, y_test, x_data, y_data, z_data, workers=None):
     """Return the result of the deformability test.
 
-    This function takes an array of test points and loops over
-    ``_single_calculate_deformability``.
-
     The deformability test applies a shift to the spline to determine whether
     or not sufficient information for modelling is available. For further
     details on the deformability test see the *Methods: Defining valid
     prediction regions of the spline* section within
     <http://dx.doi.org/10.1016/j.ejmp.2015.11.002>.
 
+    When the least squares polynomial of the spline's order is within the
+    spline's smoothing condition, which is the case for insert factors,
+    every spline fitted by the test is that polynomial. The deformability
+    at each test point is then the leverage, ``h / (1 + h)``, that a data
+    point added there would have on the fit, and it is calculated for all
+    test points at once from a single factorisation of the model data.
+    Otherwise ``_single_calculate_deformability`` is called for each test
+    point. The setup and results for the most recently used model data
+    sets are kept in memory.
+
     Parameters
     ----------
     x_test : np.ndarray
@@ -161,6 +181,10 @@ def calculate_deformability(x_test, y_test, x_data, y_data, z_data):
         The y coordinate of the model data to test
     z_data : np.ndarray
         The z coordinate of the model data to test
+    workers : int, optional
+        The number of processes over which to test points that can't use
+        the polynomial, ``-1`` using all of the available cores. By
+        default they are tested serially.
 
     Returns
     -------
@@ -171,41 +195,130 @@ def calculate_deformability(x_test, y_test, x_data, y_data, z_data):
         question.
 
     """
-    dim = np.shape(x_test)
+    x_test, y_test = np.broadcast_arrays(
+        np.asarray(x_test, dtype=float), np.asarray(y_test, dtype=float)
+    )
+    model = _deformability_model(
+        tuple(np.ravel(x_data).astype(float)),
+        tuple(np.ravel(y_data).astype(float)),
+        tuple(np.ravel(z_data).astype(float)),
+    )
 
-    if np.size(dim) == 0:
-        deformability = _single_calculate_deformability(
-            x_test, y_test, x_data, y_data, z_data
+    if model.polynomial_factor is not None:
+        deformability = _polynomial_deformability(
+            x_test, y_test, model.scale, model.polynomial_factor
         )
-
-    elif np.size(dim) == 1:
-        deformability = np.array(
-            [
-                _single_calculate_deformability(
-                    x_test[i], y_test[i], x_data, y_data, z_data
-                )
-                for i in range(dim[0])
-            ]
+    else:
+        deformability = _spline_deformability(
+            np.ravel(x_test), np.ravel(y_test), model, resolve_workers(workers)
+        ).reshape(x_test.shape)
+
+    return deformability[()]
+
+
+class _DeformabilityModel:
+    def __init__(self, x_data, y_data, z_data):
+        self.x_data = np.array(x_data)
+        self.y_data = np.array(y_data)
+        self.z_data = np.array(z_data)
+        self.results = {}
+
+        # Coordinates are centred and scaled so that the polynomial
+        # terms are well conditioned
+        self.scale = (
+            np.mean(self.x_data),
+            np.std(self.x_data) or 1,
+            np.mean(self.y_data),
+            np.std(self.y_data) or 1,
         )
+        self.polynomial_factor = self._polynomial_factor()
+
+    def _polynomial_factor(self):
+        """The triangular factor of the least squares polynomial, or
+        ``None`` should the spline fits not all be that polynomial."""
+        number_of_terms = 6
+        if len(self.z_data) <= number_of_terms:
+            return None
+
+        terms = _polynomial_terms(self.x_data, self.y_data, self.scale)
+        orthogonal, triangular = np.linalg.qr(terms)
+
+        if np.linalg.cond(triangular) > 1e8:
+            return None
+
+        residuals = self.z_data - orthogonal @ (orthogonal.T @ self.z_data)
+
+        # FITPACK returns the least squares polynomial when its sum of
+        # squared residuals is within the smoothing factor, which is the
+        # number of data points by default. The margin covers both the
+        # tolerance FITPACK applies to this test and the residual that a
+        # point shifted by the deviation adds.
+        if np.sum(residuals**2) > 0.99 * len(self.z_data):
+            return None
+
+        return triangular
+
+
+@functools.lru_cache(maxsize=DEFORMABILITY_CACHE_SIZE)
+def _deformability_model(x_data, y_data, z_data):
+    return _DeformabilityModel(x_data, y_data, z_data)
+
+
+def _polynomial_terms(x, y, scale):
+    x_mean, x_std, y_mean, y_std = scale
+    x = (x - x_mean) / x_std
+    y = (y - y_mean) / y_std
+
+    return np.stack([np.ones_like(x), x, x**2, y, x * y, x**2 * y], axis=-1)
+
+
+def _polynomial_deformability(x_test, y_test, scale, triangular):
+    terms = _polynomial_terms(x_test, y_test, scale).reshape(-1, len(triangular))
+    leverage = np.sum(
+        scipy.linalg.solve_triangular(triangular, terms.T, trans="T") ** 2, axis=0
+    )
+
+    return (leverage / (1 + leverage)).reshape(x_test.shape)
+
+
+def _spline_deformability(x_test, y_test, model, workers):
+    points = list(zip(x_test.tolist(), y_test.tolist()))
+    missing = list(
+        dict.fromkeys(point for point in points if point not in model.results)
+    )
+
+    workers = max(min(workers, len(missing) // MIN_POINTS_PER_WORKER), 1)
+    calculate = functools.partial(
+        _single_calculate_deformability,
+        x_data=model.x_data,
+        y_data=model.y_data,
+        z_data=model.z_data,
+    )
 
+    if workers == 1:
+        results = [calculate(x, y) for x, y in missing]
     else:
-        deformability = np.array(
-            [
-                [
-                    _single_calculate_deformability(
-                        x_test[i, j], y_test[i, j], x_data, y_data, z_data
-                    )
-                    for j in range(dim[1])
-                ]
-                for i in range(dim[0])
-            ]
-        )
+        with futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(
+                executor.map(
+                    calculate,
+                    *zip(*missing),
+                    chunksize=MIN_POINTS_PER_WORKER,
+                )
+            )
 
-    return deformability
+    model.results.update(zip(missing, results))
+
+    return np.array([model.results[point] for point in points], dtype=float)
 
 
 def spline_model_with_deformability(
-    width_test, ratio_perim_area_test, width_data, ratio_perim_area_data, factor_data
+    width_test,
+    ratio_perim_area_test,
+    width_data,
+    ratio_perim_area_data,
+    factor_data,
+    workers=None,
 ):
     """Return the spline model for points with sufficient deformability.
 
@@ -231,6 +344,8 @@ def spline_model_with_deformability(
     factor_data : np.ndarray
         The insert factor data points for the
         relevant applicator, energy and ssd.
+    workers : int, optional
+        Passed to ``calculate_deformability``.
 
     Returns
     -------
@@ -246,6 +361,7 @@ def spline_model_with_deformability(
         width_data,
         ratio_perim_area_data,
         factor_data,
+        workers=workers,
     )
 
     model_factor = spline_model(
@@ -310,8 +426,33 @@ def shapely_insert(x, y):
     return shapely.geometry.Polygon(np.transpose((x, y)))
 
 
-def search_for_centre_of_largest_bounded_circle(x, y, callback=None):
-    """Find the centre of the largest bounded circle within the insert."""
+def search_for_centre_of_largest_bounded_circle(
+    x, y, callback=None, method="pole", precision=pole.PRECISION
+):
+    """Find the centre of the largest bounded circle within the insert.
+
+    By default this is found deterministically as the insert's pole of
+    inaccessibility, to within ``precision`` of the largest circle's
+    radius. Pass ``method="basinhopping"`` to instead search for it with
+    :func:`scipy.optimize.basinhopping`, in which case ``precision`` is
+    not used.
+    """
+    if method == "pole":
+        return pole.pole_of_inaccessibility(
+            x, y, precision=precision, callback=callback
+        )
+
+    if method != "basinhopping":
+        raise ValueError(
+            f"`method` must be one of {CIRCLE_SEARCH_METHODS}, got {method!r}"
+        )
+
+    return _basinhopping_search_for_centre_of_largest_bounded_circle(
+        x, y, callback=callback
+    )
+
+
+def _basinhopping_search_for_centre_of_largest_bounded_circle(x, y, callback=None):
     insert = shapely_insert(x, y)
     boundary = insert.boundary
     centroid = insert.centroid
@@ -372,9 +513,15 @@ def calculate_length(x, y, width):
     return length
 
 
-def parameterise_insert(x, y, callback=None):
-    """Return the parameterisation of an insert given x and y coords."""
-    circle_centre = search_for_centre_of_largest_bounded_circle(x, y, callback=callback)
+def parameterise_insert(x, y, callback=None, method="pole", precision=pole.PRECISION):
+    """Return the parameterisation of an insert given x and y coords.
+
+    See ``search_for_centre_of_largest_bounded_circle`` for the ``method``
+    and ``precision`` parameters.
+    """
+    circle_centre = search_for_centre_of_largest_bounded_circle(
+        x, y, callback=callback, method=method, precision=precision
+    )
     width = calculate_width(x, y, circle_centre)
     length = calculate_length(x, y, width)
 
@@ -452,7 +599,7 @@ def convert2_ratio_perim_area(width, length):
     return perimeter / area
 
 
-def create_transformed_mesh(width_data, length_data, factor_data):
+def create_transformed_mesh(width_data, length_data, factor_data, workers=None):
     """Return factor data meshgrid."""
     x = np.arange(
         np.floor(np.min(width_data)) - 1, np.ceil(np.max(width_data)) + 1, 0.1
@@ -469,6 +616,7 @@ def create_transformed_mesh(width_data, length_data, factor_data):
         width_data,
         convert2_ratio_perim_area(width_data, length_data),
         factor_data,
+        workers=workers,
     )
 
     zz[xx > yy] = np.nan
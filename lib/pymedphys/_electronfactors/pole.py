@@ -0,0 +1,175 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Find the centre of the largest circle that fits within an insert.
+
+This is the insert's pole of inaccessibility, found by subdividing square
+cells over the insert, as described at
+<https://github.com/mapbox/polylabel>. The distance from a cell's centre
+to the insert's edge, plus half the cell's diagonal, bounds how far from
+the edge any point within that cell can be. Only cells that could hold a
+point further from the edge than the best found so far, by more than the
+requested precision, are split. Each generation of cells is evaluated
+at once with numpy.
+"""
+
+from pymedphys._imports import numpy as np
+
+PRECISION = 0.001
+MAX_CHUNK_SIZE = 2**20
+
+QUADRANTS = ((-1, -1), (1, -1), (-1, 1), (1, 1))
+
+
+def pole_of_inaccessibility(x, y, precision=PRECISION, callback=None):
+    """Find the point within an insert furthest from its edge.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        The x coordinates of the insert outline.
+    y : np.ndarray
+        The y coordinates of the insert outline.
+    precision : float, optional
+        How much closer to the edge, in the units of ``x`` and ``y``, the
+        returned point is allowed to be than the true pole of
+        inaccessibility. By default ``0.001``.
+    callback : callable, optional
+        Called as ``callback(centre, -distance, True)`` each time a point
+        further from the edge is found, matching the signature of a
+        :func:`scipy.optimize.basinhopping` callback.
+
+    Returns
+    -------
+    centre : np.ndarray
+        The x and y coordinates of the point.
+    """
+    if precision <= 0:
+        raise ValueError("`precision` must be greater than zero")
+
+    starts, ends = _insert_segments(x, y)
+
+    min_x, min_y = np.min(starts, axis=0)
+    max_x, max_y = np.max(starts, axis=0)
+    cell_size = min(max_x - min_x, max_y - min_y)
+    if cell_size == 0:
+        raise ValueError("The insert has no area")
+
+    half_size = cell_size / 2
+
+    initial_guesses = np.array(
+        [_centroid(starts, ends), [(min_x + max_x) / 2, (min_y + max_y) / 2]]
+    )
+    initial_distances = signed_distance_to_edge(initial_guesses, starts, ends)
+    best_index = np.argmax(initial_distances)
+    best_centre = initial_guesses[best_index]
+    best_distance = initial_distances[best_index]
+
+    if callback is not None:
+        callback(best_centre, -best_distance, True)
+
+    xx, yy = np.meshgrid(
+        np.arange(min_x, max_x, cell_size) + half_size,
+        np.arange(min_y, max_y, cell_size) + half_size,
+    )
+    centres = np.column_stack((xx.ravel(), yy.ravel()))
+    quadrants = np.array(QUADRANTS)
+
+    while len(centres) > 0:
+        distances = signed_distance_to_edge(centres, starts, ends)
+
+        index = np.argmax(distances)
+        if distances[index] > best_distance:
+            best_centre = centres[index]
+            best_distance = distances[index]
+
+            if callback is not None:
+                callback(best_centre, -best_distance, True)
+
+        could_be_further = distances + half_size * np.sqrt(2) - best_distance
+        centres = centres[could_be_further > precision]
+
+        half_size = half_size / 2
+        centres = centres[:, None, :] + quadrants * half_size
+        centres = centres.reshape(-1, 2)
+
+    return best_centre
+
+
+def signed_distance_to_edge(points, starts, ends):
+    """The distance from each point to the nearest edge segment, negative
+    for points outside of the insert."""
+    chunk_size = max(1, MAX_CHUNK_SIZE // len(starts))
+
+    return np.concatenate(
+        [
+            _signed_distance_to_edge(points[i : i + chunk_size], starts, ends)
+            for i in range(0, len(points), chunk_size)
+        ]
+    )
+
+
+def _signed_distance_to_edge(points, starts, ends):
+    point_x = points[:, 0, None]
+    point_y = points[:, 1, None]
+    start_x, start_y = starts.T
+    end_x, end_y = ends.T
+
+    segment_x = end_x - start_x
+    segment_y = end_y - start_y
+
+    along_segment = np.clip(
+        ((point_x - start_x) * segment_x + (point_y - start_y) * segment_y)
+        / (segment_x**2 + segment_y**2),
+        0,
+        1,
+    )
+    distance = np.min(
+        np.hypot(
+            point_x - start_x - along_segment * segment_x,
+            point_y - start_y - along_segment * segment_y,
+        ),
+        axis=1,
+    )
+
+    # Even-odd rule, counting the edges crossed by a ray cast in the
+    # positive x direction
+    straddles = (start_y > point_y) != (end_y > point_y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crossing_x = start_x + (point_y - start_y) * segment_x / segment_y
+    crossings = np.count_nonzero(straddles & (point_x < crossing_x), axis=1)
+    inside = crossings % 2 == 1
+
+    return np.where(inside, distance, -distance)
+
+
+def _insert_segments(x, y):
+    starts = np.column_stack((np.ravel(x), np.ravel(y))).astype(float)
+    ends = np.roll(starts, -1, axis=0)
+
+    has_length = np.any(starts != ends, axis=1)
+    if np.count_nonzero(has_length) < 3:
+        raise ValueError("An insert needs at least three distinct points")
+
+    return starts[has_length], ends[has_length]
+
+
+def _centroid(starts, ends):
+    cross = starts[:, 0] * ends[:, 1] - ends[:, 0] * starts[:, 1]
+    area = np.sum(cross) / 2
+    if area == 0:
+        return np.mean(starts, axis=0)
+
+    return np.sum((starts + ends) * cross[:, None], axis=0) / (6 * area)
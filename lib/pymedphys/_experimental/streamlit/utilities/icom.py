@@ -22,6 +22,7 @@ from pymedphys._imports import numpy as np
 from pymedphys._imports import pandas as pd
 from pymedphys._imports import streamlit as st
 
+import pymedphys._icom.archive as pmp_icom_archive
 import pymedphys._icom.delivery as pmp_icom_delivery
 import pymedphys._icom.extract as pmp_icom_extract
 
@@ -155,24 +156,18 @@ def _get_relevant_times(filepath):
 
 @st.cache(show_spinner=False)
 def get_icom_datetimes_meterset_machine(filepath):
-    icom_stream = read_icom_log(filepath)
+    # Read from the archive's index, so that the archive itself does not
+    # need to be decompressed
+    index = pmp_icom_archive.get_index(filepath)
 
-    icom_data_points = pmp_icom_extract.get_data_points(icom_stream)
     icom_datetime = pd.to_datetime(
-        pd.Series([item[8:26].decode() for item in icom_data_points], name="datetime"),
+        pd.Series(index.timestamps, name="datetime", dtype=str),
         format="%Y-%m-%d%H:%M:%S",
     )
     _adjust_icom_datetime_to_remove_duplicates(icom_datetime)
 
-    meterset = pd.Series(
-        [pmp_icom_extract.extract(item, "Delivery MU")[1] for item in icom_data_points],
-        name="meterset",
-    )
-
-    machine_id = pd.Series(
-        [pmp_icom_extract.extract(item, "Machine ID")[1] for item in icom_data_points],
-        name="machine_id",
-    )
+    meterset = pd.Series(index.metersets, name="meterset")
+    machine_id = pd.Series(index.machine_ids, name="machine_id", dtype=object)
 
     return icom_datetime, meterset, machine_id
 
@@ -195,8 +190,7 @@ def _adjust_icom_datetime_to_remove_duplicates(icom_datetime):
 # the issue here.
 @st.cache(show_spinner=False, allow_output_mutation=True)
 def get_icom_dataset(filepath):
-    icom_stream = read_icom_log(filepath)
-    icom_data_points = pmp_icom_extract.get_data_points(icom_stream)
+    icom_data_points = pmp_icom_archive.read_frames(filepath)
 
     icom_datetime, meterset, machine_id = get_icom_datetimes_meterset_machine(filepath)
 
@@ -209,24 +203,24 @@ def get_icom_dataset(filepath):
 
     turn_table = pd.Series(
         [
-            pmp_icom_extract.extract(item, "Table Isocentric")[1]
+            pmp_icom_extract.get_field(item, "Table Isocentric")
             for item in icom_data_points
         ],
         name="turn_table",
     )
 
     energy = pd.Series(
-        [pmp_icom_extract.extract(item, "Energy")[1] for item in icom_data_points],
+        [pmp_icom_extract.get_field(item, "Energy") for item in icom_data_points],
         name="energy",
     )
 
     interlocks = pd.Series(
-        [pmp_icom_extract.extract(item, "Interlocks")[1] for item in icom_data_points],
+        [pmp_icom_extract.get_field(item, "Interlocks") for item in icom_data_points],
         name="interlocks",
     )
 
     beam_timer = pd.Series(
-        [pmp_icom_extract.extract(item, "Beam Timer")[1] for item in icom_data_points],
+        [pmp_icom_extract.get_field(item, "Beam Timer") for item in icom_data_points],
         name="beam_timer",
     )
 
@@ -13,7 +13,7 @@
 
 from pymedphys._dicom.dose import zyx_and_dose_from_dataset
 
-from ..implementation import gamma_filter_numpy, gamma_shell
+from ..implementation import gamma_filter_numpy, gamma_kdtree, gamma_shell
 from ..utilities import calculate_pass_rate
 
 
@@ -49,7 +49,31 @@ def gamma_percent_pass(
     method="shell",
     **kwargs
 ):
-
+    """Calculate the gamma pass rate between two DICOM dose files.
+
+    Parameters
+    ----------
+    dcm_ref_filepath
+        The reference DICOM dose dataset.
+    dcm_eval_filepath
+        The evaluation DICOM dose dataset.
+    dose_percent_threshold : float
+        The percent dose threshold
+    distance_mm_threshold : float
+        The gamma distance threshold.
+    method : str, optional
+        One of ``"shell"``, ``"kdtree"`` or ``"filter"``. Defaults to
+        ``"shell"``.
+    **kwargs
+        Passed on to the chosen method. Note that ``workers`` is the number
+        of processes for ``"shell"`` but the number of threads for
+        ``"kdtree"``, whose k-d tree queries release the GIL.
+
+    Returns
+    -------
+    percent_pass
+        The percent of the calculated points that pass.
+    """
     axes_reference, dose_reference = zyx_and_dose_from_dataset(dcm_ref_filepath)
     axes_evaluation, dose_evaluation = zyx_and_dose_from_dataset(dcm_eval_filepath)
 
@@ -66,6 +90,19 @@ def gamma_percent_pass(
 
         percent_pass = calculate_pass_rate(gamma)
 
+    elif method == "kdtree":
+        gamma = gamma_kdtree(
+            axes_reference,
+            dose_reference,
+            axes_evaluation,
+            dose_evaluation,
+            dose_percent_threshold,
+            distance_mm_threshold,
+            **kwargs
+        )
+
+        percent_pass = calculate_pass_rate(gamma)
+
     elif method == "filter":
         percent_pass = gamma_filter_numpy(
             axes_reference,
@@ -77,6 +114,6 @@ def gamma_percent_pass(
             **kwargs
         )
     else:
-        raise ValueError("method should be either `shell` or `filter`")
+        raise ValueError("method should be one of `shell`, `kdtree` or `filter`")
 
     return percent_pass
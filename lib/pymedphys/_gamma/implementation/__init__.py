@@ -14,4 +14,6 @@
 
 
 from .filter import gamma_filter_numpy
+from .kdtree import gamma_kdtree
 from .shell import gamma_shell
+from .tiles import GammaTile, gamma_shell_tiles
@@ -0,0 +1,936 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Compare two dose grids with the gamma index using a k-d tree.
+
+Gamma is the minimum distance between a reference point and the
+evaluation dose distribution within a space where each spatial axis has
+been divided by the distance threshold and the dose axis has been
+divided by the dose threshold. With the evaluation dose sampled as a
+point cloud within that space, finding gamma for a reference point is
+a nearest-neighbour query. See <http://dx.doi.org/10.1118/1.2836952>.
+
+The nearest sampled point is then refined upon the multilinearly
+interpolated evaluation dose, so that the accuracy does not depend on
+supersampling the whole evaluation grid.
+"""
+
+import itertools
+import logging
+from warnings import warn
+
+from pymedphys._imports import numpy as np
+from pymedphys._imports import scipy
+
+from pymedphys._utilities.parallel import resolve_workers
+
+from .shell import DEFAULT_RAM, GammaInternalFixedOptions, format_gamma_results
+
+# An approximate number of bytes used per evaluation point per dimension
+# of the k-d tree, covering the point data, the tree's internal copy,
+# and its index arrays.
+BYTES_PER_TREE_VALUE = 24
+
+# The number of Gauss-Newton steps used to refine each point's gamma upon
+# the interpolated evaluation dose.
+GAUSS_NEWTON_ITERATIONS = 10
+
+# With local gamma, reference points whose dose scales are within this
+# ratio of each other share a k-d tree.
+DOSE_SCALE_BIN_RATIO = 1.25
+
+
+def gamma_kdtree(
+    axes_reference,
+    dose_reference,
+    axes_evaluation,
+    dose_evaluation,
+    dose_percent_threshold,
+    distance_mm_threshold,
+    lower_percent_dose_cutoff=20,
+    interp_fraction=10,
+    interpolator="econforge",
+    max_gamma=None,
+    local_gamma=False,
+    global_normalisation=None,
+    skip_once_passed=False,
+    random_subset=None,
+    ram_available=DEFAULT_RAM,
+    quiet=None,
+    workers=None,
+):
+    """Compare two dose grids with the gamma index using a k-d tree.
+
+    Called in the same way as :func:`pymedphys.gamma`, except that
+    ``interpolator`` and ``skip_once_passed`` have no effect and
+    ``precision`` is not available. A k-d tree is built over the
+    evaluation dose once per threshold combination, with extra samples
+    along the grid edges within steep dose gradients. Each
+    reference point's gamma is a nearest-neighbour query of that tree
+    followed by a few Gauss-Newton steps upon the interpolated evaluation
+    dose. The result is never lower than the true minimum gamma of the
+    interpolated evaluation dose.
+
+    Parameters
+    ----------
+    axes_reference : tuple
+        The reference coordinates.
+    dose_reference : np.array
+        The reference dose grid.
+    axes_evaluation : tuple
+        The evaluation coordinates.
+    dose_evaluation : np.array
+        The evaluation dose grid. This grid is multilinearly interpolated
+        and indexed by the k-d tree.
+    dose_percent_threshold : float
+        The percent dose threshold
+    distance_mm_threshold : float
+        The gamma distance threshold. Units must
+        match of the coordinates given.
+    lower_percent_dose_cutoff : float, optional
+        The percent lower dose cutoff below which gamma will not be calculated.
+        This is only applied to the reference grid.
+    interp_fraction : float, optional
+        The fraction which the dose threshold is divided into to determine
+        the largest dose step between samples along the evaluation grid
+        edges. Defaults to 10.
+    interpolator : str, optional
+        Accepted for compatibility with :func:`pymedphys.gamma`. The
+        evaluation grid is always multilinearly interpolated by this
+        function, so a value other than ``"econforge"`` raises a warning
+        that it has no effect.
+    max_gamma : float, optional
+        The maximum gamma searched for. Gamma values larger than this are
+        capped to this value. Defaults to :obj:`np.inf`
+    local_gamma
+        Designates local gamma should be used instead of global. Defaults to
+        False.
+    global_normalisation : float, optional
+        The dose normalisation value that the percent inputs calculate from.
+        Defaults to the maximum value of :obj:`dose_reference`.
+    skip_once_passed : bool, optional
+        Accepted for compatibility with :func:`pymedphys.gamma`. Each
+        nearest-neighbour query finds the minimum gamma directly, so
+        passing gamma values are not left at the first value below one
+        found. Setting this to ``True`` raises a warning that it has no
+        effect.
+    random_subset : int, optional
+        Used to only calculate a random subset of the reference grid. The
+        number chosen is how many random points to calculate.
+    ram_available : int, optional
+        The number of bytes of RAM available for use by this function.
+        The evaluation grid and the reference points are split into
+        blocks so that each k-d tree fits within this.
+    quiet : bool, optional
+        Deprecated but maintained for now for backwards compatibility.
+    workers : int, optional
+        The number of threads, not processes as for :func:`pymedphys.gamma`,
+        used for the k-d tree queries. The queries release the GIL, so
+        threads avoid copying the trees into each process. Pass -1 to use
+        all available cores. Defaults to None, which runs serially.
+
+    Returns
+    -------
+    gamma
+        The array of gamma values the same shape as that
+        given by the reference coordinates and dose.
+    """
+    if quiet is not None:
+        warn(
+            "Parameter `quiet` will be deprecated in the future",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+
+    if interpolator != "econforge":
+        warn(
+            "Parameter `interpolator` has no effect within `gamma_kdtree`, "
+            "the evaluation dose is always multilinearly interpolated",
+            stacklevel=2,
+        )
+
+    if skip_once_passed:
+        warn(
+            "Parameter `skip_once_passed` has no effect within `gamma_kdtree`, "
+            "the minimum gamma is always found",
+            stacklevel=2,
+        )
+
+    # The interpolator is None as the evaluation dose is interpolated here
+    # rather than by the gamma shell's evaluation interpolator.
+    options = GammaInternalFixedOptions.from_user_inputs(
+        axes_reference,
+        dose_reference,
+        axes_evaluation,
+        dose_evaluation,
+        dose_percent_threshold,
+        distance_mm_threshold,
+        lower_percent_dose_cutoff,
+        interp_fraction,
+        None,
+        max_gamma,
+        local_gamma,
+        global_normalisation,
+        skip_once_passed,
+        random_subset,
+        ram_available,
+        quiet,
+    )
+
+    workers = resolve_workers(workers)
+
+    axes_evaluation, dose_evaluation = _ascending_evaluation_grid(options)
+
+    reference_points = options.flat_mesh_axes_reference[
+        :, options.reference_points_to_calc
+    ].T
+    reference_dose = options.flat_dose_reference[options.reference_points_to_calc]
+
+    current_gamma = np.inf * np.ones(
+        (
+            len(options.flat_dose_reference),
+            len(options.dose_percent_threshold),
+            len(options.distance_mm_threshold),
+        )
+    )
+
+    for j, distance_threshold in enumerate(options.distance_mm_threshold):
+        for i, dose_threshold in enumerate(options.dose_percent_threshold):
+            logging.debug(
+                "Querying k-d trees for %s%% / %s mm",
+                dose_threshold,
+                distance_threshold,
+            )
+
+            if options.local_gamma:
+                dose_scale = dose_threshold / 100 * reference_dose
+            else:
+                dose_scale = np.full_like(
+                    reference_dose,
+                    dose_threshold / 100 * options.global_normalisation,
+                    dtype=float,
+                )
+
+            current_gamma[options.reference_points_to_calc, i, j] = _gamma_at_threshold(
+                options,
+                axes_evaluation,
+                dose_evaluation,
+                reference_points,
+                reference_dose,
+                dose_scale,
+                distance_threshold,
+                workers,
+            )
+
+    gamma = format_gamma_results(options, current_gamma, np.shape(dose_reference))
+
+    logging.info("Complete!")
+
+    return gamma
+
+
+def _gamma_at_threshold(
+    options,
+    axes_evaluation,
+    dose_evaluation,
+    reference_points,
+    reference_dose,
+    dose_scale,
+    distance_threshold,
+    workers,
+):
+    """Calculate gamma for one dose and distance threshold combination.
+
+    The reference points are grouped into bins of similar dose scaling.
+    Within each bin a k-d tree is built with the largest dose scale of
+    that bin so that tree distances are never larger than the true gamma.
+    With global gamma there is a single bin and the tree distance is
+    gamma itself.
+
+    A query of the evaluation grid points, taken in blocks that fit
+    within ``ram_available``, first gives an achievable upper bound of
+    each point's gamma. That bound limits both how far away and
+    over what dose window the evaluation dose needs to be searched, and so
+    each bin's reference points can be split into spatial blocks whose
+    point clouds fit within ``ram_available``. The closest point of the
+    cloud is then refined upon the interpolated dose surface.
+    """
+    gamma = np.full(len(reference_dose), np.nan)
+
+    valid = dose_scale > 0
+    if not np.any(valid):
+        return gamma
+
+    scaled_reference = reference_points[valid] / distance_threshold
+    reference_dose = reference_dose[valid]
+    dose_scale = dose_scale[valid]
+
+    bins = _dose_scale_bins(dose_scale)
+
+    num_dimensions = len(axes_evaluation)
+    max_points_in_block = options.ram_available / (
+        BYTES_PER_TREE_VALUE * (num_dimensions + 1)
+    )
+
+    # The nearest point within each block of the evaluation grid gives an
+    # achievable gamma, so the smallest of these is an upper bound.
+    upper_bound = np.full(len(reference_dose), np.inf)
+    for grid_points, grid_dose in _blocked_evaluation_point_cloud(
+        axes_evaluation, dose_evaluation, max_points_in_block
+    ):
+        for current_bin in bins:
+            upper_bound[current_bin] = np.fmin(
+                upper_bound[current_bin],
+                _gamma_at_nearest_point(
+                    grid_points / distance_threshold,
+                    grid_dose,
+                    scaled_reference[current_bin],
+                    reference_dose[current_bin],
+                    dose_scale[current_bin],
+                    workers,
+                ),
+            )
+
+    search_radius = np.fmin(upper_bound, options.max_gamma)
+
+    dose_range = np.ptp(dose_evaluation)
+
+    valid_gamma = upper_bound.copy()
+    closest_points = np.full((len(reference_dose), num_dimensions), np.nan)
+
+    for current_bin in bins:
+        blocks = [
+            current_bin[block]
+            for block in _partition_into_blocks(
+                scaled_reference[current_bin] * distance_threshold,
+                search_radius[current_bin] * distance_threshold,
+                axes_evaluation,
+                max_points_in_block,
+            )
+        ]
+
+        logging.debug(
+            "Dose scale bin of %i points split into %i blocks",
+            len(current_bin),
+            len(blocks),
+        )
+
+        while blocks:
+            block = blocks.pop()
+
+            # The block partitioning cannot foresee the number of samples
+            # placed along the grid edges, so a block that is still too
+            # large is split further, and only a single point's samples are
+            # ever coarsened. A single point whose search radius alone covers
+            # too much of the grid, or whose samples are already as coarse
+            # as they can be, is searched regardless of the limit.
+            dose_step = np.min(dose_scale[block]) / options.interp_fraction
+            max_points = max_points_in_block
+            if len(block) == 1 and (
+                _num_cropped_points(
+                    axes_evaluation,
+                    scaled_reference[block] * distance_threshold,
+                    search_radius[block] * distance_threshold,
+                )
+                > max_points
+            ):
+                max_points = np.inf
+
+            while True:
+                point_cloud = _windowed_point_cloud(
+                    axes_evaluation,
+                    dose_evaluation,
+                    scaled_reference[block] * distance_threshold,
+                    reference_dose[block],
+                    search_radius[block],
+                    distance_threshold,
+                    dose_scale[block],
+                    dose_step,
+                    max_points,
+                )
+
+                if point_cloud is not None or len(block) > 1:
+                    break
+
+                if dose_step > dose_range:
+                    max_points = np.inf
+                else:
+                    dose_step = dose_step * 2
+
+            if point_cloud is None:
+                blocks += _bisect_block(scaled_reference, block)
+                continue
+
+            evaluation_points, evaluation_dose = point_cloud
+            if len(evaluation_dose) == 0:
+                continue
+
+            block_gamma, closest = _minimum_gamma_within_radius(
+                evaluation_points / distance_threshold,
+                evaluation_dose,
+                scaled_reference[block],
+                reference_dose[block],
+                dose_scale[block],
+                search_radius[block],
+                workers,
+                options.ram_available,
+            )
+
+            # Each point is within a single block, so the closest point found
+            # is always kept for refinement, even where rounding puts its
+            # gamma a hair above the upper bound given by the same point.
+            found = closest != -1
+            valid_gamma[block[found]] = np.fmin(
+                valid_gamma[block[found]], block_gamma[found]
+            )
+            closest_points[block[found]] = evaluation_points[closest[found]]
+
+    to_refine = np.flatnonzero(np.all(np.isfinite(closest_points), axis=-1))
+    if len(to_refine) != 0:
+        valid_gamma[to_refine] = np.fmin(
+            valid_gamma[to_refine],
+            _refine_on_interpolated_surface(
+                axes_evaluation,
+                dose_evaluation,
+                closest_points[to_refine],
+                scaled_reference[to_refine] * distance_threshold,
+                reference_dose[to_refine],
+                dose_scale[to_refine],
+                distance_threshold,
+            ),
+        )
+
+    gamma[valid] = valid_gamma
+
+    return gamma
+
+
+def _refine_on_interpolated_surface(
+    axes_evaluation,
+    dose_evaluation,
+    start_points,
+    reference_points,
+    reference_dose,
+    dose_scale,
+    distance_threshold,
+):
+    """Descend from the closest sampled point towards the minimum gamma
+    upon the multilinearly interpolated evaluation dose.
+
+    Gauss-Newton steps are taken on the gamma residuals, halving the step
+    whenever it does not improve gamma. Every position visited lies upon
+    the interpolated dose surface, so the result is an achievable gamma
+    and can only be equal to or lower than the starting point's.
+    """
+    lower = np.array([axis[0] for axis in axes_evaluation])
+    upper = np.array([axis[-1] for axis in axes_evaluation])
+
+    def gamma_at(position, dose):
+        return _exact_gamma(
+            position / distance_threshold,
+            dose,
+            reference_points / distance_threshold,
+            reference_dose,
+            dose_scale,
+        )
+
+    position = start_points.copy()
+    dose, gradient = _multilinear_interpolation(
+        axes_evaluation, dose_evaluation, position
+    )
+    gamma = gamma_at(position, dose)
+    step_fraction = np.ones(len(gamma))
+
+    spatial_weight = 1 / distance_threshold**2
+    for _ in range(GAUSS_NEWTON_ITERATIONS):
+        dose_jacobian = gradient / dose_scale[:, None]
+        dose_residual = (dose - reference_dose) / dose_scale
+
+        gradient_of_objective = (
+            spatial_weight * (position - reference_points)
+            + dose_jacobian * dose_residual[:, None]
+        )
+
+        # The Gauss-Newton normal matrix is a scaled identity plus the
+        # outer product of the dose jacobian, which Sherman-Morrison inverts.
+        jacobian_dot_gradient = np.sum(dose_jacobian * gradient_of_objective, axis=-1)
+        jacobian_norm = np.sum(dose_jacobian**2, axis=-1)
+        step = (
+            -(
+                gradient_of_objective
+                - dose_jacobian
+                * (jacobian_dot_gradient / (spatial_weight + jacobian_norm))[:, None]
+            )
+            / spatial_weight
+        )
+
+        candidate = np.clip(position + step_fraction[:, None] * step, lower, upper)
+        candidate_dose, candidate_gradient = _multilinear_interpolation(
+            axes_evaluation, dose_evaluation, candidate
+        )
+        candidate_gamma = gamma_at(candidate, candidate_dose)
+
+        improved = candidate_gamma < gamma
+        position[improved] = candidate[improved]
+        dose[improved] = candidate_dose[improved]
+        gradient[improved] = candidate_gradient[improved]
+        gamma[improved] = candidate_gamma[improved]
+
+        step_fraction = np.where(improved, 1, step_fraction / 2)
+
+    return gamma
+
+
+def _multilinear_interpolation(axes, values, points):
+    """Multilinearly interpolate a grid at the given ``(points,
+    dimensions)`` coordinates, returning the values and their gradients.
+    Points are expected to be within the grid."""
+    cell_index = []
+    cell_fraction = []
+    cell_width = []
+    for axis, coordinate in zip(axes, points.T):
+        if len(axis) < 2:
+            cell_index.append(np.zeros(len(coordinate), dtype=int))
+            cell_fraction.append(np.zeros(len(coordinate)))
+            cell_width.append(np.full(len(coordinate), np.inf))
+            continue
+
+        index = np.clip(
+            np.searchsorted(axis, coordinate, side="right") - 1, 0, len(axis) - 2
+        )
+        width = axis[index + 1] - axis[index]
+
+        cell_index.append(index)
+        cell_fraction.append((coordinate - axis[index]) / width)
+        cell_width.append(width)
+
+    num_dimensions = len(axes)
+    interpolated = np.zeros(len(points))
+    gradient = np.zeros((len(points), num_dimensions))
+
+    for corner in itertools.product((0, 1), repeat=num_dimensions):
+        corner_index = tuple(
+            np.minimum(index + offset, len(axis) - 1)
+            for index, offset, axis in zip(cell_index, corner, axes)
+        )
+        corner_value = values[corner_index]
+
+        weights = [
+            fraction if offset else 1 - fraction
+            for fraction, offset in zip(cell_fraction, corner)
+        ]
+        interpolated += np.prod(weights, axis=0) * corner_value
+
+        for dimension, offset in enumerate(corner):
+            other_weights = np.prod(
+                [weight for i, weight in enumerate(weights) if i != dimension],
+                axis=0,
+            )
+            sign = 1 if offset else -1
+            gradient[:, dimension] += (
+                sign * other_weights * corner_value / cell_width[dimension]
+            )
+
+    return interpolated, gradient
+
+
+def _dose_scale_bins(dose_scale):
+    """Group points into bins where the dose scales are within a factor of
+    ``DOSE_SCALE_BIN_RATIO`` of each other."""
+    if np.all(dose_scale == dose_scale[0]):
+        return [np.arange(len(dose_scale))]
+
+    bin_index = np.floor(
+        np.log(dose_scale / np.min(dose_scale)) / np.log(DOSE_SCALE_BIN_RATIO)
+    ).astype(int)
+
+    order = np.argsort(bin_index, kind="stable")
+    boundaries = np.flatnonzero(np.diff(bin_index[order])) + 1
+
+    return np.split(order, boundaries)
+
+
+def _build_tree(scaled_evaluation_points, evaluation_dose, tree_dose_scale):
+    return scipy.spatial.cKDTree(
+        np.column_stack([scaled_evaluation_points, evaluation_dose / tree_dose_scale])
+    )
+
+
+def _gamma_at_nearest_point(
+    scaled_evaluation_points,
+    evaluation_dose,
+    scaled_reference,
+    reference_dose,
+    dose_scale,
+    workers,
+):
+    """The gamma to the nearest tree point. This is the exact minimum for
+    uniform dose scaling and an achievable upper bound otherwise."""
+    tree_dose_scale = np.max(dose_scale)
+    tree = _build_tree(scaled_evaluation_points, evaluation_dose, tree_dose_scale)
+
+    _, nearest = tree.query(
+        np.column_stack([scaled_reference, reference_dose / tree_dose_scale]),
+        workers=workers,
+    )
+
+    return _exact_gamma(
+        scaled_evaluation_points[nearest],
+        evaluation_dose[nearest],
+        scaled_reference,
+        reference_dose,
+        dose_scale,
+    )
+
+
+def _exact_gamma(
+    scaled_evaluation_points,
+    evaluation_dose,
+    scaled_reference,
+    reference_dose,
+    dose_scale,
+):
+    """The gamma between pairs of reference and evaluation points using
+    each reference point's own dose scaling."""
+    return np.sqrt(
+        np.sum((scaled_evaluation_points - scaled_reference) ** 2, axis=-1)
+        + ((evaluation_dose - reference_dose) / dose_scale) ** 2
+    )
+
+
+def _minimum_gamma_within_radius(
+    scaled_evaluation_points,
+    evaluation_dose,
+    scaled_reference,
+    reference_dose,
+    dose_scale,
+    search_radius,
+    workers,
+    ram_available,
+):
+    """Find the minimum gamma, and the index of the evaluation point that
+    gives it, for each reference point over all evaluation points within
+    its search radius. The index is -1 where no point was found.
+
+    The tree's dose axis is scaled by the largest dose scale of the
+    reference points, so tree distances are a lower bound of each point's
+    gamma. With uniform dose scaling the nearest tree point is the
+    answer. Otherwise every tree neighbour within the search radius is a
+    candidate and is checked exactly.
+    """
+    tree_dose_scale = np.max(dose_scale)
+    tree = _build_tree(scaled_evaluation_points, evaluation_dose, tree_dose_scale)
+    scaled_tree_reference = np.column_stack(
+        [scaled_reference, reference_dose / tree_dose_scale]
+    )
+
+    if np.all(dose_scale == tree_dose_scale):
+        gamma, closest = tree.query(
+            scaled_tree_reference,
+            distance_upper_bound=np.nextafter(np.max(search_radius), np.inf),
+            workers=workers,
+        )
+        closest[closest == tree.n] = -1
+
+        return gamma, closest
+
+    gamma = np.full(len(reference_dose), np.inf)
+    closest = np.full(len(reference_dose), -1)
+
+    num_neighbours = tree.query_ball_point(
+        scaled_tree_reference, search_radius, workers=workers, return_length=True
+    )
+
+    # Each neighbour pair costs roughly a Python integer within the
+    # returned lists, an index and a handful of float64 values.
+    bytes_per_pair = 96
+    num_slices = (
+        int(np.sum(num_neighbours, dtype=float) * bytes_per_pair // ram_available) + 1
+    )
+
+    for current_slice in np.array_split(np.arange(len(gamma)), num_slices):
+        lengths = num_neighbours[current_slice]
+        has_neighbours = lengths != 0
+        if not np.any(has_neighbours):
+            continue
+
+        current_slice = current_slice[has_neighbours]
+        lengths = lengths[has_neighbours]
+
+        neighbours = tree.query_ball_point(
+            scaled_tree_reference[current_slice],
+            search_radius[current_slice],
+            workers=workers,
+        )
+        flat_neighbours = np.concatenate(
+            [np.asarray(item, dtype=np.intp) for item in neighbours]
+        )
+        owner = np.repeat(current_slice, lengths)
+
+        gamma_at_neighbours = _exact_gamma(
+            scaled_evaluation_points[flat_neighbours],
+            evaluation_dose[flat_neighbours],
+            scaled_reference[owner],
+            reference_dose[owner],
+            dose_scale[owner],
+        )
+
+        starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        slice_minimum = np.minimum.reduceat(gamma_at_neighbours, starts)
+        gamma[current_slice] = slice_minimum
+
+        is_minimum = np.flatnonzero(
+            gamma_at_neighbours == np.repeat(slice_minimum, lengths)
+        )
+        _, first_minimum = np.unique(owner[is_minimum], return_index=True)
+        closest[owner[is_minimum[first_minimum]]] = flat_neighbours[
+            is_minimum[first_minimum]
+        ]
+
+    return gamma, closest
+
+
+def _partition_into_blocks(
+    reference_points, search_radius, axes_evaluation, max_points_in_block
+):
+    """Recursively bisect the reference points along their longest
+    extent until the evaluation grid covering each block's search radius
+    fits within ``max_points_in_block``."""
+    blocks = []
+    stack = [np.arange(len(reference_points))]
+    while stack:
+        indices = stack.pop()
+        num_points = _num_cropped_points(
+            axes_evaluation, reference_points[indices], search_radius[indices]
+        )
+        if num_points <= max_points_in_block or len(indices) == 1:
+            blocks.append(indices)
+            continue
+
+        stack += _bisect_block(reference_points, indices)
+
+    return blocks
+
+
+def _num_cropped_points(axes_evaluation, reference_points, search_radius):
+    """The number of evaluation grid points covering the search radius of
+    each of the given reference points."""
+    radius = search_radius[:, None]
+    index = _crop_index(
+        axes_evaluation,
+        np.min(reference_points - radius, axis=0),
+        np.max(reference_points + radius, axis=0),
+    )
+
+    return np.prod(
+        [len(axis[current]) for axis, current in zip(axes_evaluation, index)],
+        dtype=float,
+    )
+
+
+def _bisect_block(reference_points, indices):
+    """Split a block of reference points in half along its longest
+    extent."""
+    points = reference_points[indices]
+
+    split_axis = np.argmax(np.ptp(points, axis=0))
+    order = np.argsort(points[:, split_axis], kind="stable")
+    half = len(indices) // 2
+
+    return [indices[order[half:]], indices[order[:half]]]
+
+
+def _ascending_evaluation_grid(options):
+    axes_evaluation = [np.array(axis, dtype=float) for axis in options.axes_evaluation]
+    dose_evaluation = np.array(options.dose_evaluation, dtype=float)
+
+    for axis_index, axis in enumerate(axes_evaluation):
+        if len(axis) > 1 and axis[0] > axis[-1]:
+            axes_evaluation[axis_index] = axis[::-1]
+            dose_evaluation = np.flip(dose_evaluation, axis=axis_index)
+
+    return axes_evaluation, dose_evaluation
+
+
+def _evaluation_point_cloud(axes_evaluation, dose_evaluation, mask=None):
+    mesh = np.meshgrid(*axes_evaluation, indexing="ij")
+    dose = np.ravel(dose_evaluation)
+
+    if mask is None:
+        return np.column_stack([np.ravel(item) for item in mesh]), dose
+
+    mask = np.ravel(mask)
+
+    return np.column_stack([np.ravel(item)[mask] for item in mesh]), dose[mask]
+
+
+def _blocked_evaluation_point_cloud(axes_evaluation, dose_evaluation, max_points):
+    """Yield the evaluation grid as point clouds of at most ``max_points``
+    points each, taken in order from the flattened grid."""
+    shape = np.shape(dose_evaluation)
+    flat_dose = np.ravel(dose_evaluation)
+    block_size = max(int(max_points), 1)
+
+    for start in range(0, len(flat_dose), block_size):
+        flat_index = np.arange(start, min(start + block_size, len(flat_dose)))
+        grid_index = np.unravel_index(flat_index, shape)
+
+        yield (
+            np.column_stack(
+                [axis[index] for axis, index in zip(axes_evaluation, grid_index)]
+            ),
+            flat_dose[flat_index],
+        )
+
+
+def _windowed_point_cloud(
+    axes_evaluation,
+    dose_evaluation,
+    reference_points,
+    reference_dose,
+    search_radius,
+    distance_threshold,
+    dose_scale,
+    dose_step,
+    max_points,
+):
+    """Sample the interpolated evaluation dose that a block of reference
+    points may need to search.
+
+    The evaluation grid points covering each point's search radius are
+    kept when their dose is within reach of at least one reference point.
+    Multilinear interpolation is linear along each grid edge, so within
+    steep gradients, where neighbouring grid points can be many dose
+    thresholds apart, additional samples are placed along any edge
+    within that dose window wherever the dose changes by more than
+    ``dose_step``.
+
+    Returns the ``(points, dimensions)`` coordinates and the matching
+    dose values, or None if more than ``max_points`` would be needed.
+    """
+    spatial_reach = search_radius[:, None] * distance_threshold
+    index = _crop_index(
+        axes_evaluation,
+        np.min(reference_points - spatial_reach, axis=0),
+        np.max(reference_points + spatial_reach, axis=0),
+    )
+    cropped_axes = [axis[current] for axis, current in zip(axes_evaluation, index)]
+    cropped_dose = dose_evaluation[tuple(index)]
+
+    if np.prod([len(axis) for axis in cropped_axes], dtype=float) > max_points:
+        return None
+
+    dose_reach = search_radius * dose_scale
+    window_lower = np.min(reference_dose - dose_reach)
+    window_upper = np.max(reference_dose + dose_reach)
+
+    within_window = (cropped_dose >= window_lower) & (cropped_dose <= window_upper)
+    num_points = np.count_nonzero(within_window)
+
+    edges = []
+    for axis_index, axis in enumerate(cropped_axes):
+        if len(axis) < 2:
+            continue
+
+        lower_index = [slice(None)] * len(cropped_axes)
+        upper_index = [slice(None)] * len(cropped_axes)
+        lower_index[axis_index] = slice(None, -1)
+        upper_index[axis_index] = slice(1, None)
+
+        lower_dose = cropped_dose[tuple(lower_index)]
+        upper_dose = cropped_dose[tuple(upper_index)]
+
+        overlap_lower = np.maximum(np.minimum(lower_dose, upper_dose), window_lower)
+        overlap_upper = np.minimum(np.maximum(lower_dose, upper_dose), window_upper)
+        needs_samples = (np.abs(upper_dose - lower_dose) > dose_step) & (
+            overlap_upper >= overlap_lower
+        )
+
+        edge_index = np.flatnonzero(needs_samples)
+        overlap_lower = overlap_lower.flat[edge_index]
+        overlap_upper = overlap_upper.flat[edge_index]
+        counts = np.ceil((overlap_upper - overlap_lower) / dose_step).astype(int) + 1
+
+        num_points += np.sum(counts)
+        if num_points > max_points:
+            return None
+
+        edges.append(
+            (
+                axis_index,
+                edge_index,
+                counts,
+                overlap_lower,
+                overlap_upper,
+                lower_dose,
+                upper_dose,
+            )
+        )
+
+    points, dose = _evaluation_point_cloud(cropped_axes, cropped_dose, within_window)
+    points = [points]
+    dose = [dose]
+
+    for (
+        axis_index,
+        edge_index,
+        counts,
+        overlap_lower,
+        overlap_upper,
+        lower_dose,
+        upper_dose,
+    ) in edges:
+        edge_of_sample = np.repeat(np.arange(len(edge_index)), counts)
+        position = np.arange(np.sum(counts)) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+
+        sample_dose = (
+            overlap_lower[edge_of_sample]
+            + position
+            * ((overlap_upper - overlap_lower) / np.maximum(counts - 1, 1))[
+                edge_of_sample
+            ]
+        )
+
+        grid_index = np.unravel_index(edge_index[edge_of_sample], lower_dose.shape)
+        edge_lower_dose = lower_dose[grid_index]
+        edge_upper_dose = upper_dose[grid_index]
+        fraction = (sample_dose - edge_lower_dose) / (edge_upper_dose - edge_lower_dose)
+
+        coords = [
+            current_axis[index] for current_axis, index in zip(cropped_axes, grid_index)
+        ]
+        axis = cropped_axes[axis_index]
+        coords[axis_index] = coords[axis_index] + fraction * (
+            axis[grid_index[axis_index] + 1] - axis[grid_index[axis_index]]
+        )
+
+        points.append(np.column_stack(coords))
+        dose.append(sample_dose)
+
+    return np.concatenate(points), np.concatenate(dose)
+
+
+def _crop_index(axes_evaluation, lower, upper):
+    """The slices of the evaluation grid that cover ``lower`` to ``upper``,
+    including the grid points just beyond each bound."""
+    index = []
+    for axis, axis_lower, axis_upper in zip(axes_evaluation, lower, upper):
+        start = max(np.searchsorted(axis, axis_lower, side="right") - 1, 0)
+        end = min(np.searchsorted(axis, axis_upper, side="left") + 1, len(axis))
+
+        index.append(slice(start, end))
+
+    return index
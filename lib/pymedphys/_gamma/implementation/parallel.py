@@ -0,0 +1,190 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Evaluate the gamma shell search over a pool of worker processes.
+
+At each search distance the reference points that are still being
+searched are split into contiguous runs of the raveled reference grid,
+one run per worker. Contiguous runs of the raveled grid are slabs of
+the grid, so each worker's points are spatially coherent.
+
+The distance stepping itself stays within the calling process, which
+keeps the results bit-identical to the serial implementation.
+
+The large option arrays are copied once into shared memory. Each worker
+then creates NumPy views of that memory instead of receiving its own
+copy of the evaluation grid.
+"""
+
+import dataclasses
+import itertools
+from concurrent import futures
+from multiprocessing import shared_memory
+
+from pymedphys._imports import numpy as np
+
+SHARED_FIELDS = (
+    "dose_evaluation",
+    "flat_mesh_axes_reference",
+    "flat_dose_reference",
+)
+
+_WORKER_OPTIONS = None
+_WORKER_CALCULATE_MIN_DOSE_DIFFERENCE = None
+_WORKER_SHARED_MEMORY = []
+
+
+def partition_reference_points(to_be_checked, num_chunks):
+    """Split the reference points still to be checked into contiguous
+    runs of the raveled reference grid.
+
+    Returns a list of sorted flat index arrays, empty runs are dropped.
+    """
+    all_checks = np.where(np.ravel(to_be_checked))[0]
+    chunks = np.array_split(all_checks, num_chunks)
+
+    return [chunk for chunk in chunks if len(chunk) != 0]
+
+
+class MinDoseDifferencePool:
+    """A process pool that calculates the minimum dose difference for the
+    reference points remaining at each gamma search distance.
+
+    To be used as a context manager, the shared memory is released on
+    exit.
+
+    Parameters
+    ----------
+    options : GammaInternalFixedOptions
+        The options of the gamma calculation.
+    workers : int
+        The number of worker processes.
+    calculate_min_dose_difference : callable
+        The module level function which each worker calls with its
+        options, ``shell.calculate_min_dose_difference``. It is passed in
+        rather than imported so that this module does not import the
+        shell.
+    """
+
+    def __init__(self, options, workers, calculate_min_dose_difference):
+        self.options = options
+        self.workers = workers
+        self.calculate_min_dose_difference_func = calculate_min_dose_difference
+
+        self._shared_memory = []
+        self._executor = None
+
+    def __enter__(self):
+        descriptors = {}
+        try:
+            for field in SHARED_FIELDS:
+                array = np.ascontiguousarray(getattr(self.options, field))
+                block = shared_memory.SharedMemory(
+                    create=True, size=max(array.nbytes, 1)
+                )
+                self._shared_memory.append(block)
+
+                shared_array = np.ndarray(
+                    array.shape, dtype=array.dtype, buffer=block.buf
+                )
+                shared_array[...] = array
+
+                descriptors[field] = (block.name, array.shape, array.dtype.str)
+
+            ram_available = self.options.ram_available
+            if ram_available is not None:
+                ram_available = max(ram_available // self.workers, 1)
+
+            template = dataclasses.replace(
+                self.options,
+                reference_points_to_calc=None,
+                ram_available=ram_available,
+                **{field: None for field in SHARED_FIELDS},
+            )
+
+            self._executor = futures.ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_initialise_worker,
+                initargs=(
+                    template,
+                    descriptors,
+                    self.calculate_min_dose_difference_func,
+                ),
+            )
+        except BaseException:
+            self._release()
+            raise
+
+        return self
+
+    def __exit__(self, *exc_info):
+        self._release()
+
+    def _release(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        for block in self._shared_memory:
+            block.close()
+            block.unlink()
+
+        self._shared_memory = []
+
+    def calculate_min_dose_difference(
+        self, distance, to_be_checked, distance_step_size
+    ):
+        """A drop in replacement for the ``calculate_min_dose_difference``
+        given to the pool, which spreads the reference points over the
+        pool.
+        """
+        chunks = partition_reference_points(to_be_checked, self.workers)
+
+        if not chunks:
+            return np.array([], dtype=float)
+
+        results = self._executor.map(
+            _calculate_min_dose_difference_for_chunk,
+            chunks,
+            itertools.repeat(distance),
+            itertools.repeat(distance_step_size),
+        )
+
+        return np.concatenate(list(results))
+
+
+def _initialise_worker(template, descriptors, calculate_min_dose_difference):
+    # pylint: disable = global-statement
+    global _WORKER_OPTIONS, _WORKER_CALCULATE_MIN_DOSE_DIFFERENCE
+
+    shared_arrays = {}
+    for field, (name, shape, dtype) in descriptors.items():
+        block = shared_memory.SharedMemory(name=name)
+        _WORKER_SHARED_MEMORY.append(block)
+
+        shared_arrays[field] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+    _WORKER_OPTIONS = dataclasses.replace(template, **shared_arrays)
+    _WORKER_CALCULATE_MIN_DOSE_DIFFERENCE = calculate_min_dose_difference
+
+
+def _calculate_min_dose_difference_for_chunk(
+    flat_indices, distance, distance_step_size
+):
+    to_be_checked = np.zeros(len(_WORKER_OPTIONS.flat_dose_reference), dtype=bool)
+    to_be_checked[flat_indices] = True
+
+    return _WORKER_CALCULATE_MIN_DOSE_DIFFERENCE(
+        _WORKER_OPTIONS, distance, to_be_checked, distance_step_size
+    )
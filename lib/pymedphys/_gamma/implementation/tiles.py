@@ -0,0 +1,279 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Calculate the gamma shell one tile of the reference grid at a time,
+so that progress can be reported and the calculation stopped early.
+"""
+
+import contextlib
+import functools
+import itertools
+import logging
+from collections import namedtuple
+from warnings import warn
+
+from pymedphys._imports import numpy as np
+
+from pymedphys._utilities.parallel import resolve_workers
+
+from . import parallel
+from .shell import (
+    DEFAULT_RAM,
+    GammaInternalFixedOptions,
+    _gamma_loop,
+    calculate_min_dose_difference,
+    format_gamma_results,
+)
+
+GammaTile = namedtuple("GammaTile", ["tile", "gamma", "pass_rate", "points_remaining"])
+
+DEFAULT_NUMBER_OF_SLABS = 10
+
+
+def gamma_shell_tiles(
+    axes_reference,
+    dose_reference,
+    axes_evaluation,
+    dose_evaluation,
+    dose_percent_threshold,
+    distance_mm_threshold,
+    lower_percent_dose_cutoff=20,
+    interp_fraction=10,
+    interpolator="econforge",
+    max_gamma=None,
+    local_gamma=False,
+    global_normalisation=None,
+    skip_once_passed=False,
+    random_subset=None,
+    ram_available=DEFAULT_RAM,
+    quiet=None,
+    workers=None,
+    precision="float64",
+    tile_shape=None,
+    pass_rate_criterion=None,
+):
+    """Calculate the gamma shell tile by tile, yielding after each one.
+
+    Takes the same parameters as :func:`pymedphys.gamma`. The reference
+    grid is split into tiles and each tile's reference points are searched
+    independently over the full evaluation grid. After each tile a
+    ``GammaTile`` namedtuple is yielded containing:
+
+    tile
+        A tuple of slices which index the tile within the reference grid.
+    gamma
+        The gamma of the tile, in the same format as
+        :func:`pymedphys.gamma`.
+    pass_rate
+        The percent pass rate of all of the points calculated so far, in
+        the same format as ``gamma``. NaN until a point has been
+        calculated.
+    points_remaining
+        The number of reference points yet to be calculated.
+
+    Stopping the iteration, or calling ``close`` on the generator, cancels
+    the remaining tiles. With more than one worker, a single pool of
+    processes is shared by every tile and shut down once the generator
+    finishes or is closed.
+
+    Parameters
+    ----------
+    tile_shape : tuple, optional
+        The shape of each tile of the reference grid. Tiles at the end of
+        an axis may be smaller. Defaults to splitting the first axis of
+        the reference grid into 10 slabs.
+    pass_rate_criterion : float, optional
+        A percent pass rate. When given, tiles stop being calculated once
+        the final pass rate is known to be either at least this value, or
+        below it, for every threshold combination. This is decided by
+        assuming every remaining point could pass or fail.
+
+    Yields
+    ------
+    GammaTile
+    """
+    if quiet is not None:
+        warn(
+            "Parameter `quiet` will be deprecated in the future",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+
+    if max_gamma is None:
+        max_gamma = np.inf
+
+    options = GammaInternalFixedOptions.from_user_inputs(
+        axes_reference,
+        dose_reference,
+        axes_evaluation,
+        dose_evaluation,
+        dose_percent_threshold,
+        distance_mm_threshold,
+        lower_percent_dose_cutoff,
+        interp_fraction,
+        interpolator,
+        max_gamma,
+        local_gamma,
+        global_normalisation,
+        skip_once_passed,
+        random_subset,
+        ram_available,
+        quiet,
+        precision,
+    )
+
+    reference_shape = np.shape(dose_reference)
+    if tile_shape is None:
+        tile_shape = (
+            int(np.ceil(reference_shape[0] / DEFAULT_NUMBER_OF_SLABS)),
+        ) + reference_shape[1::]
+
+    if len(tile_shape) != len(reference_shape):
+        raise ValueError(
+            "`tile_shape` needs to have the same number of dimensions as "
+            "`dose_reference`"
+        )
+
+    flat_index = np.reshape(np.arange(np.prod(reference_shape)), reference_shape)
+    threshold_shape = (
+        len(options.dose_percent_threshold),
+        len(options.distance_mm_threshold),
+    )
+
+    points_remaining = np.count_nonzero(options.reference_points_to_calc)
+    num_passed = np.zeros(threshold_shape, dtype=int)
+    num_failed = np.zeros(threshold_shape, dtype=int)
+
+    workers = resolve_workers(workers)
+
+    with contextlib.ExitStack() as stack:
+        pool = None
+        if workers > 1:
+            logging.info("Distributing the reference points over %i workers", workers)
+            pool = stack.enter_context(
+                parallel.MinDoseDifferencePool(
+                    options, workers, calculate_min_dose_difference
+                )
+            )
+
+        for tile in _tile_slices(reference_shape, tile_shape):
+            tile_index = np.ravel(flat_index[tile])
+            tile_options = options.with_reference_subset(tile_index)
+
+            if pool is None:
+                min_dose_difference_func = functools.partial(
+                    calculate_min_dose_difference, tile_options
+                )
+            else:
+                min_dose_difference_func = functools.partial(
+                    _pool_min_dose_difference, pool, tile_index
+                )
+
+            current_gamma = _gamma_loop(tile_options, min_dose_difference_func)
+            points_remaining -= np.count_nonzero(tile_options.reference_points_to_calc)
+
+            calculated = np.isfinite(current_gamma)
+            num_passed += np.sum(calculated & (current_gamma < 1), axis=0)
+            num_failed += np.sum(calculated & (current_gamma >= 1), axis=0)
+
+            gamma_tile = format_gamma_results(
+                tile_options, current_gamma, np.shape(flat_index[tile])
+            )
+
+            with np.errstate(invalid="ignore"):
+                pass_rate = 100 * num_passed / (num_passed + num_failed)
+
+            logging.info(
+                "Tile %s complete | Reference points remaining: %i",
+                tile,
+                points_remaining,
+            )
+
+            yield GammaTile(
+                tile,
+                gamma_tile,
+                _format_like_gamma(options, pass_rate),
+                points_remaining,
+            )
+
+            if pass_rate_criterion is not None and np.all(
+                _is_verdict_decided(
+                    num_passed, num_failed, points_remaining, pass_rate_criterion
+                )
+            ):
+                logging.info(
+                    "Pass rate verdict against %s%% decided with %i reference "
+                    "points remaining",
+                    pass_rate_criterion,
+                    points_remaining,
+                )
+                return
+
+
+def _pool_min_dose_difference(
+    pool, tile_index, distance, to_be_checked, distance_step_size
+):
+    """Calculate the minimum dose difference of a tile's reference points
+    upon a pool holding the whole reference grid.
+
+    The tile's flat indices are ascending, so the pool returns its results
+    in the same order as the tile's points.
+    """
+    whole_grid_to_be_checked = np.zeros(len(pool.options.flat_dose_reference), bool)
+    whole_grid_to_be_checked[tile_index[to_be_checked]] = True
+
+    return pool.calculate_min_dose_difference(
+        distance, whole_grid_to_be_checked, distance_step_size
+    )
+
+
+def _tile_slices(reference_shape, tile_shape):
+    starts = [
+        range(0, length, step) for length, step in zip(reference_shape, tile_shape)
+    ]
+
+    for tile_start in itertools.product(*starts):
+        yield tuple(
+            slice(start, min(start + step, length))
+            for start, step, length in zip(tile_start, tile_shape, reference_shape)
+        )
+
+
+def _is_verdict_decided(num_passed, num_failed, points_remaining, pass_rate_criterion):
+    """Whether the final pass rate is certain to be on one side of the
+    criterion. Every remaining point may pass, fail, or not be counted at
+    all, with the latter only able to move the pass rate in between."""
+    num_points = num_passed + num_failed + points_remaining
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        lowest_pass_rate = 100 * num_passed / num_points
+        highest_pass_rate = 100 * (num_passed + points_remaining) / num_points
+
+    return (num_points > 0) & (
+        (lowest_pass_rate >= pass_rate_criterion)
+        | (highest_pass_rate < pass_rate_criterion)
+    )
+
+
+def _format_like_gamma(options, threshold_values):
+    formatted = {
+        (dose_threshold, distance_threshold): threshold_values[i, j]
+        for i, dose_threshold in enumerate(options.dose_percent_threshold)
+        for j, distance_threshold in enumerate(options.distance_mm_threshold)
+    }
+
+    if len(formatted) == 1:
+        return next(iter(formatted.values()))
+
+    return formatted
@@ -0,0 +1,368 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Archives of iCOM patient recordings, along with an index of their
+frames.
+
+Each archive is written as a series of independently compressed xz
+streams, each holding a block of whole frames. This remains a valid
+``.xz`` file, readable with :func:`lzma.open`, and a sidecar ``.json``
+index next to it records for every frame its timestamp, machine ID,
+meterset and position, along with where each block begins. Timelines can
+then be read from the index alone, and a window of frames by only
+decompressing the blocks that hold them.
+"""
+
+import contextlib
+import json
+import logging
+import lzma
+import os
+import pathlib
+import tempfile
+from typing import List, NamedTuple, Optional, Tuple
+
+from pymedphys._imports import numpy as np
+
+from . import extract
+
+INDEX_VERSION = 1
+BLOCK_SIZE = 2**20
+
+
+class Block(NamedTuple):
+    offset: int
+    compressed_offset: int
+    compressed_length: int
+
+
+class ArchiveIndex(NamedTuple):
+    """The index of an iCOM archive.
+
+    Attributes
+    ----------
+    timestamps
+        The timestamp of each frame, formatted as within the iCOM stream,
+        for example ``"2021-05-1809:30:00"``.
+    machine_ids
+        The machine ID of each frame, ``None`` where it is not given.
+    metersets
+        The delivery MU of each frame, ``nan`` where it is not given.
+    offsets
+        The position of each frame within the decompressed stream.
+    lengths
+        The length of each frame.
+    blocks
+        The compressed streams the archive is made up of.
+    """
+
+    timestamps: List[str]
+    machine_ids: List[Optional[str]]
+    metersets: "np.ndarray"
+    offsets: "np.ndarray"
+    lengths: "np.ndarray"
+    blocks: List[Block]
+
+
+def index_path(filepath) -> pathlib.Path:
+    """The path of the sidecar index of an iCOM archive."""
+    return pathlib.Path(filepath).with_suffix(".json")
+
+
+def write_archive(filepath, frames: List[bytes], block_size=BLOCK_SIZE):
+    """Compress a list of iCOM frames into an archive, in blocks of
+    around ``block_size`` bytes, and write its index alongside it."""
+    filepath = pathlib.Path(filepath)
+
+    blocks = []
+    offset = 0
+    compressed_offset = 0
+
+    with _atomic_write(filepath) as f:
+        for block_frames in _group_frames_into_blocks(frames, block_size):
+            compressed = lzma.compress(b"".join(block_frames))
+            f.write(compressed)
+
+            blocks.append(Block(offset, compressed_offset, len(compressed)))
+            offset += sum(len(frame) for frame in block_frames)
+            compressed_offset += len(compressed)
+
+    index = _create_index(frames, blocks)
+    _write_index(filepath, index)
+
+    return index
+
+
+def load_index(filepath) -> Optional[ArchiveIndex]:
+    """Load the index of an iCOM archive, returning ``None`` should it not
+    exist or be out of date."""
+    filepath = pathlib.Path(filepath)
+
+    try:
+        with open(index_path(filepath)) as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if (
+        stored.get("version") != INDEX_VERSION
+        or stored.get("archive_size") != filepath.stat().st_size
+    ):
+        return None
+
+    frames = stored["frames"]
+
+    return ArchiveIndex(
+        timestamps=frames["timestamp"],
+        machine_ids=frames["machine_id"],
+        metersets=np.array(frames["meterset"], dtype=float),
+        offsets=np.array(frames["offset"], dtype=np.int64),
+        lengths=np.array(frames["length"], dtype=np.int64),
+        blocks=[Block(*block) for block in stored["blocks"]],
+    )
+
+
+def get_index(filepath) -> ArchiveIndex:
+    """The index of an iCOM archive, building it by reading the whole
+    archive should an up to date index not already exist."""
+    index = load_index(filepath)
+    if index is None:
+        index = rebuild_index(filepath)
+
+    return index
+
+
+def rebuild_index(filepath, recompress=False) -> ArchiveIndex:
+    """Build the index of an existing iCOM archive.
+
+    Archives written before indexing was introduced are a single xz
+    stream, so reading any of their frames requires decompressing all of
+    them. Use ``recompress=True`` to rewrite such an archive in blocks.
+    """
+    filepath = pathlib.Path(filepath)
+
+    with open(filepath, "rb") as f:
+        compressed = f.read()
+
+    data, blocks = _decompress_streams(compressed)
+    offsets, frames = _split_frames(data)
+
+    if recompress:
+        return write_archive(filepath, frames)
+
+    index = _create_index(frames, blocks, offsets)
+    try:
+        _write_index(filepath, index)
+    except OSError:
+        logging.warning(
+            "Unable to write the index of %(filepath)s", {"filepath": filepath}
+        )
+
+    return index
+
+
+def read_frames(
+    filepath, start: Optional[str] = None, end: Optional[str] = None
+) -> List[bytes]:
+    """Read the frames of an iCOM archive with timestamps between
+    ``start`` and ``end`` inclusive.
+
+    Timestamps are compared as formatted within the iCOM stream, for
+    example ``"2021-05-1809:30:00"``. Only the blocks of the archive
+    holding the requested frames are decompressed.
+    """
+    index = get_index(filepath)
+
+    timestamps = np.array(index.timestamps, dtype=str)
+    selected = np.ones(len(timestamps), dtype=bool)
+    if start is not None:
+        selected &= timestamps >= start
+    if end is not None:
+        selected &= timestamps <= end
+
+    selected_indices = np.where(selected)[0]
+    if len(selected_indices) == 0:
+        return []
+
+    block_offsets = np.array([block.offset for block in index.blocks])
+    first_frame, last_frame = selected_indices[0], selected_indices[-1]
+    first_block = np.searchsorted(
+        block_offsets, index.offsets[first_frame], side="right"
+    )
+    last_block = np.searchsorted(
+        block_offsets,
+        index.offsets[last_frame] + index.lengths[last_frame] - 1,
+        side="right",
+    )
+    blocks = index.blocks[first_block - 1 : last_block]
+
+    with open(filepath, "rb") as f:
+        f.seek(blocks[0].compressed_offset)
+        compressed = f.read(
+            blocks[-1].compressed_offset
+            + blocks[-1].compressed_length
+            - blocks[0].compressed_offset
+        )
+
+    data, _ = _decompress_streams(compressed)
+
+    return [
+        data[offset - blocks[0].offset : offset - blocks[0].offset + length]
+        for offset, length in zip(
+            index.offsets[selected_indices], index.lengths[selected_indices]
+        )
+    ]
+
+
+def _group_frames_into_blocks(frames, block_size):
+    block_frames = []
+    size = 0
+
+    for frame in frames:
+        block_frames.append(frame)
+        size += len(frame)
+
+        if size >= block_size:
+            yield block_frames
+            block_frames = []
+            size = 0
+
+    if block_frames:
+        yield block_frames
+
+
+def _decompress_streams(compressed) -> Tuple[bytes, List[Block]]:
+    """Decompress a series of concatenated xz streams, recording where
+    each of them begins."""
+    data = []
+    blocks = []
+
+    offset = 0
+    compressed_offset = 0
+    remaining = memoryview(compressed)
+
+    while remaining:
+        # Streams may be separated by null padding
+        if remaining[0] == 0:
+            remaining = remaining[1:]
+            compressed_offset += 1
+            continue
+
+        decompressor = lzma.LZMADecompressor()
+        decompressed = decompressor.decompress(remaining)
+        if not decompressor.eof:
+            raise ValueError("The iCOM archive ended part way through a stream")
+
+        compressed_length = len(remaining) - len(decompressor.unused_data)
+
+        data.append(decompressed)
+        blocks.append(Block(offset, compressed_offset, compressed_length))
+
+        offset += len(decompressed)
+        compressed_offset += compressed_length
+        remaining = remaining[compressed_length:]
+
+    return b"".join(data), blocks
+
+
+def _split_frames(data):
+    offsets = [match.start() - 8 for match in extract.DATE_PATTERN.finditer(data)]
+    ends = offsets[1:] + [len(data)]
+    frames = [data[start:end] for start, end in zip(offsets, ends)]
+
+    return offsets, frames
+
+
+def _create_index(frames, blocks, offsets=None) -> ArchiveIndex:
+    lengths = [len(frame) for frame in frames]
+    if offsets is None:
+        offsets = np.cumsum([0] + lengths)[:-1]
+
+    metersets = [extract.get_field(frame, "Delivery MU") for frame in frames]
+
+    return ArchiveIndex(
+        timestamps=[frame[8:26].decode() for frame in frames],
+        machine_ids=[extract.get_field(frame, "Machine ID") for frame in frames],
+        metersets=np.array(
+            [np.nan if meterset is None else meterset for meterset in metersets],
+            dtype=float,
+        ),
+        offsets=np.array(offsets, dtype=np.int64),
+        lengths=np.array(lengths, dtype=np.int64),
+        blocks=blocks,
+    )
+
+
+def _write_index(filepath, index: ArchiveIndex):
+    stored = {
+        "version": INDEX_VERSION,
+        "archive_size": filepath.stat().st_size,
+        "blocks": [list(block) for block in index.blocks],
+        "frames": {
+            "timestamp": index.timestamps,
+            "machine_id": index.machine_ids,
+            "meterset": [
+                None if np.isnan(meterset) else meterset
+                for meterset in index.metersets.tolist()
+            ],
+            "offset": index.offsets.tolist(),
+            "length": index.lengths.tolist(),
+        },
+    }
+
+    with _atomic_write(index_path(filepath), mode="w") as f:
+        json.dump(stored, f)
+
+
+@contextlib.contextmanager
+def _atomic_write(filepath, mode="wb"):
+    """Write to a temporary file, only replacing ``filepath`` once it is
+    complete."""
+    filepath = pathlib.Path(filepath)
+
+    with tempfile.NamedTemporaryFile(
+        mode, dir=filepath.parent, suffix=".tmp", delete=False
+    ) as f:
+        try:
+            yield f
+        except BaseException:
+            f.close()
+            os.unlink(f.name)
+            raise
+
+    # NamedTemporaryFile creates its file readable only by its owner,
+    # give it the permissions a plain ``open`` would have instead.
+    os.chmod(f.name, 0o666 & ~_current_umask())
+    os.replace(f.name, filepath)
+
+
+def _current_umask():
+    umask = os.umask(0)
+    os.umask(umask)
+
+    return umask
+
+
+def index_archives(directory, recompress=False):
+    """Build the index of every iCOM archive within a directory which
+    does not already have an up to date one."""
+    for filepath in sorted(pathlib.Path(directory).glob("**/*.xz")):
+        if recompress or load_index(filepath) is None:
+            logging.info("Indexing %(filepath)s", {"filepath": filepath})
+            rebuild_index(filepath, recompress=recompress)
+
+
+def index_cli(args):
+    index_archives(args.directory, recompress=args.recompress)
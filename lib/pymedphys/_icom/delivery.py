@@ -43,14 +43,14 @@ def get_delivery_data_items(single_icom_stream: bytes):
         coordinate system.
     """
 
-    shrunk_stream, meterset = extract.extract(single_icom_stream, "Delivery MU")
-    shrunk_stream, gantry = extract.extract(shrunk_stream, "Gantry")
-    shrunk_stream, collimator = extract.extract(shrunk_stream, "Collimator")
+    meterset = extract.get_field(single_icom_stream, "Delivery MU")
+    gantry = extract.get_field(single_icom_stream, "Gantry")
+    collimator = extract.get_field(single_icom_stream, "Collimator")
 
-    shrunk_stream, raw_mlc = extract.extract_coll(shrunk_stream, b"MLCX", 160)
+    raw_mlc = extract.get_positions(single_icom_stream, b"MLCX", 160)
     mlc = _convert_icom_mlc_to_delivery_coords(raw_mlc)
 
-    shrunk_stream, raw_jaw = extract.extract_coll(shrunk_stream, b"ASYMY", 2)
+    raw_jaw = extract.get_positions(single_icom_stream, b"ASYMY", 2)
     jaw = _convert_icom_jaw_to_delivery_coords(raw_jaw)
 
     return meterset, gantry, collimator, mlc, jaw
@@ -58,20 +58,57 @@ def get_delivery_data_items(single_icom_stream: bytes):
 
 def delivery_from_icom_stream(icom_stream):
     icom_stream_points = extract.get_data_points(icom_stream)
-    delivery_raw = [
-        get_delivery_data_items(single_icom_stream)
-        for single_icom_stream in icom_stream_points
-    ]
 
-    mu = np.array([item[0] for item in delivery_raw])
-    diff_mu = np.concatenate([[0], np.diff(mu)])
+    return delivery_from_icom_frames(icom_stream_points)
+
+
+def delivery_from_icom_frames(icom_frames):
+    """Convert many frames of an iCom stream into a delivery at once.
+
+    The values of every frame are read into arrays allocated up front,
+    and the MLC and jaw positions are then converted into the
+    ``pymedphys.Delivery`` coordinate system as a single stack.
+
+    Parameters
+    ----------
+    icom_frames
+        The messages provided by the Elekta iCom Vx stream, one per
+        timestep.
+
+    Returns
+    -------
+    mu
+        The cumulative MU delivered at each timestep.
+    gantry
+        The gantry angles.
+    collimator
+        The collimator angles.
+    mlc
+        The MLC positions, with shape ``(n_frames, 80, 2)``.
+    jaw
+        The jaw positions, with shape ``(n_frames, 2)``.
+    """
+    num_frames = len(icom_frames)
+
+    meterset = np.empty(num_frames)
+    gantry = np.empty(num_frames)
+    collimator = np.empty(num_frames)
+    raw_mlc = np.empty((num_frames, 160))
+    raw_jaw = np.empty((num_frames, 2))
+
+    for i, frame in enumerate(icom_frames):
+        meterset[i] = extract.get_field(frame, "Delivery MU")
+        gantry[i] = extract.get_field(frame, "Gantry")
+        collimator[i] = extract.get_field(frame, "Collimator")
+        raw_mlc[i] = extract.get_positions(frame, b"MLCX", 160)
+        raw_jaw[i] = extract.get_positions(frame, b"ASYMY", 2)
+
+    diff_mu = np.concatenate([[0], np.diff(meterset)])
     diff_mu[diff_mu < 0] = 0
     mu = np.cumsum(diff_mu)
 
-    gantry = np.array([item[1] for item in delivery_raw])
-    collimator = np.array([item[2] for item in delivery_raw])
-    mlc = np.array([item[3] for item in delivery_raw])
-    jaw = np.array([item[4] for item in delivery_raw])
+    mlc = _convert_icom_mlc_to_delivery_coords(raw_mlc)
+    jaw = _convert_icom_jaw_to_delivery_coords(raw_jaw)
 
     return mu, gantry, collimator, mlc, jaw
 
@@ -87,10 +124,12 @@ class DeliveryIcom(
 
 
 def _convert_icom_mlc_to_delivery_coords(raw_mlc):
+    """Convert either a single set of 160 MLC positions, or a stack of
+    them, into the ``pymedphys.Delivery`` coordinate system."""
     mlc = np.array(raw_mlc)
-    mlc = mlc.reshape((80, 2))
-    mlc = np.fliplr(np.flipud(mlc * 10))
-    mlc[:, 1] = -mlc[:, 1]
+    mlc = mlc.reshape(mlc.shape[:-1] + (80, 2))
+    mlc = mlc[..., ::-1, ::-1] * 10
+    mlc[..., 1] = -mlc[..., 1]
     mlc = np.round(mlc, 10)
 
     return mlc
@@ -98,6 +137,6 @@ def _convert_icom_mlc_to_delivery_coords(raw_mlc):
 
 def _convert_icom_jaw_to_delivery_coords(raw_jaw):
     jaw = np.round(np.array(raw_jaw) * 10, 10)
-    jaw = np.flipud(jaw)
+    jaw = jaw[..., ::-1]
 
     return jaw
@@ -5,6 +5,17 @@ from . import mappings
 
 DATE_PATTERN = re.compile(rb"\d\d\d\d-\d\d-\d\d\d\d:\d\d:\d\d")
 
+# Every field begins with the high byte of its group, followed by its
+# element, value representation, a flag, a length and then its value.
+# The keys within ``mappings.ICOM`` run from the element through to the
+# flag.
+GROUP_HIGH_BYTES = b"0\x00pP"
+VALUE_PATTERN = rb"""[,\-'"a-zA-Z0-9 \.-]+"""
+FIELD_VALUE_PATTERN = re.compile(rb".\x00\x00\x00(" + VALUE_PATTERN + rb")", re.DOTALL)
+
+BEAM_LIMITING_DEVICE_TYPE_KEY = b"0\xb8\x00DS\x00R"
+INVALID_VALUE = b"-32767"
+
 
 def get_data_points(data):
     date_index = [m.span() for m in DATE_PATTERN.finditer(data)]
@@ -40,7 +51,9 @@ def extract_coll(data, label, number):
 @functools.lru_cache()
 def get_extraction_regex(key):
     regex = re.compile(
-        rb"""[0\x00pP]""" + key + rb""".\x00\x00\x00([,\-'"a-zA-Z0-9 \.-]+)"""
+        rb"""[0\x00pP]"""
+        + re.escape(key)
+        + rb""".\x00\x00\x00([,\-'"a-zA-Z0-9 \.-]+)"""
     )
     return regex
 
@@ -89,3 +102,81 @@ def extract_first(data, key, this_type):
         result = this_type(result)
 
     return data, result
+
+
+def get_field(data, label):
+    """Read a field from an iCOM message without modifying it.
+
+    Returns the same value as :func:`extract`. Each field is located by
+    searching for its key directly, rather than by removing it from a
+    copy of the message, so reading many fields from a message does not
+    repeatedly copy it.
+    """
+    key, this_type, where = mappings.ICOM[label]
+    raw_values = _iter_raw_values(data, key)
+
+    if where == "all":
+        return [_convert(value, this_type) for value in raw_values]
+
+    if where == "first":
+        try:
+            return _convert(next(raw_values), this_type)
+        except StopIteration:
+            return None
+
+    raise ValueError("Unexpected value for where")
+
+
+def get_positions(data, label, number):
+    """Read the positions of a beam limiting device from an iCOM message.
+
+    Returns the same positions as :func:`extract_coll`, without
+    modifying the message.
+    """
+    positions_regex = get_positions_regex(number)
+    position = data.find(BEAM_LIMITING_DEVICE_TYPE_KEY)
+
+    while position != -1:
+        end = position + len(BEAM_LIMITING_DEVICE_TYPE_KEY)
+        match = FIELD_VALUE_PATTERN.match(data, end)
+
+        if match is not None and match.group(1) == label:
+            positions_match = positions_regex.match(data, match.end())
+            if positions_match is not None:
+                return [float(item) for item in positions_match.groups()]
+
+        position = data.find(BEAM_LIMITING_DEVICE_TYPE_KEY, end)
+
+    raise ValueError(f"Unable to find {number} {label.decode()} positions")
+
+
+@functools.lru_cache()
+def get_positions_regex(number):
+    item = rb"\n0\x1c\x01DS\x00R.\x00\x00\x00(-?\d+\.\d+)"
+
+    return re.compile(item * number, re.DOTALL)
+
+
+def _iter_raw_values(data, key):
+    position = data.find(key, 1)
+
+    while position != -1:
+        end = position + len(key)
+
+        if data[position - 1] in GROUP_HIGH_BYTES:
+            match = FIELD_VALUE_PATTERN.match(data, end)
+
+            if match is not None:
+                end = match.end()
+                value = match.group(1)
+                if value != INVALID_VALUE:
+                    yield value
+
+        position = data.find(key, end)
+
+
+def _convert(value, this_type):
+    if this_type is str:
+        return value.decode()
+
+    return this_type(value)
@@ -1,8 +1,9 @@
+import asyncio
+import concurrent.futures
 import logging
 import pathlib
 import re
 import socket
-import time
 import traceback
 
 from . import patients
@@ -10,6 +11,15 @@ from . import patients
 BUFFER_SIZE = 256
 ICOM_PORT = 1706
 
+DATE_PATTERN = re.compile(rb"\d\d\d\d-\d\d-\d\d\d\d:\d\d:\d\d")
+DATE_LENGTH = 18
+DATE_OFFSET = 8
+
+READ_SIZE = 2**16
+MAX_BUFFER_SIZE = 2**24
+READ_TIMEOUT = 10
+RECONNECT_DELAY = 60 * 15
+
 
 def save_an_icom_batch(date_pattern, ip_directory, data_to_save):
     if not date_pattern.match(data_to_save[8:26]):
@@ -91,18 +101,182 @@ def listen(ip, data_dir):
         logging.info(s)
 
 
-def listen_cli(args):
-    while True:
+class FrameBuffer:
+    """Split an iCOM stream, as it arrives, into its individual frames.
+
+    Each frame begins ``DATE_OFFSET`` bytes before its timestamp. Data is
+    accumulated within a single ``bytearray`` which is consumed from the
+    front as frames are completed, and only the newly received bytes are
+    searched for the start of the next frame.
+
+    Should ``max_size`` bytes accumulate without the start of a frame
+    being found, all but the last few of them are discarded.
+    """
+
+    def __init__(self, max_size=MAX_BUFFER_SIZE):
+        self.max_size = max_size
+
+        self._buffer = bytearray()
+        self._frame_start = None
+        self._search_start = 0
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def feed(self, data):
+        """Append received data, returning the frames it completed."""
+        self._buffer += data
+
+        frames = []
+        for match in DATE_PATTERN.finditer(self._buffer, self._search_start):
+            start = max(match.start() - DATE_OFFSET, 0)
+            if self._frame_start is not None:
+                frames.append(bytes(self._buffer[self._frame_start : start]))
+
+            self._frame_start = start
+            self._search_start = match.end()
+
+        # A timestamp may be split across two reads
+        self._search_start = max(
+            self._search_start, len(self._buffer) - (DATE_LENGTH - 1)
+        )
+
+        if (
+            self._frame_start is not None
+            and len(self._buffer) - self._frame_start > self.max_size
+        ):
+            logging.warning(
+                "No iCOM frame boundary found within the last %(size)s "
+                "bytes, discarding them.",
+                {"size": len(self._buffer) - self._frame_start},
+            )
+            self._frame_start = None
+
+        if self._frame_start is None:
+            # Only keep enough to hold the start of a frame that is split
+            # across two reads
+            consumed = max(0, len(self._buffer) - (DATE_OFFSET + DATE_LENGTH - 1))
+        else:
+            consumed = self._frame_start
+            self._frame_start = 0
+
+        # Deleting from the front of a bytearray does not move the
+        # remaining data
+        del self._buffer[:consumed]
+        self._search_start = max(self._search_start - consumed, 0)
+
+        return frames
+
+
+async def listen_to_linacs(ips, data_dir, port=ICOM_PORT, executor=None):
+    """Record the iCOM streams of many Linacs from a single event loop.
+
+    Each Linac's frames are saved within ``data_dir`` in the same way as
+    :func:`listen`. Saving the frames, and archiving them by patient,
+    happens within ``executor`` so that a slow disk does not hold up
+    reading from the Linacs. The frames of each Linac are still handled
+    in the order they were received.
+    """
+    data_dir = pathlib.Path(data_dir)
+    patient_icom_data = patients.PatientIcomData(data_dir.joinpath("patients"))
+
+    if executor is None:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(ips))
+
+    with executor:
+        await asyncio.gather(
+            *[
+                _listen_to_linac(ip, port, data_dir, patient_icom_data, executor)
+                for ip in ips
+            ]
+        )
+
+
+async def _listen_to_linac(ip, port, data_dir, patient_icom_data, executor):
+    ip_directory = data_dir.joinpath("live", ip)
+    ip_directory.mkdir(exist_ok=True, parents=True)
+
+    frames = asyncio.Queue()
+    handling = None
+
+    def handle_frame(frame):
         try:
-            listen(args.ip, args.directory)
-        except KeyboardInterrupt:
-            raise
-        except:  # pylint: disable = bare-except
+            save_an_icom_batch(DATE_PATTERN, ip_directory, frame)
+            patient_icom_data.update_data(ip, frame)
+        except Exception:  # pylint: disable = broad-except
             traceback.print_exc()
 
-        logging.warning(
-            "The iCOM listener dropped out. Will wait 15 minutes, and "
-            "then retry connection."
+    async def handle_frames():
+        nonlocal handling
+        while True:
+            frame = await frames.get()
+            handling = executor.submit(handle_frame, frame)
+            try:
+                # Shielded so that a frame already handed to the executor
+                # is not cancelled part way
+                await asyncio.shield(asyncio.wrap_future(handling))
+            finally:
+                frames.task_done()
+
+    frame_handler = asyncio.ensure_future(handle_frames())
+
+    try:
+        while True:
+            try:
+                await _read_frames(ip, port, frames)
+            except asyncio.TimeoutError:
+                logging.warning(
+                    "Connection to %(ip)s timed out, retrying connection",
+                    {"ip": ip},
+                )
+                continue
+            except Exception:  # pylint: disable = broad-except
+                traceback.print_exc()
+
+            logging.warning(
+                "The iCOM listener for %(ip)s dropped out. Will wait "
+                "%(delay)s seconds, and then retry connection.",
+                {"ip": ip, "delay": RECONNECT_DELAY},
+            )
+            await asyncio.sleep(RECONNECT_DELAY)
+    finally:
+        frame_handler.cancel()
+
+        # Any frames already received are handled before finishing. This
+        # does not await, as on shutdown the frame handler is cancelled
+        # along with this task and would leave the queue undrained.
+        if handling is not None:
+            concurrent.futures.wait([handling])
+
+        while not frames.empty():
+            handle_frame(frames.get_nowait())
+            frames.task_done()
+
+
+async def _read_frames(ip, port, frames: asyncio.Queue):
+    try:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(ip, port), READ_TIMEOUT
         )
+    except asyncio.TimeoutError as e:
+        raise ConnectionError(f"Unable to connect to {ip}") from e
 
-        time.sleep(60 * 15)
+    logging.info("Connected to %(ip)s", {"ip": ip})
+
+    frame_buffer = FrameBuffer()
+
+    try:
+        while True:
+            data = await asyncio.wait_for(reader.read(READ_SIZE), READ_TIMEOUT)
+            if not data:
+                logging.warning("%(ip)s closed the connection", {"ip": ip})
+                return
+
+            for frame in frame_buffer.feed(data):
+                frames.put_nowait(frame)
+    finally:
+        writer.close()
+
+
+def listen_cli(args):
+    asyncio.run(listen_to_linacs(args.ip, args.directory))
@@ -16,10 +16,10 @@ ICOM = {
     "Gantry": (b"\x1e\x01DS\x00R", float, "first"),
     "Collimator": (b" \x01DS\x00R", float, "first"),
     "Table Column": (b'"\x01DS\x00R', int, "first"),
-    "Table Isocentric": (rb"\%\x01DS\x00R", int, "first"),
-    "Table Vertical": (rb"\(\x01DS\x00R", float, "first"),
-    "Table Longitudinal": (rb"\)\x01DS\x00R", float, "first"),
-    "Table Lateral": (rb"\*\x01DS\x00R", float, "first"),
+    "Table Isocentric": (b"%\x01DS\x00R", int, "first"),
+    "Table Vertical": (b"(\x01DS\x00R", float, "first"),
+    "Table Longitudinal": (b")\x01DS\x00R", float, "first"),
+    "Table Lateral": (b"*\x01DS\x00R", float, "first"),
     "Beam Description": (b"\x0c\x00SH\x00R", str, "first"),
     "Interlocks": (b"\x16\x10LO\x00R", str, "all"),
     "Previous Interlocks": (b"\x18\x10LO\x00R", str, "all"),
@@ -1,11 +1,10 @@
 import logging
-import lzma
 import pathlib
 import traceback
 
 import pymedphys
 
-from . import extract, observer
+from . import archive, extract, observer
 
 # TODO: Convert logging to use lazy formatting
 # see https://docs.python.org/3/howto/logging.html#optimization
@@ -40,7 +39,7 @@ def validate_data(data_to_be_saved):
 
 
 def save_patient_data(start_timestamp, patient_data, output_dir: pathlib.Path):
-    _, patient_id = extract.extract(patient_data[0], "Patient ID")
+    patient_id = extract.get_field(patient_data[0], "Patient ID")
 
     logging.debug(
         "When preparing patient record to be saved, the patient id was "
@@ -49,7 +48,7 @@ def save_patient_data(start_timestamp, patient_data, output_dir: pathlib.Path):
     )
 
     for data in patient_data:
-        _, patient_name = extract.extract(data, "Patient Name")
+        patient_name = extract.get_field(data, "Patient Name")
         if not patient_name is None:
             break
 
@@ -106,8 +105,7 @@ def save_patient_data(start_timestamp, patient_data, output_dir: pathlib.Path):
             f"Will instead save the record within {str(filename)}."
         )
 
-    with lzma.open(filename, "w") as f:
-        f.write(data)
+    archive.write_archive(filename, patient_data)
 
 
 class PatientIcomData:
@@ -137,9 +135,9 @@ class PatientIcomData:
             self._data[ip] = [data]
 
         timestamp = data[8:26].decode()
-        shrunk_data, patient_id = extract.extract(data, "Patient ID")
-        shrunk_data, patient_name = extract.extract(shrunk_data, "Patient Name")
-        shrunk_data, machine_id = extract.extract(shrunk_data, "Machine ID")
+        patient_id = extract.get_field(data, "Patient ID")
+        patient_name = extract.get_field(data, "Patient Name")
+        machine_id = extract.get_field(data, "Machine ID")
         logging.info(  # pylint: disable = logging-fstring-interpolation
             f"IP: {ip} | Timestamp: {timestamp} | "
             f"Patient ID: {patient_id} | "
@@ -16,7 +16,7 @@
 from pymedphys._base.delivery import DeliveryBase
 from pymedphys._vendor.deprecated import deprecated as _deprecated
 
-from ..metersetmap import calc_metersetmap
+from ..metersetmap import calc_metersetmaps
 
 
 class DeliveryMetersetMap(DeliveryBase):
@@ -29,6 +29,9 @@ class DeliveryMetersetMap(DeliveryBase):
         leaf_pair_widths=None,
         min_step_per_pixel=None,
         output_always_list=False,
+        time_integration="sampled",
+        ram_available=None,
+        workers=None,
     ):
         if gantry_angles is None:
             gantry_angles = 0
@@ -44,19 +47,16 @@ class DeliveryMetersetMap(DeliveryBase):
             )
         )
 
-        metersetmaps = []
-        for delivery_data in masked_by_gantry:
-            metersetmaps.append(
-                calc_metersetmap(
-                    delivery_data.monitor_units,
-                    delivery_data.mlc,
-                    delivery_data.jaw,
-                    grid_resolution=grid_resolution,
-                    max_leaf_gap=max_leaf_gap,
-                    leaf_pair_widths=leaf_pair_widths,
-                    min_step_per_pixel=min_step_per_pixel,
-                )
-            )
+        metersetmaps = calc_metersetmaps(
+            masked_by_gantry,
+            grid_resolution=grid_resolution,
+            max_leaf_gap=max_leaf_gap,
+            leaf_pair_widths=leaf_pair_widths,
+            min_step_per_pixel=min_step_per_pixel,
+            ram_available=ram_available,
+            time_integration=time_integration,
+            workers=workers,
+        )
 
         if not output_always_list:
             if len(metersetmaps) == 1:
@@ -0,0 +1,508 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Calculate the MetersetMap of many control point intervals at once,
+either by sampling time steps in batches or by integrating exactly over
+the linear travel of the leaves and jaws.
+"""
+
+import itertools
+
+from pymedphys._imports import numpy as np
+
+
+def _arange_within_grid(start, stop, axis, grid_resolution):
+    """The index of the first point and the number of points of
+    ``np.arange(start, stop + grid_resolution, grid_resolution)`` upon the
+    given axis, for arrays of start and stop values, after dropping those
+    points which are not upon the axis."""
+    num_points = np.maximum(
+        np.ceil((stop + grid_resolution - start) / grid_resolution), 0
+    ).astype(int)
+    first = np.round((start - axis[0]) / grid_resolution).astype(int)
+
+    last = np.clip(first + num_points, 0, len(axis))
+    first = np.clip(first, 0, len(axis))
+
+    return first, np.maximum(last - first, 0)
+
+
+def _calc_interval_extents(
+    mlc,
+    jaw,
+    full_grid,
+    leaf_centres,
+    grid_reference_position,
+    grid_resolution,
+    min_step_per_pixel,
+):
+    """Determine, for every control point interval at once, the calculation
+    grid and number of time steps that ``calc_single_control_point`` would
+    use. The grids are given as index ranges of the full grid.
+    """
+    min_y = np.minimum(-jaw[:-1, 0], -jaw[1:, 0])
+    max_y = np.maximum(jaw[:-1, 1], jaw[1:, 1])
+
+    top_grid_pos = (
+        np.round((max_y - grid_reference_position) / grid_resolution)
+    ) * grid_resolution + grid_reference_position
+
+    bot_grid_pos = (
+        grid_reference_position
+        - (np.round((-min_y + grid_reference_position) / grid_resolution))
+        * grid_resolution
+    )
+
+    first_row, num_rows = _arange_within_grid(
+        bot_grid_pos, top_grid_pos, full_grid["jaw"], grid_resolution
+    )
+
+    grid_leaf_map = np.argmin(
+        np.abs(full_grid["jaw"][:, None] - leaf_centres[None, :]), axis=1
+    )
+
+    has_rows = num_rows > 0
+    first_leaf = grid_leaf_map[np.where(has_rows, first_row, 0)]
+    last_leaf = grid_leaf_map[np.where(has_rows, first_row + num_rows - 1, 0)]
+
+    leaf_index = np.arange(len(leaf_centres))
+    leaf_is_calced = (
+        has_rows[:, None]
+        & (leaf_index[None, :] >= first_leaf[:, None])
+        & (leaf_index[None, :] <= last_leaf[:, None])
+    )
+
+    left = -mlc[:, :, 0]
+    right = mlc[:, :, 1]
+
+    min_x = np.min(
+        np.where(leaf_is_calced, np.minimum(left[:-1], left[1:]), np.inf), axis=1
+    )
+    max_x = np.max(
+        np.where(leaf_is_calced, np.maximum(right[:-1], right[1:]), -np.inf), axis=1
+    )
+    min_x = np.where(has_rows, np.round(min_x / grid_resolution) * grid_resolution, 0)
+    max_x = np.where(has_rows, np.round(max_x / grid_resolution) * grid_resolution, 0)
+
+    first_col, num_cols = _arange_within_grid(
+        min_x, max_x, full_grid["mlc"], grid_resolution
+    )
+
+    maximum_travel = np.max(
+        np.where(
+            leaf_is_calced,
+            np.maximum(np.abs(np.diff(left, axis=0)), np.abs(np.diff(right, axis=0))),
+            0,
+        ),
+        axis=1,
+    )
+    maximum_travel = np.maximum(
+        maximum_travel, np.max(np.abs(np.diff(jaw, axis=0)), axis=1)
+    )
+
+    time_steps = np.maximum(
+        np.ceil(maximum_travel / grid_resolution) * min_step_per_pixel, 10
+    )
+
+    return {
+        "first_row": first_row,
+        "num_rows": num_rows * (num_cols > 0),
+        "first_col": first_col,
+        "num_cols": num_cols,
+        "first_leaf": first_leaf,
+        "last_leaf": last_leaf,
+        "time_steps": time_steps,
+        "grid_leaf_map": grid_leaf_map,
+    }
+
+
+def _batch_samples(extents, delivered_mu, time_steps, bytes_per_pixel, ram_available):
+    """Group the time steps of consecutive control point intervals into
+    batches which, over the bounding box of their calculation grids, fit
+    within ``ram_available``. The time steps of an interval which alone
+    exceeds it are split over several batches.
+
+    Yields the interval and time index of each sample within the batch.
+    """
+    to_be_calced = np.where((delivered_mu != 0) & (extents["num_rows"] > 0))[0]
+
+    # The (start, stop) index ranges of leaves, rows and columns
+    interval_bounds = np.stack(
+        [
+            extents["first_leaf"],
+            extents["last_leaf"] + 1,
+            extents["first_row"],
+            extents["first_row"] + extents["num_rows"],
+            extents["first_col"],
+            extents["first_col"] + extents["num_cols"],
+        ],
+        axis=-1,
+    ).tolist()
+    time_steps = time_steps.astype(int).tolist()
+
+    pieces = []
+    num_samples = 0
+    batch_bounds = None
+    for i in to_be_calced.tolist():
+        start = 0
+        while start < time_steps[i]:
+            bounds = _union_of_bounds(batch_bounds, interval_bounds[i])
+            leaves = bounds[1] - bounds[0]
+            rows = bounds[3] - bounds[2]
+            cols = bounds[5] - bounds[4]
+
+            bytes_per_sample = (leaves * cols + rows) * bytes_per_pixel
+            capacity = ram_available // bytes_per_sample - num_samples
+
+            if capacity <= 0 and pieces:
+                yield _samples_of_pieces(pieces)
+                pieces = []
+                num_samples = 0
+                batch_bounds = None
+                continue
+
+            stop = min(time_steps[i], start + max(capacity, 1))
+            pieces.append((i, start, stop))
+            num_samples += stop - start
+            batch_bounds = bounds
+            start = stop
+
+    if pieces:
+        yield _samples_of_pieces(pieces)
+
+
+def _union_of_bounds(bounds, other_bounds):
+    if bounds is None:
+        return other_bounds
+
+    return [
+        min(bound, other_bound) if is_start else max(bound, other_bound)
+        for is_start, bound, other_bound in zip(
+            itertools.cycle((True, False)), bounds, other_bounds
+        )
+    ]
+
+
+def _samples_of_pieces(pieces):
+    intervals, starts, stops = np.array(pieces).T
+    lengths = stops - starts
+
+    sample_interval = np.repeat(intervals, lengths)
+    time_index = (
+        np.arange(np.sum(lengths))
+        - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        + np.repeat(starts, lengths)
+    )
+
+    return sample_interval, time_index.astype(float)
+
+
+def _add_metersetmap_of_samples(
+    metersetmap,
+    sample_interval,
+    time_index,
+    extents,
+    mlc,
+    jaw,
+    delivered_mu,
+    full_grid,
+    grid_resolution,
+):
+    """Add the MetersetMap of a batch of time steps onto the full grid in
+    place.
+
+    Each time step is sampled as within ``calc_single_control_point`` for
+    its control point interval, and only contributes within that
+    interval's calculation grid. The batch is evaluated at once over the
+    bounding box of those grids. The mean over time of the open fraction is
+    then a sum of products of the jaw and mlc open fractions, which for
+    each leaf is a matrix product.
+    """
+    sample_time_steps = extents["time_steps"][sample_interval]
+
+    first_row = extents["first_row"][sample_interval]
+    last_row = first_row + extents["num_rows"][sample_interval]
+    first_col = extents["first_col"][sample_interval]
+    last_col = first_col + extents["num_cols"][sample_interval]
+
+    rows = slice(np.min(first_row), np.max(last_row))
+    cols = slice(np.min(first_col), np.max(last_col))
+    leaves = slice(
+        np.min(extents["first_leaf"][sample_interval]),
+        np.max(extents["last_leaf"][sample_interval]) + 1,
+    )
+
+    def blocked(grid_positions, multiplier, start, end):
+        # Equal to _calc_blocked_t(multiplier * (grid - travel)), but
+        # evaluated in place to limit the memory used.
+        dt = (end - start) / (sample_time_steps[:, None] - 1)
+        travel = start + time_index[:, None] * dt
+
+        if multiplier == 1:
+            blocked_t = travel[:, :, None] - grid_positions[None, None, :]
+        else:
+            blocked_t = grid_positions[None, None, :] - travel[:, :, None]
+
+        blocked_t += grid_resolution / 2
+        blocked_t /= grid_resolution
+
+        return np.clip(blocked_t, 0, 1, out=blocked_t)
+
+    current_mlc = mlc[sample_interval, leaves, :]
+    next_mlc = mlc[sample_interval + 1, leaves, :]
+    grid_mlc = full_grid["mlc"][cols]
+
+    mlc_open = blocked(grid_mlc, 1, -current_mlc[:, :, 0], -next_mlc[:, :, 0])  # left
+    mlc_open += blocked(grid_mlc, -1, current_mlc[:, :, 1], next_mlc[:, :, 1])  # right
+    np.subtract(1, mlc_open, out=mlc_open)
+
+    col_index = np.arange(cols.start, cols.stop)
+    mlc_open *= (
+        (col_index[None, :] >= first_col[:, None])
+        & (col_index[None, :] < last_col[:, None])
+    )[:, None, :]
+
+    current_jaw = jaw[sample_interval, None, :]
+    next_jaw = jaw[sample_interval + 1, None, :]
+    grid_jaw = full_grid["jaw"][rows]
+
+    jaw_open = (
+        1
+        - (
+            blocked(grid_jaw, 1, -current_jaw[:, :, 0], -next_jaw[:, :, 0])  # bot
+            + blocked(grid_jaw, -1, current_jaw[:, :, 1], next_jaw[:, :, 1])  # top
+        )[:, 0, :]
+    )
+
+    row_index = np.arange(rows.start, rows.stop)
+    weighted_jaw_open = jaw_open * (
+        (row_index[None, :] >= first_row[:, None])
+        & (row_index[None, :] < last_row[:, None])
+    )
+    weighted_jaw_open *= (delivered_mu[sample_interval] / sample_time_steps)[:, None]
+
+    leaf_of_row = extents["grid_leaf_map"][rows]
+    for leaf in np.unique(leaf_of_row):
+        rows_of_leaf = row_index[leaf_of_row == leaf]
+        metersetmap[rows_of_leaf, cols] += (
+            weighted_jaw_open[:, rows_of_leaf - rows.start].T
+            @ mlc_open[:, leaf - leaves.start, :]
+        )
+
+
+def _add_exact_metersetmap_of_intervals(
+    metersetmap, intervals, extents, mlc, jaw, delivered_mu, full_grid, grid_resolution
+):
+    """Add the exactly time integrated MetersetMap of a batch of control
+    point intervals onto the full grid in place.
+
+    Over an interval, with time normalised to [0, 1], each device blocks
+    each pixel by ``clip(alpha + beta * t, 0, 1)``. Where the jaws are
+    stationary relative to a row the open fraction integrates to the jaw
+    open fraction multiplied by the integral of the mlc open fraction,
+    which is accumulated as a matrix product per leaf. The remaining rows,
+    those which a jaw travels across, have the product of the jaw and mlc
+    open fractions integrated piece by piece.
+    """
+    first_row = extents["first_row"][intervals]
+    last_row = first_row + extents["num_rows"][intervals]
+    first_col = extents["first_col"][intervals]
+    last_col = first_col + extents["num_cols"][intervals]
+
+    rows = slice(np.min(first_row), np.max(last_row))
+    cols = slice(np.min(first_col), np.max(last_col))
+    leaves = slice(
+        np.min(extents["first_leaf"][intervals]),
+        np.max(extents["last_leaf"][intervals]) + 1,
+    )
+
+    current_mlc = mlc[intervals, leaves, :]
+    next_mlc = mlc[intervals + 1, leaves, :]
+    grid_mlc = full_grid["mlc"][cols]
+
+    left = _blocked_line(
+        grid_mlc, 1, -current_mlc[:, :, 0], -next_mlc[:, :, 0], grid_resolution
+    )
+    right = _blocked_line(
+        grid_mlc, -1, current_mlc[:, :, 1], next_mlc[:, :, 1], grid_resolution
+    )
+
+    col_index = np.arange(cols.start, cols.stop)
+    col_mask = (col_index[None, :] >= first_col[:, None]) & (
+        col_index[None, :] < last_col[:, None]
+    )
+
+    mlc_open = 1 - _integral_of_clipped_line(*left) - _integral_of_clipped_line(*right)
+    mlc_open *= col_mask[:, None, :]
+
+    current_jaw = jaw[intervals, None, :]
+    next_jaw = jaw[intervals + 1, None, :]
+    grid_jaw = full_grid["jaw"][rows]
+
+    bot = _blocked_line(
+        grid_jaw, 1, -current_jaw[:, :, 0], -next_jaw[:, :, 0], grid_resolution
+    )
+    top = _blocked_line(
+        grid_jaw, -1, current_jaw[:, :, 1], next_jaw[:, :, 1], grid_resolution
+    )
+    bot = (bot[0][:, 0, :], bot[1][:, 0, :])
+    top = (top[0][:, 0, :], top[1][:, 0, :])
+
+    row_index = np.arange(rows.start, rows.stop)
+    row_mask = (row_index[None, :] >= first_row[:, None]) & (
+        row_index[None, :] < last_row[:, None]
+    )
+
+    jaw_is_stationary = _is_clipped_line_constant(*bot) & _is_clipped_line_constant(
+        *top
+    )
+    stationary_jaw_open = 1 - np.clip(bot[0], 0, 1) - np.clip(top[0], 0, 1)
+
+    weighted_jaw_open = (
+        stationary_jaw_open
+        * (row_mask & jaw_is_stationary)
+        * delivered_mu[intervals, None]
+    )
+
+    leaf_of_row = extents["grid_leaf_map"][rows]
+    for leaf in np.unique(leaf_of_row):
+        rows_of_leaf = row_index[leaf_of_row == leaf]
+        metersetmap[rows_of_leaf, cols] += (
+            weighted_jaw_open[:, rows_of_leaf - rows.start].T
+            @ mlc_open[:, leaf - leaves.start, :]
+        )
+
+    interval_of_pair, row_of_pair = np.nonzero(row_mask & ~jaw_is_stationary)
+    leaf_of_pair = leaf_of_row[row_of_pair] - leaves.start
+
+    def of_pairs(line, index):
+        alpha, beta = np.broadcast_arrays(*line)
+        return alpha[index], beta[index]
+
+    open_fraction = _integral_of_open_product(
+        of_pairs(left, (interval_of_pair, leaf_of_pair)),
+        of_pairs(right, (interval_of_pair, leaf_of_pair)),
+        of_pairs(bot, (interval_of_pair, row_of_pair, None)),
+        of_pairs(top, (interval_of_pair, row_of_pair, None)),
+    )
+    open_fraction *= (
+        col_mask[interval_of_pair] * delivered_mu[intervals[interval_of_pair], None]
+    )
+
+    np.add.at(
+        metersetmap,
+        (row_index[row_of_pair, None], col_index[None, :]),
+        open_fraction,
+    )
+
+
+def _blocked_line(grid_positions, multiplier, start, end, grid_resolution):
+    """The blocked fraction of each grid position, as the ``(alpha, beta)``
+    of ``clip(alpha + beta * t, 0, 1)``, while a device travels from its
+    start to end positions over the normalised time t in [0, 1].
+
+    Equal to ``_calc_blocked_t(multiplier * (grid - travel))``.
+    """
+    if multiplier == 1:
+        alpha = start[..., None] - grid_positions
+    else:
+        alpha = grid_positions - start[..., None]
+
+    alpha += grid_resolution / 2
+    alpha /= grid_resolution
+
+    beta = (multiplier * (end - start) / grid_resolution)[..., None]
+
+    return alpha, beta
+
+
+def _clipped_line_breakpoints(alpha, beta):
+    """The times within [0, 1] at which ``alpha + beta * t`` crosses 0 and
+    1, in ascending order."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crosses_zero = -alpha / beta
+        crosses_one = (1 - alpha) / beta
+
+    crosses_zero = np.clip(np.nan_to_num(crosses_zero), 0, 1)
+    crosses_one = np.clip(np.nan_to_num(crosses_one), 0, 1)
+
+    return np.minimum(crosses_zero, crosses_one), np.maximum(crosses_zero, crosses_one)
+
+
+def _is_clipped_line_constant(alpha, beta):
+    end = alpha + beta
+
+    return (beta == 0) | ((alpha <= 0) & (end <= 0)) | ((alpha >= 1) & (end >= 1))
+
+
+def _integral_of_clipped_line(alpha, beta):
+    """The integral of ``clip(alpha + beta * t, 0, 1)`` over t in [0, 1].
+
+    The clipped line is linear between its breakpoints, so the trapezoidal
+    rule over those pieces is exact.
+    """
+    first, second = _clipped_line_breakpoints(alpha, beta)
+
+    integral = np.zeros(np.broadcast(alpha, beta).shape)
+    previous_time = 0
+    previous_value = np.clip(alpha, 0, 1)
+    for time in (first, second, 1):
+        value = np.clip(alpha + beta * time, 0, 1)
+        integral += (time - previous_time) * (previous_value + value) / 2
+
+        previous_time = time
+        previous_value = value
+
+    return integral
+
+
+def _integral_of_open_product(left, right, bot, top):
+    """The integral over t in [0, 1] of the mlc open fraction multiplied by
+    the jaw open fraction, where each device's blocked fraction is a
+    clipped line given by its ``(alpha, beta)``.
+
+    Between the breakpoints of all four clipped lines the integrand is a
+    quadratic, for which Simpson's rule is exact.
+    """
+    lines = (left, right, bot, top)
+    shape = np.broadcast(*[item for line in lines for item in line]).shape
+
+    times = [np.zeros(shape), np.ones(shape)]
+    for line in lines:
+        times += [
+            np.broadcast_to(time, shape) for time in _clipped_line_breakpoints(*line)
+        ]
+    times = np.sort(np.stack(times, axis=-1), axis=-1)
+
+    def open_product(time):
+        def blocked(line):
+            alpha, beta = line
+            return np.clip(alpha[..., None] + beta[..., None] * time, 0, 1)
+
+        return (1 - blocked(left) - blocked(right)) * (1 - blocked(bot) - blocked(top))
+
+    start = times[..., :-1]
+    end = times[..., 1:]
+
+    return np.sum(
+        (end - start)
+        / 6
+        * (
+            open_product(start)
+            + 4 * open_product((start + end) / 2)
+            + open_product(end)
+        ),
+        axis=-1,
+    )
@@ -14,18 +14,35 @@
 
 # pylint: disable=C0103,C1801
 
+import functools
+from concurrent import futures
+
 from pymedphys._imports import numpy as np
 from pymedphys._imports import plt
 
 from pymedphys._utilities.constants import AGILITY
 from pymedphys._utilities.controlpoints import remove_irrelevant_control_points
-
+from pymedphys._utilities.parallel import resolve_workers
+
+from .intervals import (
+    _add_exact_metersetmap_of_intervals,
+    _add_metersetmap_of_samples,
+    _batch_samples,
+    _calc_interval_extents,
+)
 from .plt import pcolormesh_grid
 
 __DEFAULT_LEAF_PAIR_WIDTHS = AGILITY
 __DEFAULT_GRID_RESOLUTION = 1
 __DEFAULT_MAX_LEAF_GAP = 400
 __DEFAULT_MIN_STEP_PER_PIXEL = 10
+__DEFAULT_RAM_AVAILABLE = 2**28  # 256 MB
+
+# Bytes used per time step and calculation pixel by the batched kernels
+__BYTES_PER_SAMPLED_PIXEL = 24
+__BYTES_PER_EXACT_PIXEL = 240
+
+__TIME_INTEGRATION_METHODS = ("sampled", "exact")
 
 
 def calc_metersetmap(
@@ -36,6 +53,8 @@ def calc_metersetmap(
     max_leaf_gap=None,
     leaf_pair_widths=None,
     min_step_per_pixel=None,
+    ram_available=None,
+    time_integration="sampled",
 ):
     """Determine the MetersetMap.
 
@@ -75,7 +94,22 @@ def calc_metersetmap(
 
     min_step_per_pixel : int, optional
         The minimum number of time steps
-        used per pixel for each control point. Defaults to 10.
+        used per pixel for each control point. Defaults to 10. Not used
+        when ``time_integration`` is ``'exact'``.
+
+    ram_available : int, optional
+        The number of bytes the calculation may use at once. Control
+        point intervals are evaluated together in batches which fit
+        within this. Defaults to 256 MB.
+
+    time_integration : str, optional
+        How the open fraction of each pixel is integrated over the linear
+        travel of the leaves and jaws between control points. Either
+        ``'sampled'``, which averages it over ``min_step_per_pixel``
+        time steps per pixel of travel, or ``'exact'``, which integrates
+        the piecewise linear blocked fractions analytically. The exact
+        result is the limit of the sampled one with ever more time steps.
+        Defaults to ``'sampled'``.
 
     Returns
     -------
@@ -198,6 +232,14 @@ def calc_metersetmap(
     if min_step_per_pixel is None:
         min_step_per_pixel = __DEFAULT_MIN_STEP_PER_PIXEL
 
+    if ram_available is None:
+        ram_available = __DEFAULT_RAM_AVAILABLE
+
+    if time_integration not in __TIME_INTEGRATION_METHODS:
+        raise ValueError(
+            f"time_integration should be one of {__TIME_INTEGRATION_METHODS}"
+        )
+
     divisibility_of_max_leaf_gap = np.array(max_leaf_gap / 2 / grid_resolution)
     max_leaf_gap_is_divisible = (
         divisibility_of_max_leaf_gap.astype(int) == divisibility_of_max_leaf_gap
@@ -221,34 +263,146 @@ def calc_metersetmap(
         )
 
     mu, mlc, jaw = remove_irrelevant_control_points(mu, mlc, jaw)
+    mu = mu.astype(float)
+    mlc = mlc.astype(float)
+    jaw = jaw.astype(float)
 
     full_grid = get_grid(max_leaf_gap, grid_resolution, leaf_pair_widths)
 
     metersetmap = np.zeros((len(full_grid["jaw"]), len(full_grid["mlc"])))
 
-    for i in range(len(mu) - 1):
-        control_point_slice = slice(i, i + 2, 1)
-        current_mlc = mlc[control_point_slice, :, :]
-        current_jaw = jaw[control_point_slice, :]
-        delivered_mu = np.diff(mu[control_point_slice])
+    if len(mu) < 2:
+        return metersetmap
+
+    _check_leaf_pair_widths(leaf_pair_widths, grid_resolution)
+    _check_jaw_within_leaves(jaw, leaf_pair_widths)
+
+    leaf_centres, top_of_reference_leaf = _determine_leaf_centres(leaf_pair_widths)
+    extents = _calc_interval_extents(
+        mlc,
+        jaw,
+        full_grid,
+        leaf_centres,
+        _determine_reference_grid_position(top_of_reference_leaf, grid_resolution),
+        grid_resolution,
+        min_step_per_pixel,
+    )
+    delivered_mu = np.diff(mu)
+
+    if time_integration == "exact":
+        for intervals, _ in _batch_samples(
+            extents,
+            delivered_mu,
+            np.ones_like(extents["time_steps"]),
+            __BYTES_PER_EXACT_PIXEL,
+            ram_available,
+        ):
+            _add_exact_metersetmap_of_intervals(
+                metersetmap,
+                intervals,
+                extents,
+                mlc,
+                jaw,
+                delivered_mu,
+                full_grid,
+                grid_resolution,
+            )
 
-        grid, metersetmap_of_slice = calc_single_control_point(
-            current_mlc,
-            current_jaw,
+        return metersetmap
+
+    for sample_interval, time_index in _batch_samples(
+        extents,
+        delivered_mu,
+        extents["time_steps"],
+        __BYTES_PER_SAMPLED_PIXEL,
+        ram_available,
+    ):
+        _add_metersetmap_of_samples(
+            metersetmap,
+            sample_interval,
+            time_index,
+            extents,
+            mlc,
+            jaw,
             delivered_mu,
-            leaf_pair_widths=leaf_pair_widths,
-            grid_resolution=grid_resolution,
-            min_step_per_pixel=min_step_per_pixel,
-        )
-        full_grid_metersetmap_of_slice = _convert_to_full_grid(
-            grid, full_grid, metersetmap_of_slice
+            full_grid,
+            grid_resolution,
         )
 
-        metersetmap += full_grid_metersetmap_of_slice
-
     return metersetmap
 
 
+def calc_metersetmaps(
+    deliveries,
+    grid_resolution=None,
+    max_leaf_gap=None,
+    leaf_pair_widths=None,
+    min_step_per_pixel=None,
+    ram_available=None,
+    time_integration="sampled",
+    workers=None,
+):
+    """Determine the MetersetMap of each of a list of deliveries.
+
+    Each delivery is calculated independently with :func:`calc_metersetmap`,
+    optionally spread over a pool of processes. The results are identical
+    to calculating each delivery in turn.
+
+    Parameters
+    ----------
+    deliveries : sequence
+        The deliveries, each of which either a :class:`pymedphys.Delivery`
+        or a tuple of its ``(mu, mlc, jaw)``.
+
+    workers : int, optional
+        The number of processes to calculate the deliveries over. ``None``
+        and ``1`` calculate them serially within this process, ``-1`` uses
+        all of the available cores.
+
+    ram_available : int, optional
+        The number of bytes the calculation may use at once, divided
+        evenly between the workers. Defaults to 256 MB.
+
+    See :func:`calc_metersetmap` for the remaining parameters.
+
+    Returns
+    -------
+    metersetmaps : list of numpy.ndarray
+        The MetersetMap of each delivery, in the order given.
+    """
+    workers = resolve_workers(workers)
+
+    if ram_available is None:
+        ram_available = __DEFAULT_RAM_AVAILABLE
+
+    delivery_arrays = []
+    for delivery in deliveries:
+        try:
+            mu, mlc, jaw = delivery.monitor_units, delivery.mlc, delivery.jaw
+        except AttributeError:
+            mu, mlc, jaw = delivery
+
+        delivery_arrays.append((np.asarray(mu), np.asarray(mlc), np.asarray(jaw)))
+
+    workers = max(min(workers, len(delivery_arrays)), 1)
+
+    calc = functools.partial(
+        calc_metersetmap,
+        grid_resolution=grid_resolution,
+        max_leaf_gap=max_leaf_gap,
+        leaf_pair_widths=leaf_pair_widths,
+        min_step_per_pixel=min_step_per_pixel,
+        ram_available=max(ram_available // workers, 1),
+        time_integration=time_integration,
+    )
+
+    if workers == 1:
+        return [calc(*arrays) for arrays in delivery_arrays]
+
+    with futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(calc, *zip(*delivery_arrays)))
+
+
 def calc_single_control_point(
     mlc,
     jaw,
@@ -300,21 +454,9 @@ def calc_single_control_point(
     jaw = np.array(jaw, copy=False)
 
     leaf_pair_widths = np.array(leaf_pair_widths)
-    leaf_division = leaf_pair_widths / grid_resolution
-
-    if not np.all(leaf_division.astype(int) == leaf_division):
-        raise ValueError(
-            "The grid resolution needs to exactly divide every leaf pair width."
-        )
 
-    if (
-        not np.max(np.abs(jaw))  # pylint: disable = unneeded-not
-        <= np.sum(leaf_pair_widths) / 2
-    ):
-        raise ValueError(
-            "The jaw should not travel further out than the maximum leaf limits. "
-            f"Max travel was {np.max(np.abs(jaw))}"
-        )
+    _check_leaf_pair_widths(leaf_pair_widths, grid_resolution)
+    _check_jaw_within_leaves(jaw, leaf_pair_widths)
 
     (grid, grid_leaf_map, mlc) = _determine_calc_grid_and_adjustments(
         mlc, jaw, leaf_pair_widths, grid_resolution
@@ -510,19 +652,30 @@ def display_metersetmap(
     plt.gca().invert_yaxis()
 
 
-def _calc_blocked_t(travel_diff, grid_resolution):
-    blocked_t = np.ones_like(travel_diff) * np.nan
+def _check_leaf_pair_widths(leaf_pair_widths, grid_resolution):
+    leaf_division = np.array(leaf_pair_widths) / grid_resolution
 
-    fully_blocked = travel_diff <= -grid_resolution / 2
-    fully_open = travel_diff >= grid_resolution / 2
-    blocked_t[fully_blocked] = 1
-    blocked_t[fully_open] = 0
+    if not np.all(leaf_division.astype(int) == leaf_division):
+        raise ValueError(
+            "The grid resolution needs to exactly divide every leaf pair width."
+        )
 
-    transient = ~fully_blocked & ~fully_open
 
-    blocked_t[transient] = (
-        -travel_diff[transient] + grid_resolution / 2
-    ) / grid_resolution
+def _check_jaw_within_leaves(jaw, leaf_pair_widths):
+    if (
+        not np.max(np.abs(jaw))  # pylint: disable = unneeded-not
+        <= np.sum(leaf_pair_widths) / 2
+    ):
+        raise ValueError(
+            "The jaw should not travel further out than the maximum leaf limits. "
+            f"Max travel was {np.max(np.abs(jaw))}"
+        )
+
+
+def _calc_blocked_t(travel_diff, grid_resolution):
+    # Fully blocked when travel_diff <= -grid_resolution / 2, fully open
+    # when travel_diff >= grid_resolution / 2, and linear in between.
+    blocked_t = np.clip((-travel_diff + grid_resolution / 2) / grid_resolution, 0, 1)
 
     assert np.all(~np.isnan(blocked_t))
 
@@ -661,22 +814,3 @@ def _determine_calc_grid_and_adjustments(mlc, jaw, leaf_pair_widths, grid_resolu
     )
 
     return grid, adjusted_grid_leaf_map, adjusted_mlc
-
-
-def _convert_to_full_grid(grid, full_grid, metersetmap):
-    grid_xx, grid_yy = np.meshgrid(grid["mlc"], grid["jaw"])
-    full_grid_xx, full_grid_yy = np.meshgrid(full_grid["mlc"], full_grid["jaw"])
-
-    xx_from, xx_to = np.where(
-        np.abs(full_grid_xx[None, 0, :] - grid_xx[0, :, None]) < 0.0001
-    )
-    yy_from, yy_to = np.where(
-        np.abs(full_grid_yy[None, :, 0] - grid_yy[:, 0, None]) < 0.0001
-    )
-
-    full_grid_metersetmap = np.zeros_like(full_grid_xx)
-    full_grid_metersetmap[  # pylint: disable=unsupported-assignment-operation
-        np.ix_(yy_to, xx_to)
-    ] = metersetmap[np.ix_(yy_from, xx_from)]
-
-    return full_grid_metersetmap
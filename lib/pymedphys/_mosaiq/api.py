@@ -15,11 +15,15 @@
 
 from typing import Dict, List, Optional, Tuple
 
+from . import cache as _cache
 from . import connect as _connect
 from . import credentials as _credentials
+from . import pool as _pool
 
 Connection = _connect.Connection
+ConnectionPool = _pool.ConnectionPool
 Cursor = _connect.Cursor
+QueryCache = _cache.QueryCache
 
 
 def connect(
@@ -93,7 +97,10 @@ def connect(
 
 
 def execute(
-    connection: Connection, query: str, parameters: Dict = None
+    connection: Connection,
+    query: str,
+    parameters: Dict = None,
+    cache: Optional[QueryCache] = None,
 ) -> List[Tuple[str, ...]]:
     """Execute SQL queries on a Mosaiq database.
 
@@ -114,6 +121,11 @@ def execute(
         Parameters to be included within the query. These are sanitised
         by the underlying ``pymssql`` library before being included
         within the query string, by default None
+    cache : pymedphys.mosaiq.QueryCache, optional
+        A cache of query results. Should the same query with the same
+        parameters have already been made to this server the cached
+        results are returned rather than querying the server again, by
+        default the server is always queried.
 
     Returns
     -------
@@ -187,6 +199,14 @@ def execute(
     3     000003 2021-03-08 23:59:59
     """
 
+    if cache is not None:
+        return cache.get_or_execute(
+            getattr(connection, "server", connection),
+            query,
+            parameters,
+            lambda: execute(connection, query, parameters),
+        )
+
     with connection.cursor() as cursor:
         cursor.execute(query=query, parameters=parameters)
         results: List[Tuple[str, ...]] = cursor.fetchall()
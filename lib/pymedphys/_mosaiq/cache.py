@@ -0,0 +1,127 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""An in memory cache of Mosaiq SQL query results.
+"""
+
+import collections
+import threading
+import time
+from typing import Dict, Optional
+
+
+class QueryCache:
+    """A thread-safe, least recently used cache of query results with an
+    optional time to live.
+
+    Pass an instance to :func:`pymedphys.mosaiq.execute` as its ``cache``
+    parameter to reuse the results of identical queries made to the same
+    server. This is intended for queries of records that don't change,
+    such as the ``TxField`` and ``TxFieldPoint`` of a given ``FLD_ID``.
+
+    Parameters
+    ----------
+    max_size : int, optional
+        The maximum number of query results to hold, by default ``1024``.
+    ttl : Optional[float], optional
+        The number of seconds after which a result is discarded, by
+        default results are kept until they are evicted or invalidated.
+
+    Attributes
+    ----------
+    hits : int
+        The number of queries served from the cache.
+    misses : int
+        The number of queries that were sent to the server.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None):
+        if max_size < 1:
+            raise ValueError("`max_size` must be a positive integer")
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._results = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._results)
+
+    def get_or_execute(self, server, query: str, parameters: Optional[Dict], execute):
+        """Return the cached results of a query, calling ``execute`` to
+        retrieve and store them on a miss."""
+        key = (server, query, _freeze(parameters))
+
+        with self._lock:
+            try:
+                expires, results = self._results[key]
+            except KeyError:
+                pass
+            else:
+                if expires is None or time.monotonic() < expires:
+                    self._results.move_to_end(key)
+                    self.hits += 1
+                    return list(results)
+
+                del self._results[key]
+
+            self.misses += 1
+
+        results = execute()
+
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            self._results[key] = (expires, tuple(results))
+            self._results.move_to_end(key)
+
+            while len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+
+        return results
+
+    def invalidate(
+        self, query: Optional[str] = None, parameters: Optional[Dict] = None
+    ):
+        """Discard cached results.
+
+        With no arguments every result is discarded. Given a ``query``,
+        the results of that query are discarded, and given its
+        ``parameters`` as well only the results for those parameters are.
+        """
+        with self._lock:
+            if query is None:
+                self._results.clear()
+                return
+
+            frozen_parameters = _freeze(parameters)
+            for key in list(self._results):
+                _, cached_query, cached_parameters = key
+                if cached_query == query and (
+                    parameters is None or cached_parameters == frozen_parameters
+                ):
+                    del self._results[key]
+
+
+def _freeze(item):
+    if isinstance(item, dict):
+        return tuple(sorted((key, _freeze(value)) for key, value in item.items()))
+
+    if isinstance(item, (list, tuple)):
+        return tuple(_freeze(value) for value in item)
+
+    return item
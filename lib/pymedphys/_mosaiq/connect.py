@@ -38,6 +38,8 @@ class Connection:
         port: int = 1433,
         database: str = "MOSAIQ",
     ):
+        self.server = (hostname, port, database)
+
         try:
             self._connection = pymssql.connect(
                 hostname, username, password, database=database, port=port
@@ -16,8 +16,9 @@
 """Uses Mosaiq SQL to extract patient delivery details.
 """
 
+import collections
+import datetime
 import functools
-import struct
 
 from pymedphys._imports import attr
 from pymedphys._imports import numpy as np
@@ -71,7 +72,7 @@ def get_field_type(connection, field_id):
 
 
 def get_mosaiq_delivery_details(
-    connection, machine, delivery_time, field_label, field_name, buffer=0
+    connection, machine, delivery_time, field_label, field_name, buffer=0, cache=None
 ):
     """Identifies the patient details for a given delivery time.
 
@@ -82,6 +83,7 @@ def get_mosaiq_delivery_details(
         delivery_time: The time of the treatment delivery
         field_label: The beam field label, called Field ID within Monaco
         field_name: The beam field name, called Description within Monaco
+        cache: An optional ``pymedphys.mosaiq.QueryCache`` of query results
     Returns:
         delivery_details: The identified delivery details
             patient_id: User defined Mosaiq patient ID
@@ -138,7 +140,7 @@ def get_mosaiq_delivery_details(
         "field_name": field_name,
     }
 
-    sql_result = api.execute(connection, execute_string, parameters)
+    sql_result = api.execute(connection, execute_string, parameters, cache=cache)
 
     if len(sql_result) > 1:
         for result in sql_result[1::]:
@@ -151,6 +153,160 @@ def get_mosaiq_delivery_details(
                         field_label,
                         field_name,
                         buffer=0,
+                        cache=cache,
+                    )
+
+                raise MultipleMosaiqEntries("Disagreeing entries were found.")
+
+    if not sql_result:
+        raise NoMosaiqEntries(
+            "No Mosaiq entries were found for {}/{} at {}".format(
+                field_label, field_name, delivery_time
+            )
+        )
+
+    OISDeliveryDetails = create_ois_delivery_details_class()
+    delivery_details = OISDeliveryDetails(*sql_result[0])
+
+    delivery_details.field_type = constants.FIELD_TYPES[delivery_details.field_type]
+
+    return delivery_details
+
+
+def get_mosaiq_delivery_details_bulk(connection, deliveries, buffer=0):
+    """Identifies the patient details for many delivery times at once.
+
+    The deliveries are grouped by machine and date, with one query per
+    group returning every treatment recorded on that machine within the
+    group's time window. Each delivery is then matched against those
+    treatments in the same way as :func:`get_mosaiq_delivery_details`.
+
+    Args:
+        connection: A connection pointing to the Mosaiq SQL server
+        deliveries: An iterable of ``(machine, delivery_time, field_label,
+            field_name)`` tuples, each as would be passed to
+            :func:`get_mosaiq_delivery_details`
+        buffer: The number of seconds either side of the recorded
+            treatment times to accept a delivery time within
+    Returns:
+        results: A list with an item for each of the deliveries. Each item
+            is either the identified delivery details, or the
+            ``NoMosaiqEntries`` or ``MultipleMosaiqEntries`` exception that
+            :func:`get_mosaiq_delivery_details` would have raised for that
+            delivery.
+    """
+    deliveries = list(deliveries)
+
+    groups = collections.defaultdict(list)
+    for i, (machine, delivery_time, _, _) in enumerate(deliveries):
+        delivery_datetime = _parse_mosaiq_datetime(delivery_time)
+        groups[(machine, delivery_datetime.date())].append((i, delivery_datetime))
+
+    results = [None] * len(deliveries)
+    for (machine, _), group in groups.items():
+        delivery_datetimes = [delivery_datetime for _, delivery_datetime in group]
+        treatments = _treatments_within_window(
+            connection,
+            machine,
+            min(delivery_datetimes),
+            max(delivery_datetimes),
+            buffer,
+        )
+
+        for i, delivery_datetime in group:
+            _, delivery_time, field_label, field_name = deliveries[i]
+            try:
+                results[i] = _match_delivery_details(
+                    treatments,
+                    delivery_datetime,
+                    field_label,
+                    field_name,
+                    buffer,
+                    delivery_time,
+                )
+            except (NoMosaiqEntries, MultipleMosaiqEntries) as e:
+                results[i] = e
+
+    return results
+
+
+def _parse_mosaiq_datetime(delivery_time):
+    if isinstance(delivery_time, datetime.datetime):
+        return delivery_time
+
+    return datetime.datetime.fromisoformat(str(delivery_time))
+
+
+def _treatments_within_window(connection, machine, window_start, window_end, buffer):
+    execute_string = """
+        SELECT
+            Ident.IDA,
+            TxField.FLD_ID,
+            Patient.Last_Name,
+            Patient.First_Name,
+            Tracktreatment.WasQAMode,
+            TxField.Type_Enum,
+            Tracktreatment.WasBeamComplete,
+            TxField.Field_Label,
+            TxField.Field_Name,
+            TrackTreatment.Create_DtTm,
+            TrackTreatment.Edit_DtTm
+        FROM TrackTreatment, Ident, Patient, TxField, Staff
+        WHERE
+            TrackTreatment.Pat_ID1 = Ident.Pat_ID1 AND
+            Patient.Pat_ID1 = Ident.Pat_ID1 AND
+            TrackTreatment.FLD_ID = TxField.FLD_ID AND
+            Staff.Staff_ID = TrackTreatment.Machine_ID_Staff_ID AND
+            REPLACE(Staff.Last_Name, ' ', '') = %(machine)s AND
+            TrackTreatment.Create_DtTm <= DATEADD(second, %(buffer)d, %(window_end)s) AND
+            TrackTreatment.Edit_DtTm >= DATEADD(second, -%(buffer)d, %(window_start)s)
+        ORDER BY TrackTreatment.Create_DtTm
+        """
+
+    parameters = {
+        "buffer": buffer,
+        "machine": machine,
+        "window_start": window_start.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
+        "window_end": window_end.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
+    }
+
+    return api.execute(connection, execute_string, parameters)
+
+
+def _sql_string_equal(sql_string, python_string):
+    """String equality as within the default case insensitive collation of
+    MSSQL, which also ignores trailing spaces."""
+    if sql_string is None:
+        return False
+
+    return sql_string.rstrip().lower() == python_string.rstrip().lower()
+
+
+def _match_delivery_details(
+    treatments, delivery_datetime, field_label, field_name, buffer, delivery_time
+):
+    window = datetime.timedelta(seconds=buffer)
+    sql_result = [
+        tuple(treatment[0:7])
+        for treatment in treatments
+        if _sql_string_equal(treatment[7], field_label)
+        and _sql_string_equal(treatment[8], field_name)
+        and _parse_mosaiq_datetime(treatment[9]) <= delivery_datetime + window
+        and _parse_mosaiq_datetime(treatment[10]) >= delivery_datetime - window
+    ]
+
+    # Mirrors the disagreement handling of ``get_mosaiq_delivery_details``
+    if len(sql_result) > 1:
+        for result in sql_result[1::]:
+            if result != sql_result[0]:
+                if buffer != 0:
+                    return _match_delivery_details(
+                        treatments,
+                        delivery_datetime,
+                        field_label,
+                        field_name,
+                        0,
+                        delivery_time,
                     )
 
                 raise MultipleMosaiqEntries("Disagreeing entries were found.")
@@ -188,13 +344,7 @@ def mosaiq_mlc_missing_byte_workaround(raw_bytes_list):
 
 
 def append_x00_byte_to_all(raw_bytes_list):
-    appended_bytes_list = []
-    for item in raw_bytes_list:
-        bytes_as_list = list(item)
-        bytes_as_list.append(0)
-        appended_bytes_list.append(bytes(bytes_as_list))
-
-    return appended_bytes_list
+    return [bytes(item) + b"\x00" for item in raw_bytes_list]
 
 
 def check_all_items_equal_length(items, name):
@@ -210,32 +360,49 @@ def check_all_items_equal_length(items, name):
 
 
 def decode_msq_mlc(raw_bytes):
-    """Convert MLCs from Mosaiq SQL byte format to cm floats."""
-    raw_bytes = mosaiq_mlc_missing_byte_workaround(raw_bytes)
+    """Convert MLCs from Mosaiq SQL byte format to cm floats.
 
-    length = check_all_items_equal_length(raw_bytes, "mlc bytes")
+    The leaf sets of all of the control points are decoded together as a
+    single buffer of little endian int16 leaf positions.
+    """
+    leaf_set_bytes = _leaf_set_bytes_as_array(raw_bytes)
 
-    if length % 2 == 1:
-        raise ValueError(
-            "There should be an even number of bytes within an MLC record."
-        )
+    # The vectorised form of ``mosaiq_mlc_missing_byte_workaround``
+    if leaf_set_bytes.shape[1] % 2 == 1:
+        leaf_set_bytes = np.pad(leaf_set_bytes, ((0, 0), (0, 1)))
 
     mlc_pos = (
-        np.array(
-            [
-                [
-                    struct.unpack("<h", control_point[2 * i : 2 * i + 2])
-                    for i in range(len(control_point) // 2)
-                ]
-                for control_point in raw_bytes
-            ]
-        )
+        np.ascontiguousarray(leaf_set_bytes)
+        .view("<i2")
+        .reshape(len(leaf_set_bytes), -1, 1)
         / 100
     )
 
     return mlc_pos
 
 
+def _leaf_set_bytes_as_array(raw_bytes):
+    """The raw leaf sets as a (control points, bytes) array of uint8."""
+    if isinstance(raw_bytes, np.ndarray) and raw_bytes.dtype.kind == "S":
+        # A fixed width bytes array, as returned by
+        # ``Series.to_numpy(dtype=bytes)``, pads each leaf set to the same
+        # width with the null bytes that indexing it would otherwise strip.
+        # Their original lengths are lost, so unlike a sequence of bytes
+        # objects they can't be checked against each other.
+        return (
+            np.ascontiguousarray(raw_bytes)
+            .view(np.uint8)
+            .reshape(len(raw_bytes), raw_bytes.dtype.itemsize)
+        )
+
+    raw_bytes = [bytes(item) for item in raw_bytes]
+    length = check_all_items_equal_length(raw_bytes, "mlc bytes")
+
+    return np.frombuffer(b"".join(raw_bytes), dtype=np.uint8).reshape(
+        len(raw_bytes), length
+    )
+
+
 def collimation_to_bipolar_mm(mlc_a, mlc_b, coll_y1, coll_y2):
     mlc1 = 10 * mlc_b[::-1, :]
     mlc2 = -10 * mlc_a[::-1, :]
@@ -250,7 +417,7 @@ def collimation_to_bipolar_mm(mlc_a, mlc_b, coll_y1, coll_y2):
     return mlc, jaw
 
 
-def _raw_delivery_data_sql(connection, field_id):
+def _raw_delivery_data_sql(connection, field_id, cache=None):
     txfield_results = api.execute(
         connection,
         """
@@ -263,6 +430,7 @@ def _raw_delivery_data_sql(connection, field_id):
         {
             "field_id": field_id,
         },
+        cache=cache,
     )
 
     txfieldpoint_results = api.execute(
@@ -283,24 +451,26 @@ def _raw_delivery_data_sql(connection, field_id):
             TxFieldPoint.Point
         """,
         {"field_id": field_id},
+        cache=cache,
     )
 
     return txfield_results, txfieldpoint_results
 
 
-def delivery_data_sql(connection, field_id):
+def delivery_data_sql(connection, field_id, cache=None):
     """Get the treatment delivery data from Mosaiq given the SQL field_id
 
     Args:
         connection: A connection pointing to the Mosaiq SQL server
         field_id: The Mosaiq SQL field ID
+        cache: An optional ``pymedphys.mosaiq.QueryCache`` of query results
 
     Returns:
         txfield_results: The results from the TxField table.
         txfieldpoint_results: The results from the TxFieldPoint table.
     """
     raw_txfield_results, raw_txfieldpoint_results = _raw_delivery_data_sql(
-        connection, field_id
+        connection, field_id, cache=cache
     )
 
     if len(raw_txfield_results) != 1:
@@ -331,8 +501,8 @@ def delivery_data_sql(connection, field_id):
 
 class DeliveryMosaiq(DeliveryBase):
     @classmethod
-    def from_mosaiq(cls, connection, field_id):
-        total_mu, tx_field_points = delivery_data_sql(connection, field_id)
+    def from_mosaiq(cls, connection, field_id, cache=None):
+        total_mu, tx_field_points = delivery_data_sql(connection, field_id, cache=cache)
         tx_field_points_index = tx_field_points["Index"].to_numpy(dtype=float)
 
         if np.shape(tx_field_points_index) == ():
@@ -343,10 +513,12 @@ class DeliveryMosaiq(DeliveryBase):
 
         monitor_units = np.cumsum(mu_per_control_point).tolist()
 
-        raw_mlc_a = tx_field_points["A_Leaf_Set"].to_numpy(dtype=bytes)
+        # Passed as the bytes objects returned by the server, so that the
+        # lengths of the leaf sets can be checked against each other
+        raw_mlc_a = tx_field_points["A_Leaf_Set"].tolist()
         mlc_a = np.squeeze(decode_msq_mlc(raw_mlc_a)).T
 
-        raw_mlc_b = tx_field_points["B_Leaf_Set"].to_numpy(dtype=bytes)
+        raw_mlc_b = tx_field_points["B_Leaf_Set"].tolist()
         mlc_b = np.squeeze(decode_msq_mlc(raw_mlc_b)).T
 
         msq_gantry_angle = tx_field_points["Gantry_Ang"].to_numpy(dtype=float)
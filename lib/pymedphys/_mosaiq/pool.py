@@ -0,0 +1,229 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""A thread-safe pool of connections to a Mosaiq SQL server.
+"""
+
+import contextlib
+import math
+import threading
+import time
+from typing import Optional
+
+from . import connect as _connect
+from . import credentials as _credentials
+
+HEALTH_CHECK_QUERY = "SELECT 1"
+
+
+class ConnectionPool:
+    """A thread-safe pool of connections to a Mosaiq SQL server.
+
+    Connections are created as they are needed, up to ``max_size`` of
+    them, and are returned to the pool for reuse once each caller is done
+    with them. A connection that has been idle within the pool for longer
+    than ``health_check_interval`` seconds is checked with a trivial
+    query before it is reused, and is replaced should that query fail.
+
+    Credentials are retrieved in the same way as
+    :func:`pymedphys.mosaiq.connect`, once, when the pool is created.
+
+    Parameters
+    ----------
+    hostname : str
+        The IP address or hostname of the SQL server.
+    port : int, optional
+        The port at which the SQL server is hosted, by default ``1433``
+    database : str, optional
+        The MSSQL database name, by default ``"MOSAIQ"``
+    alias : Optional[str], optional
+        A human readable representation of the server, presented to the
+        user should there not be credentials already on the machine.
+    username : Optional[str], optional
+        Provide a username to login to the database with.
+    password : Optional[str], optional
+        Provide a password to login to the database with.
+    max_size : int, optional
+        The maximum number of connections to the server, by default ``4``.
+    health_check_interval : float, optional
+        The number of seconds a connection may be idle before it is
+        checked prior to reuse, by default ``30``.
+
+    Examples
+    --------
+    >>> import pymedphys.mosaiq
+    >>> pool = pymedphys.mosaiq.ConnectionPool('msqsql')  # doctest: +SKIP
+
+    >>> with pool.connection() as connection:  # doctest: +SKIP
+    ...     pymedphys.mosaiq.execute(connection, "SELECT 1")
+    [(1,)]
+
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int = 1433,
+        database: str = "MOSAIQ",
+        alias: Optional[str] = None,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        max_size: int = 4,
+        health_check_interval: float = 30,
+    ):
+        if max_size < 1:
+            raise ValueError("`max_size` must be a positive integer")
+
+        if username is None and password is None:
+            (
+                username,
+                password,
+            ) = _credentials.get_username_password_with_prompt_fallback(
+                hostname=hostname, port=port, database=database, alias=alias
+            )
+        if username is None or password is None:
+            raise ValueError(
+                "Must either provide both username and password, or neither of them."
+            )
+
+        self._credentials = {
+            "username": username,
+            "password": password,
+            "hostname": hostname,
+            "port": port,
+            "database": database,
+        }
+        self.max_size = max_size
+        self.health_check_interval = health_check_interval
+
+        self._condition = threading.Condition()
+        self._idle = []  # (connection, time it was last known to be healthy)
+        self._size = 0
+        self._closed = False
+
+    @property
+    def size(self):
+        """The number of open connections, both idle and in use."""
+        return self._size
+
+    @contextlib.contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """Borrow a connection from the pool for the duration of a
+        ``with`` block.
+
+        Waits up to ``timeout`` seconds for a connection should
+        ``max_size`` connections already be in use, raising
+        ``TimeoutError`` beyond that.
+        """
+        connection = self._acquire(timeout)
+        try:
+            yield connection
+        except BaseException:
+            # The connection may have been broken, so it is checked before
+            # its next use
+            self._release(connection, last_healthy=-math.inf)
+            raise
+
+        self._release(connection, last_healthy=time.monotonic())
+
+    def close(self):
+        """Close the idle connections and any in use once they are
+        returned."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._condition.notify_all()
+
+        for connection, _ in idle:
+            _close_quietly(connection)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def _acquire(self, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise ValueError("The connection pool has been closed.")
+
+                if self._idle:
+                    connection, last_healthy = self._idle.pop()
+                    break
+
+                if self._size < self.max_size:
+                    self._size += 1
+                    connection = None
+                    break
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(
+                        f"No connection became available within {timeout} seconds."
+                    )
+
+                self._condition.wait(remaining)
+
+        # Connecting and health checks happen outside of the lock so that
+        # other threads are not held up by the round trip to the server.
+        try:
+            if connection is not None:
+                if time.monotonic() - last_healthy <= self.health_check_interval:
+                    return connection
+
+                if _is_healthy(connection):
+                    return connection
+
+                _close_quietly(connection)
+
+            return _connect.connect_with_credentials(**self._credentials)
+        except BaseException:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+
+            raise
+
+    def _release(self, connection, last_healthy):
+        with self._condition:
+            if not self._closed:
+                self._idle.append((connection, last_healthy))
+                self._condition.notify()
+                return
+
+            self._size -= 1
+
+        _close_quietly(connection)
+
+
+def _is_healthy(connection):
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(HEALTH_CHECK_QUERY)
+            cursor.fetchall()
+    except Exception:  # pylint: disable = broad-except
+        return False
+
+    return True
+
+
+def _close_quietly(connection):
+    with contextlib.suppress(Exception):
+        connection.close()
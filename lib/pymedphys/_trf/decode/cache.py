@@ -0,0 +1,248 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""A persistent cache of decoded TRF logfiles.
+
+Each decoded logfile is stored as an uncompressed NumPy ``.npz`` file
+holding one array per table column, so that a subset of the columns can
+be loaded without reading the others. Entries are keyed by the SHA1 of
+the logfile contents along with ``DECODER_VERSION``, and the least
+recently used entries are removed once the cache exceeds its maximum
+size.
+
+The cache used by :func:`pymedphys.trf.read` is configured within the
+PyMedPhys ``config.toml``::
+
+    [trf_logfiles]
+    root_directory = '/path/to/logfiles'
+
+    [trf_logfiles.decoded_cache]
+    # Defaults to a ``decoded_cache`` directory next to ``index.json``
+    directory = '/path/to/cache'
+    max_size_mb = 2048
+
+"""
+
+import contextlib
+import functools
+import hashlib
+import json
+import os
+import pathlib
+import tempfile
+import zipfile
+
+from pymedphys._imports import numpy as np
+from pymedphys._imports import pandas as pd
+
+from pymedphys import _config
+from pymedphys._data import hashcache
+
+from .header import Header
+
+# Increment whenever a change to the decoder changes its output
+DECODER_VERSION = 1
+
+DEFAULT_MAX_SIZE_MB = 2048
+
+HEADER_KEY = "header"
+COLUMNS_KEY = "columns"
+INDEX_KEY = "index"
+
+VERIFIED_HASHES_FILENAME = "verified-hashes.json"
+
+
+class MissingColumnsError(ValueError):
+    """The requested columns are not within the cached logfile."""
+
+
+class DecodedTrfCache:
+    """A directory of decoded TRF logfiles.
+
+    Parameters
+    ----------
+    directory : pathlike
+        The directory in which to store the decoded logfiles. Created on
+        first use.
+    max_size_mb : float, optional
+        The size of the cache beyond which the least recently used
+        entries are removed. Defaults to 2048 MB.
+    """
+
+    def __init__(self, directory, max_size_mb=DEFAULT_MAX_SIZE_MB):
+        self.directory = pathlib.Path(directory)
+        self.max_bytes = int(max_size_mb * 2**20)
+
+        self.verified_hashes = hashcache.VerifiedHashes(
+            self.directory.joinpath(VERIFIED_HASHES_FILENAME)
+        )
+
+    def hash_file(self, filepath):
+        """The SHA1 of a TRF file, only rehashed once its size,
+        modification time or inode changes."""
+        return self.verified_hashes.hash_file(filepath)
+
+    def filepath(self, file_hash):
+        return self.directory.joinpath(f"{file_hash}_v{DECODER_VERSION}.npz")
+
+    def load(self, file_hash, columns=None):
+        """Load the header and table of a decoded logfile.
+
+        Returns ``None`` when the logfile is not within the cache. Only
+        the requested ``columns`` of the table are read.
+        """
+        filepath = self.filepath(file_hash)
+
+        try:
+            with np.load(filepath) as stored:
+                header_dataframe = _header_from_json(str(stored[HEADER_KEY]))
+                column_names = [str(name) for name in list(stored[COLUMNS_KEY])]
+
+                if columns is None:
+                    columns = column_names
+
+                missing_columns = set(columns).difference(column_names)
+                if missing_columns:
+                    raise MissingColumnsError(
+                        "The following columns are not within this TRF: "
+                        f"{sorted(missing_columns)}"
+                    )
+
+                position = {name: i for i, name in enumerate(column_names)}
+                table_dataframe = pd.DataFrame(
+                    {name: stored[_column_key(position[name])] for name in columns},
+                    index=pd.Index(stored[INDEX_KEY]),
+                )
+
+                # Modification time records the last use for eviction
+                with contextlib.suppress(OSError):
+                    os.utime(filepath)
+
+                return header_dataframe, table_dataframe
+        except FileNotFoundError:
+            return None
+        except MissingColumnsError:
+            raise
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            # An otherwise unreadable entry is removed and decoded again
+            with contextlib.suppress(OSError):
+                filepath.unlink()
+
+            return None
+
+    def store(self, file_hash, header_dataframe, table_dataframe):
+        """Store a decoded logfile and then evict entries beyond the
+        maximum size of the cache."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        arrays = {
+            HEADER_KEY: np.array(_header_to_json(header_dataframe)),
+            COLUMNS_KEY: np.array(table_dataframe.columns, dtype=str),
+            INDEX_KEY: table_dataframe.index.to_numpy(),
+        }
+        for i, name in enumerate(table_dataframe.columns):
+            column = table_dataframe[name].to_numpy()
+            if column.dtype == object:
+                column = column.astype(str)
+
+            arrays[_column_key(i)] = column
+
+        # Written to a temporary file first so that a partially written
+        # entry is never loaded
+        with tempfile.NamedTemporaryFile(
+            dir=self.directory, suffix=".tmp", delete=False
+        ) as f:
+            np.savez(f, **arrays)
+
+        os.replace(f.name, self.filepath(file_hash))
+
+        self.evict()
+
+    def evict(self):
+        """Remove the least recently used entries until the cache is within
+        its maximum size."""
+        entries = []
+        for filepath in self.directory.glob("*.npz"):
+            with contextlib.suppress(FileNotFoundError):
+                stat = filepath.stat()
+                entries.append((stat.st_mtime, stat.st_size, filepath))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, filepath in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+
+            with contextlib.suppress(FileNotFoundError):
+                filepath.unlink()
+
+            total_size -= size
+
+
+@functools.lru_cache()
+def get_default_cache():
+    """The decoded logfile cache configured within ``config.toml``, or
+    ``None`` when one has not been configured."""
+    try:
+        trf_config = _config.get_config()["trf_logfiles"]
+        cache_config = trf_config["decoded_cache"]
+    except (KeyError, OSError):
+        return None
+
+    try:
+        directory = cache_config["directory"]
+    except KeyError:
+        try:
+            directory = pathlib.Path(trf_config["root_directory"]).joinpath(
+                "decoded_cache"
+            )
+        except KeyError:
+            return None
+
+    return DecodedTrfCache(
+        directory, cache_config.get("max_size_mb", DEFAULT_MAX_SIZE_MB)
+    )
+
+
+def hash_trf_contents(trf_contents):
+    """The SHA1 of TRF contents already in memory, matching
+    :meth:`DecodedTrfCache.hash_file`."""
+    return hashlib.sha1(trf_contents).hexdigest()
+
+
+def _column_key(i):
+    return f"column_{i}"
+
+
+def _header_to_json(header_dataframe):
+    header = {
+        field: header_dataframe[field].values[0] for field in header_dataframe.columns
+    }
+    header["item_parts"] = header["item_parts"].tolist()
+
+    return json.dumps({key: _to_builtin(item) for key, item in header.items()})
+
+
+def _header_from_json(header_json):
+    header = json.loads(header_json)
+    header["item_parts"] = np.array(header["item_parts"], dtype=np.int16)
+
+    return pd.DataFrame([Header(**header)], columns=Header._fields)
+
+
+def _to_builtin(item):
+    try:
+        return item.item()
+    except AttributeError:
+        return item
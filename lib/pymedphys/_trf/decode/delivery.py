@@ -21,8 +21,10 @@ from pymedphys._vendor.deprecated import deprecated as _deprecated
 
 from .constants import (
     COLLIMATOR_NAME,
+    DELIVERY_COLUMN_NAMES,
     GANTRY_NAME,
     JAW_NAMES,
+    MU_NAME,
     Y1_LEAF_BANK_NAMES,
     Y2_LEAF_BANK_NAMES,
 )
@@ -35,6 +37,9 @@ class DeliveryLogfile(DeliveryBase):
         """Create a ``pymedphys.Delivery`` object from a Elekta Agility
         TRF logfile.
 
+        Only the columns of the logfile needed for the delivery are
+        decoded.
+
         Parameters
         ----------
         filepath
@@ -45,7 +50,7 @@ class DeliveryLogfile(DeliveryBase):
         delivery : pymedphys.Delivery
 
         """
-        _, dataframe = read_trf(filepath)
+        _, dataframe = read_trf(filepath, columns=DELIVERY_COLUMN_NAMES)
         delivery = cls._from_pandas(dataframe)
 
         return delivery
@@ -62,7 +67,7 @@ class DeliveryLogfile(DeliveryBase):
 
     @classmethod
     def _from_pandas(cls: Type[DeliveryGeneric], table) -> DeliveryGeneric:
-        raw_monitor_units = table["Step Dose/Actual Value (Mu)"]
+        raw_monitor_units = table[MU_NAME]
 
         diff = np.append([0], np.diff(raw_monitor_units))
         diff[diff < 0] = 0
@@ -72,14 +77,11 @@ class DeliveryLogfile(DeliveryBase):
         gantry = table[GANTRY_NAME]
         collimator = table[COLLIMATOR_NAME]
 
-        y1_bank = [table[name] for name in Y1_LEAF_BANK_NAMES]
-
-        y2_bank = [table[name] for name in Y2_LEAF_BANK_NAMES]
+        y1_bank = table[Y1_LEAF_BANK_NAMES].to_numpy()
+        y2_bank = table[Y2_LEAF_BANK_NAMES].to_numpy()
 
-        mlc = [y1_bank, y2_bank]
-        mlc = np.swapaxes(mlc, 0, 2)
+        mlc = np.stack([y1_bank, y2_bank], axis=-1)
 
-        jaw = [table[name] for name in JAW_NAMES]
-        jaw = np.swapaxes(jaw, 0, 1)
+        jaw = table[JAW_NAMES].to_numpy()
 
         return cls(monitor_units, gantry, collimator, mlc, jaw)
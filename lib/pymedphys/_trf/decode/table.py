@@ -20,12 +20,92 @@ from pymedphys._imports import pandas as pd
 from .constants import CONFIG
 
 
-def decode_trf_table(trf_table_contents, header_table_contents):
+def decode_trf_table(
+    trf_table_contents, header_table_contents, columns=None, rows=None
+):
+    """Decode the table portion of a TRF file into a DataFrame.
 
+    Parameters
+    ----------
+    trf_table_contents : bytes-like
+        The table portion of a TRF file. Any object supporting the buffer
+        protocol, such as a memory map, is decoded without being copied.
+    header_table_contents : pd.DataFrame
+        The decoded TRF header.
+    columns : list of str, optional
+        The names of the columns to decode, in the order to return them.
+        Defaults to all of the columns within the TRF.
+    rows : slice, optional
+        The rows of the table to decode, each of which is one time
+        increment of the log. The index of the DataFrame remains the time
+        of each row within the full log. Defaults to all of the rows.
+    """
     version = header_table_contents["version"].values[0].astype(int)
     item_parts_length = header_table_contents["item_parts_length"].values[0].astype(int)
     item_parts = header_table_contents["item_parts"].values[0]
 
+    row_dtype = create_row_dtype(version, item_parts_length)
+    num_rows, remainder = divmod(len(trf_table_contents), row_dtype.itemsize)
+
+    if remainder == 0:
+        row_numbers = range(num_rows)
+        if rows is not None:
+            row_numbers = row_numbers[rows]
+
+        if row_numbers.step < 1:
+            raise ValueError("Only ascending rows can be decoded from a TRF table")
+
+        if len(row_numbers) == 0:
+            table_rows = np.zeros(0, dtype=row_dtype)
+        else:
+            table_rows = np.frombuffer(
+                trf_table_contents,
+                dtype=row_dtype,
+                count=row_numbers[-1] - row_numbers.start + 1,
+                offset=row_numbers.start * row_dtype.itemsize,
+            )[:: row_numbers.step]
+
+        return decode_columns(
+            table_rows,
+            version,
+            item_parts_length,
+            item_parts,
+            columns=columns,
+            row_numbers=row_numbers,
+        )
+
+    table_dataframe = decode_trf_table_by_row(
+        bytes(trf_table_contents), version, item_parts_length, item_parts
+    )
+
+    return select_columns_and_rows(table_dataframe, columns, rows)
+
+
+def select_columns_and_rows(table_dataframe, columns=None, rows=None):
+    """Select from an already decoded table in the same way as the
+    ``columns`` and ``rows`` parameters of :func:`decode_trf_table`."""
+    if rows is not None:
+        if range(len(table_dataframe))[rows].step < 1:
+            raise ValueError("Only ascending rows can be decoded from a TRF table")
+
+        table_dataframe = table_dataframe.iloc[rows]
+
+    if columns is not None:
+        missing_columns = set(columns).difference(table_dataframe.columns)
+        if missing_columns:
+            raise ValueError(
+                "The following columns are not within this TRF: "
+                f"{sorted(missing_columns)}"
+            )
+
+        table_dataframe = table_dataframe[list(columns)]
+
+    return table_dataframe
+
+
+def decode_trf_table_by_row(trf_table_contents, version, item_parts_length, item_parts):
+    """Decode the table one row at a time. Unlike :func:`decode_columns`
+    this supports a final row which has been cut short."""
     decoded_rows, column_names = decode_rows(
         trf_table_contents, version, item_parts_length, item_parts
     )
@@ -41,6 +121,154 @@ def decode_trf_table(trf_table_contents, header_table_contents):
     return table_dataframe
 
 
+def create_row_dtype(version, item_parts_length):
+    """The NumPy structured dtype of a single row of the TRF table.
+
+    From version 2 onwards each row begins with an 8 byte ``timestamp``.
+    The ``items`` field is the row's item part values, one per column.
+    """
+    dtype = CONFIG["version_row"][str(version)]["dtype"]
+    offset = CONFIG["version_row"][str(version)]["offset"]
+    lg_scale = CONFIG["version_row"][str(version)]["lg_scale"]
+    line_grouping = lg_scale * item_parts_length + offset
+
+    names = ["items"]
+    formats = [(np.dtype(dtype), (item_parts_length // 2,))]
+    offsets = [offset]
+
+    if version > 1:
+        names.append("timestamp")
+        formats.append(np.dtype(np.int64))
+        offsets.append(0)
+
+    return np.dtype(
+        {
+            "names": names,
+            "formats": formats,
+            "offsets": offsets,
+            "itemsize": line_grouping,
+        }
+    )
+
+
+def get_column_names(item_parts_length, item_parts):
+    column_names_from_dict = CONFIG["item_part_names"]
+
+    return [
+        column_names_from_dict[str(item_parts[i]) + "_" + str(item_parts[i + 1])]
+        for i in range(0, item_parts_length, 2)
+    ]
+
+
+def decode_columns(
+    rows, version, item_parts_length, item_parts, columns=None, row_numbers=None
+):
+    """Convert an array of ``create_row_dtype`` rows into the TRF table
+    DataFrame.
+
+    Gives the same result as decoding row by row and then applying
+    :func:`convert_data_table`, with each column converted from its
+    strided view of ``rows`` in a single vectorised operation. Only the
+    requested ``columns`` are converted. ``row_numbers`` are the positions
+    of ``rows`` within the full table, used for the time index.
+    """
+    column_names = get_column_names(item_parts_length, item_parts)
+    available_columns = column_names
+    if version > 1:
+        available_columns = [f"unknown{i + 1}" for i in range(4)] + column_names
+
+    if columns is None:
+        columns = available_columns
+
+    missing_columns = set(columns).difference(available_columns)
+    if missing_columns:
+        raise ValueError(
+            f"The following columns are not within this TRF: {sorted(missing_columns)}"
+        )
+
+    if row_numbers is None:
+        row_numbers = range(len(rows))
+
+    converted_columns = {
+        name: _convert_column(rows, version, column_names, name) for name in columns
+    }
+
+    dataframe = pd.DataFrame(converted_columns, index=pd.RangeIndex(len(rows)))
+    dataframe.index = np.round(pd.Index(row_numbers) * CONFIG["time_increment"], 2)
+
+    return dataframe
+
+
+def _convert_column(rows, version, column_names, name):
+    if name.startswith("unknown"):
+        return _convert_timestamp_word(rows, name)
+
+    i = column_names.index(name)
+    column = rows["items"][:, i]
+
+    if name in _NAMED_COLUMN_CONVERTERS:
+        return _NAMED_COLUMN_CONVERTERS[name](column)
+
+    scaled_start = column_names.index("Step Gantry/Scaled Actual (deg)")
+    if int(version) == 4:
+        scaled_end = column_names.index("Mlc Status/Actual Value (None)")
+    else:
+        scaled_end = len(column_names)
+
+    if scaled_start <= i < scaled_end:
+        return _convert_scaled_column(name, column)
+
+    # Row by row decoding concatenates the items onto the int64 timestamp
+    if version > 1:
+        return column.astype(np.int64)
+
+    return column
+
+
+def _convert_timestamp_word(rows, name):
+    # The four little endian 16 bit words of the timestamp
+    words = rows["timestamp"].astype("<i8").view("<u2").reshape(-1, 4)
+
+    return words[:, int(name[-1]) - 1].astype(np.int64)
+
+
+def _convert_scaled_column(name, column):
+    column = column / 10
+
+    if name == "Table Isocentric/Scaled Actual (deg)":
+        return (column / 0.1).astype(int)
+
+    if "Y2 Leaf" in name and "Scaled Actual" in name:
+        return -column
+
+    return column
+
+
+def _convert_linac_state(column):
+    return convert_numbers_to_string(
+        "linac state", CONFIG["linac_state_codes"], pd.Series(column)
+    )
+
+
+def _convert_wedge(column):
+    return convert_numbers_to_string("wedge", CONFIG["wedge_codes"], pd.Series(column))
+
+
+def _convert_raw_dose(column):
+    column = column.astype(np.int64)
+    column[column < 0] += 2**16
+
+    return column
+
+
+_NAMED_COLUMN_CONVERTERS = {
+    "Linac State/Actual Value (None)": _convert_linac_state,
+    "Wedge Position/Actual Value (None)": _convert_wedge,
+    "Step Dose/Actual Value (Mu)": lambda column: column / 10,
+    "Dose/Raw value (1/64th Mu)": _convert_raw_dose,
+}
+
+
 def decode_rows(trf_table_contents, version, item_parts_length, item_parts):
 
     column_names_from_dict = CONFIG["item_part_names"]
@@ -13,63 +13,256 @@
 # limitations under the License.
 
 
-"""Converts a trf file into a csv file.
+"""Converts trf files into csv, parquet or feather files.
 """
 
 
+import collections
+import io
 import logging
 import os
 import pathlib
+import sys
+from concurrent import futures
 from glob import glob
 
+from pymedphys._imports import pandas as pd
+from pymedphys._imports import tqdm
+
+from pymedphys._utilities.parallel import resolve_workers
+
 from .trf2pandas import trf2pandas
 
+OUTPUT_FORMATS = ("csv", "parquet", "feather")
+
+BatchConversion = collections.namedtuple(
+    "BatchConversion", ["converted", "skipped", "failed"]
+)
+
+
+def trf2csv_by_directory(
+    input_directory, output_directory, output_format="csv", workers=None
+):
+    """Convert every trf file within a directory.
 
-def trf2csv_by_directory(input_directory, output_directory):
+    Unlike ``trf2csv_batch``, the first trf that fails to convert raises
+    its error.
+    """
     filepaths = glob(os.path.join(input_directory, "*.trf"))
 
+    conversions = []
     for filepath in filepaths:
         filename = os.path.basename(filepath)
         new_filename = os.path.join(output_directory, filename)
 
-        header_csv_filepath = "{}.header.csv".format(new_filename)
-        table_csv_filepath = "{}.table.csv".format(new_filename)
+        conversions.append(
+            (
+                filepath,
+                f"{new_filename}.header.{output_format}",
+                f"{new_filename}.table.{output_format}",
+            )
+        )
 
-        print("Converting {}".format(filepath))
+    return _convert_batch(
+        conversions,
+        output_format,
+        workers=workers,
+        skip_up_to_date=False,
+        raise_on_failure=True,
+    )
 
-        header, table = trf2pandas(filepath)
-        header.to_csv(header_csv_filepath)
-        table.to_csv(table_csv_filepath)
 
-
-def trf2csv(trf_filepath, output_directory=None):
+def trf2csv(trf_filepath, output_directory=None, output_format="csv"):
     trf_filepath = pathlib.Path(trf_filepath)
 
     if not trf_filepath.exists():
         raise ValueError("The provided trf filepath cannot be found.")
 
+    header_filepath, table_filepath = _output_filepaths(
+        trf_filepath, output_directory, output_format
+    )
+    _convert(trf_filepath, header_filepath, table_filepath, output_format)
+
+    return header_filepath, table_filepath
+
+
+def trf2csv_batch(
+    trf_filepaths,
+    output_directory=None,
+    output_format="csv",
+    workers=None,
+    skip_up_to_date=True,
+    progress=False,
+):
+    """Convert many trf files, optionally over a pool of processes.
+
+    The header and table of each trf are saved next to it, or within
+    ``output_directory``, as ``<name>_header.<format>`` and
+    ``<name>_table.<format>``. A failure to convert one trf is recorded
+    and does not stop the rest of the batch.
+
+    Parameters
+    ----------
+    trf_filepaths : list of pathlike
+        The trf files to convert.
+    output_directory : pathlike, optional
+        The directory within which to save the converted files. Defaults
+        to the directory of each trf.
+    output_format : str, optional
+        One of ``"csv"``, ``"parquet"`` or ``"feather"``. Parquet and
+        feather require ``pyarrow`` to be installed.
+    workers : int, optional
+        The number of processes to convert the files with. ``-1`` uses all
+        of the available cores. Defaults to converting within this process.
+    skip_up_to_date : bool, optional
+        Whether to skip trf files whose converted files are newer than the
+        trf itself.
+    progress : bool, optional
+        Whether to display a progress bar.
+
+    Returns
+    -------
+    BatchConversion
+        A named tuple of the ``converted`` and ``skipped`` trf filepaths
+        along with a ``failed`` dictionary mapping each trf filepath that
+        could not be converted to its error message.
+    """
+    conversions = [
+        (trf_filepath,)
+        + _output_filepaths(pathlib.Path(trf_filepath), output_directory, output_format)
+        for trf_filepath in trf_filepaths
+    ]
+
+    return _convert_batch(
+        conversions,
+        output_format,
+        workers=workers,
+        skip_up_to_date=skip_up_to_date,
+        progress=progress,
+    )
+
+
+def _output_filepaths(trf_filepath, output_directory, output_format):
     if output_directory is None:
         output_directory = trf_filepath.parent
     else:
         output_directory = pathlib.Path(output_directory)
 
-    filepaths = {
-        contents: output_directory.joinpath(f"{trf_filepath.stem}_{contents}.csv")
+    return tuple(
+        output_directory.joinpath(f"{trf_filepath.stem}_{contents}.{output_format}")
         for contents in ["header", "table"]
-    }
+    )
 
-    logging.info("Converting %(trf_filepath)s", {"trf_filepath": trf_filepath})
 
-    dataframes = dict()
-    dataframes["header"], dataframes["table"] = trf2pandas(trf_filepath)
+def _convert_batch(
+    conversions,
+    output_format,
+    workers=None,
+    skip_up_to_date=True,
+    progress=False,
+    raise_on_failure=False,
+):
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"`output_format` must be one of {OUTPUT_FORMATS}")
+
+    workers = resolve_workers(workers)
+
+    if output_format != "csv":
+        # Raise a missing parquet or feather dependency before the batch
+        # starts rather than once for every file
+        getattr(pd.DataFrame({"a": [0]}), f"to_{output_format}")(io.BytesIO())
+
+    skipped = []
+    if skip_up_to_date:
+        to_convert = []
+        for conversion in conversions:
+            if _is_up_to_date(*conversion):
+                skipped.append(conversion[0])
+            else:
+                to_convert.append(conversion)
+    else:
+        to_convert = list(conversions)
+
+    converted = []
+    failed = {}
+
+    # Converting without catching errors raises the first of them, from
+    # within a worker process as well
+    convert = _convert if raise_on_failure else _try_convert
+
+    with tqdm.tqdm(
+        total=len(to_convert), unit="trf", disable=not progress
+    ) as progress_bar:
+
+        def record(trf_filepath, error):
+            if error is None:
+                converted.append(trf_filepath)
+            else:
+                logging.warning("Failed to convert %s: %s", trf_filepath, error)
+                failed[trf_filepath] = error
+
+            progress_bar.update()
+
+        workers = max(min(workers, len(to_convert)), 1)
+        if workers == 1:
+            for conversion in to_convert:
+                record(conversion[0], convert(*conversion, output_format))
+        else:
+            with futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                submitted = {
+                    executor.submit(convert, *conversion, output_format): (
+                        conversion[0]
+                    )
+                    for conversion in to_convert
+                }
+                for future in futures.as_completed(submitted):
+                    record(submitted[future], future.result())
+
+    return BatchConversion(converted, skipped, failed)
+
+
+def _is_up_to_date(trf_filepath, *output_filepaths):
+    try:
+        trf_mtime = os.stat(trf_filepath).st_mtime_ns
+        return all(
+            os.stat(filepath).st_mtime_ns >= trf_mtime for filepath in output_filepaths
+        )
+    except FileNotFoundError:
+        return False
 
-    for key, df in dataframes.items():
-        df.to_csv(filepaths[key])
 
-    return filepaths["header"], filepaths["table"]
+def _try_convert(trf_filepath, header_filepath, table_filepath, output_format):
+    try:
+        _convert(trf_filepath, header_filepath, table_filepath, output_format)
+    except Exception as e:  # pylint: disable = broad-except
+        return f"{type(e).__name__}: {e}"
+
+    return None
+
+
+def _convert(trf_filepath, header_filepath, table_filepath, output_format):
+    logging.info("Converting %(trf_filepath)s", {"trf_filepath": trf_filepath})
+
+    # Conversions are one-off, so they would only fill and churn the
+    # decoded logfile cache
+    header, table = trf2pandas(trf_filepath, cache=False)
+
+    if output_format == "csv":
+        header.to_csv(header_filepath)
+        table.to_csv(table_filepath)
+    elif output_format == "parquet":
+        header.to_parquet(header_filepath)
+        table.to_parquet(table_filepath)
+    elif output_format == "feather":
+        # Feather does not store an index
+        header.to_feather(header_filepath)
+        table.rename_axis("Time (s)").reset_index().to_feather(table_filepath)
+    else:
+        raise ValueError(f"`output_format` must be one of {OUTPUT_FORMATS}")
 
 
 def trf2csv_cli(args):
+    filepaths = []
     for glob_string in args.filepaths:
         glob_string = glob_string.replace("[", "<[>")
         glob_string = glob_string.replace("]", "<]>")
@@ -78,7 +271,23 @@ def trf2csv_cli(args):
         glob_string = glob_string.replace("<[>", "[[]")
         glob_string = glob_string.replace("<]>", "[]]")
 
-        filepaths = glob(glob_string)
+        filepaths += glob(glob_string)
+
+    result = trf2csv_batch(
+        filepaths,
+        output_directory=args.output_directory,
+        output_format=args.format,
+        workers=args.workers,
+        skip_up_to_date=not args.force,
+        progress=True,
+    )
+
+    print(
+        f"Converted {len(result.converted)}, skipped {len(result.skipped)} "
+        f"already up to date, failed {len(result.failed)}."
+    )
+    for filepath, error in result.failed.items():
+        print(f"    {filepath}: {error}")
 
-        for filepath in filepaths:
-            trf2csv(filepath)
+    if result.failed:
+        sys.exit(1)
@@ -16,27 +16,50 @@
 """Decodes trf file.
 """
 
-import os  # pylint: disable = unused-import
+import contextlib
+import mmap
+import os
 from typing import Any, BinaryIO, Tuple, Union, cast  # pylint: disable = unused-import
 
+from pymedphys._imports import numpy as np
 from pymedphys._imports import pandas as pd
 
-from .header import Header, decode_header
-from .partition import split_into_header_table
-from .table import decode_trf_table
+from .cache import get_default_cache, hash_trf_contents
+from .header import Header, decode_header, determine_header_length
+from .table import decode_trf_table, select_columns_and_rows
 
 path_or_binary_file = Union[BinaryIO, "os.PathLike[Any]"]
 
+# The header is searched for within this many bytes at the start of the file
+HEADER_SEARCH_LENGTH = 2**16
 
-def trf2pandas(trf: path_or_binary_file) -> Tuple["pd.DataFrame", "pd.DataFrame"]:
+
+def trf2pandas(
+    trf: path_or_binary_file, columns=None, rows=None, cache=None
+) -> Tuple["pd.DataFrame", "pd.DataFrame"]:
     """Read an Elekta Linac Agility Head TRF into a Pandas DataFrame.
 
+    A TRF on disk is memory mapped, so that only the parts of the file
+    needed for the requested ``columns`` and ``rows`` are read.
+
     Parameters
     ----------
     trf : Union[BinaryIO, os.PathLike[Any]]
         Either a file-like object or a pathlike object pointing to
         either the file location on disk, or the binary contents of a
         given TRF.
+    columns : list of str, optional
+        The names of the table columns to decode, in the order to return
+        them. Defaults to all of the columns within the TRF.
+    rows : slice, optional
+        The rows of the table to decode. Each row is one 0.04 s time
+        increment of the log, so ``slice(250, 500)`` is the log between
+        10 s and 20 s. The table index remains the time within the full
+        log. Defaults to all of the rows.
+    cache : DecodedTrfCache or bool, optional
+        The on disk cache of decoded logfiles to read from and store
+        within. Defaults to the cache configured within ``config.toml``,
+        if any. Set to ``False`` to always decode the TRF.
 
     Returns
     -------
@@ -48,21 +71,102 @@ def trf2pandas(trf: path_or_binary_file) -> Tuple["pd.DataFrame", "pd.DataFrame"
     binary_file_trf = cast(BinaryIO, trf)
     path_like_trf = cast("os.PathLike[Any]", trf)
 
+    if cache is None:
+        cache = get_default_cache()
+
     try:
         binary_file_trf.seek(0)
         trf_contents = binary_file_trf.read()
     except AttributeError:
-        with open(path_like_trf, "rb") as f:
-            trf_contents = f.read()
+        if cache:
+            file_hash = cache.hash_file(path_like_trf)
+            cached = _load_from_cache(cache, file_hash, columns, rows)
+            if cached is not None:
+                return cached
+
+        with _map_trf_file(path_like_trf) as trf_contents:
+            if cache:
+                return _decode_and_store(cache, file_hash, trf_contents, columns, rows)
+
+            return _decode_trf_contents(trf_contents, columns, rows)
+
+    if cache:
+        file_hash = hash_trf_contents(trf_contents)
+        cached = _load_from_cache(cache, file_hash, columns, rows)
+        if cached is not None:
+            return cached
+
+        return _decode_and_store(cache, file_hash, trf_contents, columns, rows)
+
+    return _decode_trf_contents(trf_contents, columns, rows)
+
+
+@contextlib.contextmanager
+def _map_trf_file(path_like_trf):
+    with open(path_like_trf, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # An empty file cannot be memory mapped, its contents are
+            # decoded instead so that it fails as any other invalid TRF.
+            yield f.read()
+            return
+
+        trf_contents = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    try:
+        yield trf_contents
+    finally:
+        # Views of the map held by an exception's traceback prevent it
+        # being closed here, it is then closed once they are released.
+        with contextlib.suppress(BufferError):
+            trf_contents.close()
 
-    trf_header_contents, trf_table_contents = split_into_header_table(trf_contents)
-    header_dataframe = header_as_dataframe(trf_header_contents)
-    # table_dataframe = decode_trf_table(trf_table_contents)
-    table_dataframe = decode_trf_table(trf_table_contents, header_dataframe)
+
+def _load_from_cache(cache, file_hash, columns, rows):
+    cached = cache.load(file_hash, columns=columns)
+    if cached is None:
+        return None
+
+    header_dataframe, table_dataframe = cached
+
+    return header_dataframe, select_columns_and_rows(table_dataframe, rows=rows)
+
+
+def _decode_and_store(cache, file_hash, trf_contents, columns, rows):
+    # The full table is decoded so that any later selection is served
+    # from the cache
+    header_dataframe, table_dataframe = _decode_trf_contents(trf_contents)
+    cache.store(file_hash, header_dataframe, table_dataframe)
+
+    return (
+        header_dataframe,
+        select_columns_and_rows(table_dataframe, columns=columns, rows=rows),
+    )
+
+
+def _decode_trf_contents(trf_contents, columns=None, rows=None):
+    header_length = _determine_header_length(trf_contents)
+    header_dataframe = header_as_dataframe(trf_contents[0:header_length])
+
+    # A view of the table which doesn't copy the underlying file contents
+    trf_table_contents = np.frombuffer(
+        trf_contents, dtype=np.uint8, offset=header_length
+    )
+    table_dataframe = decode_trf_table(
+        trf_table_contents, header_dataframe, columns=columns, rows=rows
+    )
 
     return header_dataframe, table_dataframe
 
 
+def _determine_header_length(trf_contents):
+    header_length = determine_header_length(trf_contents[0:HEADER_SEARCH_LENGTH])
+
+    if header_length >= HEADER_SEARCH_LENGTH:
+        header_length = determine_header_length(bytes(trf_contents))
+
+    return header_length
+
+
 read_trf = trf2pandas
 
 
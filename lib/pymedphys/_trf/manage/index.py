@@ -14,24 +14,69 @@
 
 
 """Index logfiles.
+
+Indexing runs as a pipeline. Logfiles are hashed and their headers decoded
+over a pool of threads, the Mosaiq delivery details of batches of them
+are looked up over a pool of connections to each Mosaiq server while the
+remaining logfiles are still being read, and each identified logfile is then
+recorded within the index and moved into the indexed directory.
+
+New index entries are appended to a journal next to ``index.json`` and
+the journal is periodically compacted into ``index.json``. An entry is
+journaled before its logfile is moved, so an interrupted run is resumed
+by running the indexing again.
 """
 
+import collections
+import contextlib
+import hashlib
 import json
 import os
 import pathlib
 import traceback
+from concurrent import futures
 from glob import glob
 
 from pymedphys._imports import attr
 
 import pymedphys._mosaiq.api as _pp_mosaiq
-from pymedphys._mosaiq.delivery import NoMosaiqEntries, get_mosaiq_delivery_details
-from pymedphys._trf.decode.header import Header, decode_header_from_file
+from pymedphys._mosaiq.delivery import (
+    NoMosaiqEntries,
+    get_mosaiq_delivery_details,
+    get_mosaiq_delivery_details_bulk,
+)
+from pymedphys._trf.decode.header import Header, decode_header, determine_header_length
 from pymedphys._utilities.filehash import hash_file
 from pymedphys._utilities.filesystem import make_a_valid_directory_name
 
 from .identify import date_convert
 
+JOURNAL_FILENAME = "index_journal.jsonl"
+
+# The number of journaled entries after which they are compacted into
+# ``index.json``
+DEFAULT_COMPACT_EVERY = 1000
+
+# Hashing, header decoding and Mosaiq lookups are bound by IO rather than
+# CPU, so more threads than cores are used by default.
+DEFAULT_WORKERS = 8
+
+# The number of logfiles identified by each query to a Mosaiq server
+LOOKUP_BATCH_SIZE = 50
+
+LogfileToIndex = collections.namedtuple(
+    "LogfileToIndex",
+    [
+        "filepath",
+        "filehash",
+        "header",
+        "centre",
+        "server",
+        "mosaiq_string_time",
+        "path_string_time",
+    ],
+)
+
 
 def create_logfile_directory_name(
     centre, delivery_details, header: Header, path_string_time
@@ -80,7 +125,10 @@ def create_index_entry(
     index_entry = {
         "filepath": new_filepath,
         "delivery_details": {**attr.asdict(delivery_details)},
-        "logfile_header": {**header._asdict()},
+        "logfile_header": {
+            **header._asdict(),
+            "item_parts": [int(item) for item in header.item_parts],
+        },
         "local_time": mosaiq_string_time,
     }
 
@@ -145,98 +193,241 @@ def get_logfile_mosaiq_info(
     return attr.asdict(delivery_details)
 
 
-# TODO Split this function up into smaller functions for easier reuse.
-def file_ready_to_be_indexed(
-    connections,
-    filehash_list,
-    to_be_indexed_dict,
-    unknown_error_in_logfile,
-    no_mosaiq_record_found,
-    no_field_label_in_logfile,
-    indexed_directory,
-    index_filepath,
-    index,
-    machine_map,
-    centre_details,
-    centre_server_map,
-):
-    for filehash in filehash_list:
-        logfile_basename = os.path.basename(to_be_indexed_dict[filehash])
+class LogfileIndex:
+    """The index of logfiles, stored within ``index.json`` and an
+    append-only journal of the entries added since it was last compacted.
 
-        try:
-            header = decode_header_from_file(to_be_indexed_dict[filehash])
-            print("\n{}".format(header))
-            if header.field_label == "":
-                print("No field label in logfile")
-                new_filepath = os.path.join(no_field_label_in_logfile, logfile_basename)
-                rename_and_handle_fileexists(to_be_indexed_dict[filehash], new_filepath)
-                continue
-
-            centre = machine_map[header.machine]["centre"]
-            server = centre_server_map[centre]
-
-            mosaiq_string_time, path_string_time = date_convert(
-                header.date, centre_details[centre]["timezone"]
-            )
-        except Exception:  # pylint: disable = broad-except
-            traceback.print_exc()
-            new_filepath = os.path.join(unknown_error_in_logfile, logfile_basename)
-            rename_and_handle_fileexists(to_be_indexed_dict[filehash], new_filepath)
-            continue
+    Parameters
+    ----------
+    index_filepath : pathlike
+        The path to ``index.json``. The journal is stored alongside it.
+    compact_every : int, optional
+        The number of journaled entries after which the journal is
+        compacted into ``index.json``.
+    """
+
+    def __init__(self, index_filepath, compact_every=DEFAULT_COMPACT_EVERY):
+        self.index_filepath = pathlib.Path(index_filepath)
+        self.journal_filepath = self.index_filepath.with_name(JOURNAL_FILENAME)
+        self.compact_every = compact_every
+
+        self.entries = load_index(self.index_filepath)
+        self._journaled = 0
+        self._journal = None
+
+    def __contains__(self, filehash):
+        return filehash in self.entries
+
+    def __getitem__(self, filehash):
+        return self.entries[filehash]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def append(self, filehash, entry):
+        """Durably record a new index entry within the journal."""
+        self.extend({filehash: entry})
+
+    def extend(self, entries):
+        """Durably record many new index entries within the journal, with
+        a single sync to disk."""
+        if not entries:
+            return
+
+        if self._journal is None:
+            self._journal = open(self.journal_filepath, "a")
+
+        for filehash, entry in entries.items():
+            self._journal.write(json.dumps({filehash: entry}) + "\n")
+
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+
+        self.entries.update(entries)
+        self._journaled += len(entries)
 
+        if self._journaled >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        """Rewrite ``index.json`` to include the journaled entries and then
+        remove the journal."""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+        temp_index_filepath = self.index_filepath.with_name(
+            f"{self.index_filepath.stem}_temp{self.index_filepath.suffix}"
+        )
+        with open(temp_index_filepath, "w") as json_data_file:
+            json_data_file.write(json.dumps(self.entries, indent=2))
+
+        os.replace(temp_index_filepath, self.index_filepath)
+
+        # Should this be interrupted, replaying the journal on the next
+        # load is harmless as its entries are already within the index.
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.journal_filepath)
+
+        self._journaled = 0
+
+    def close(self):
+        if self._journal is not None or self.journal_filepath.exists():
+            self.compact()
+
+
+def load_index(index_filepath):
+    """Load ``index.json`` along with any entries journaled since it was
+    last compacted."""
+    index_filepath = pathlib.Path(index_filepath)
+
+    try:
+        with open(index_filepath, "r") as json_data_file:
+            index = json.load(json_data_file)
+    except FileNotFoundError:
+        index = {}
+
+    try:
+        with open(index_filepath.with_name(JOURNAL_FILENAME), "r") as journal:
+            lines = journal.readlines()
+    except FileNotFoundError:
+        lines = []
+
+    for line in lines:
         try:
-            delivery_details = get_mosaiq_delivery_details(
-                connections[server],
-                header.machine,
-                mosaiq_string_time,
-                header.field_label,
-                header.field_name,
-                buffer=240,
-            )
-        except NoMosaiqEntries as e:
-            print(e)
-            new_filepath = os.path.join(no_mosaiq_record_found, logfile_basename)
-            rename_and_handle_fileexists(to_be_indexed_dict[filehash], new_filepath)
+            index.update(json.loads(line))
+        except json.JSONDecodeError:
+            # The final line may be incomplete should a run have been
+            # interrupted while writing it.
             continue
 
-        logfile_directory_name = create_logfile_directory_name(
-            centre, delivery_details, header, path_string_time
-        )
+    return index
 
-        abs_logfile_directory_name = os.path.abspath(
-            os.path.join(indexed_directory, logfile_directory_name)
-        )
 
-        pathlib.Path(abs_logfile_directory_name).mkdir(parents=True, exist_ok=True)
+def hash_and_decode_header(filepath):
+    """Hash a logfile and decode its header while reading it only once."""
+    with open(filepath, "rb") as f:
+        trf_contents = f.read()
 
-        new_filepath = os.path.join(logfile_directory_name, logfile_basename)
+    filehash = hashlib.sha1(trf_contents).hexdigest()
 
-        index[filehash] = create_index_entry(
-            new_filepath, delivery_details, header, mosaiq_string_time
+    try:
+        header_length = determine_header_length(trf_contents)
+        header = decode_header(trf_contents[0:header_length])
+    except Exception as e:  # pylint: disable = broad-except
+        return filehash, e
+
+    return filehash, header
+
+
+def _lookup_delivery_details(connection_pool, logfiles):
+    with connection_pool.connection() as connection:
+        return get_mosaiq_delivery_details_bulk(
+            connection,
+            [
+                (
+                    logfile.header.machine,
+                    logfile.mosaiq_string_time,
+                    logfile.header.field_label,
+                    logfile.header.field_name,
+                )
+                for logfile in logfiles
+            ],
+            buffer=240,
         )
 
-        abs_new_filepath = os.path.abspath(
-            os.path.join(indexed_directory, new_filepath)
-        )
 
-        index_extension_split = os.path.splitext(index_filepath)
-        temp_index_path = "{}_temp{}".format(
-            index_extension_split[0], index_extension_split[1]
-        )
+def _identify_logfile_to_index(
+    filepath, filehash, header, machine_map, centre_details, centre_server_map
+):
+    centre = machine_map[header.machine]["centre"]
+    server = centre_server_map[centre]
 
-        with open(temp_index_path, "w") as json_data_file:
-            json.dump(index, json_data_file, indent=2)
+    mosaiq_string_time, path_string_time = date_convert(
+        header.date, centre_details[centre]["timezone"]
+    )
 
-        os.replace(temp_index_path, index_filepath)
+    return LogfileToIndex(
+        filepath,
+        filehash,
+        header,
+        centre,
+        server,
+        mosaiq_string_time,
+        path_string_time,
+    )
 
-        os.rename(to_be_indexed_dict[filehash], abs_new_filepath)
 
-        print(
-            "Indexed logfile:\n    {} -->\n    {}".format(
-                to_be_indexed_dict[filehash], abs_new_filepath
+def _index_logfiles(index: LogfileIndex, identified, directories):
+    entries = {}
+    moves = []
+    for logfile, delivery_details in identified:
+        logfile_directory_name = create_logfile_directory_name(
+            logfile.centre, delivery_details, logfile.header, logfile.path_string_time
+        )
+        new_filepath = os.path.join(
+            logfile_directory_name, os.path.basename(logfile.filepath)
+        )
+
+        entries[logfile.filehash] = create_index_entry(
+            new_filepath, delivery_details, logfile.header, logfile.mosaiq_string_time
+        )
+        moves.append(
+            (
+                logfile.filepath,
+                os.path.abspath(os.path.join(directories["indexed"], new_filepath)),
             )
         )
 
+    # The entries are journaled first so that an interrupted move is
+    # completed by the next run.
+    index.extend(entries)
+
+    for filepath, abs_new_filepath in moves:
+        rename_and_handle_fileexists(filepath, abs_new_filepath)
+
+        print("Indexed logfile:\n    {} -->\n    {}".format(filepath, abs_new_filepath))
+
+
+def _handle_already_indexed(index: LogfileIndex, filepath, filehash, directories):
+    indexed_filepath = os.path.join(directories["indexed"], index[filehash]["filepath"])
+
+    if not os.path.exists(indexed_filepath):
+        # A previous run was interrupted between journaling the entry and
+        # moving the logfile
+        rename_and_handle_fileexists(filepath, indexed_filepath)
+        return
+
+    file_already_in_index(indexed_filepath, filepath, filehash)
+
+
+def _move_unindexable(filepath, directory):
+    new_filepath = os.path.join(directory, os.path.basename(filepath))
+    rename_and_handle_fileexists(filepath, new_filepath)
+
+
+def _lookup_results(logfiles, future, directories):
+    try:
+        results = future.result()
+    except Exception:  # pylint: disable = broad-except
+        # Left in place to be retried by the next run
+        print("\nUnable to look up {} logfiles within Mosaiq".format(len(logfiles)))
+        traceback.print_exc()
+        return []
+
+    identified = []
+    for logfile, result in zip(logfiles, results):
+        if isinstance(result, NoMosaiqEntries):
+            print(result)
+            _move_unindexable(logfile.filepath, directories["no_mosaiq_record_found"])
+        elif isinstance(result, Exception):
+            # Left in place to be retried by the next run
+            print("Unable to identify {}: {}".format(logfile.filepath, result))
+        else:
+            identified.append((logfile, result))
+
+    return identified
+
 
 def _separate_server_port_string(sql_server_and_port):
     """separates a server:port string
@@ -268,47 +459,52 @@ def _separate_server_port_string(sql_server_and_port):
     return server, port
 
 
-def index_logfiles(centre_map, machine_map, logfile_data_directory):
+def index_logfiles(
+    centre_map,
+    machine_map,
+    logfile_data_directory,
+    workers=DEFAULT_WORKERS,
+    compact_every=DEFAULT_COMPACT_EVERY,
+):
     data_directory = logfile_data_directory
     index_filepath = os.path.abspath(os.path.join(data_directory, "index.json"))
     to_be_indexed_directory = os.path.abspath(
         os.path.join(data_directory, "to_be_indexed")
     )
-    indexed_directory = os.path.abspath(os.path.join(data_directory, "indexed"))
-    no_mosaiq_record_found = os.path.abspath(
-        os.path.join(data_directory, "no_mosaiq_record_found")
-    )
-    unknown_error_in_logfile = os.path.abspath(
-        os.path.join(data_directory, "unknown_error_in_logfile")
-    )
-    no_field_label_in_logfile = os.path.abspath(
-        os.path.join(data_directory, "no_field_label_in_logfile")
-    )
+
     # machine_map = config['machine_map']
     centre_details = centre_map
 
+    directories = {
+        name: os.path.abspath(os.path.join(data_directory, name))
+        for name in [
+            "indexed",
+            "no_mosaiq_record_found",
+            "unknown_error_in_logfile",
+            "no_field_label_in_logfile",
+        ]
+    }
+
     centre_server_map = {
         centre: centre_lookup["mosaiq_sql_server"]
         for centre, centre_lookup in centre_map.items()
     }
 
-    sql_server_and_ports = [
+    sql_server_and_ports = {
         "{}".format(details["mosaiq_sql_server"])
         for _, details in centre_details.items()
-    ]
-
-    try:
-        with open(index_filepath, "r") as json_data_file:
-            index = json.load(json_data_file)
-    except FileNotFoundError:
-        index = {}
+    }
 
-    indexset = set(index.keys())
+    index = LogfileIndex(index_filepath, compact_every=compact_every)
 
     print("\nConnecting to Mosaiq SQL servers...")
 
-    connections = {
-        server_port: _pp_mosaiq.connect(*_separate_server_port_string(server_port))
+    # The pools retrieve their credentials here so that any credential
+    # prompt occurs before the worker threads start.
+    connection_pools = {
+        server_port: _pp_mosaiq.ConnectionPool(
+            *_separate_server_port_string(server_port), max_size=workers
+        )
         for server_port in sql_server_and_ports
     }
 
@@ -317,48 +513,107 @@ def index_logfiles(centre_map, machine_map, logfile_data_directory):
         os.path.join(to_be_indexed_directory, "**/*.trf"), recursive=True
     )
 
-    chunk_size = 50
-    number_to_be_indexed = len(to_be_indexed)
-    to_be_indexed_chunked = [
-        to_be_indexed[i : i + chunk_size]
-        for i in range(0, number_to_be_indexed, chunk_size)
-    ]
-
-    for i, a_to_be_indexed_chunk in enumerate(to_be_indexed_chunked):
-        print(
-            "\nHashing a chunk of logfiles ({}/{})".format(
-                i + 1, len(to_be_indexed_chunked)
-            )
-        )
-        hashlist = [
-            hash_file(filename, dot_feedback=True) for filename in a_to_be_indexed_chunk
-        ]
+    print("Indexing {} logfiles...".format(len(to_be_indexed)))
 
-        print(" ")
+    lookup_pools = {
+        server_port: futures.ThreadPoolExecutor(max_workers=workers)
+        for server_port in sql_server_and_ports
+    }
 
-        to_be_indexed_dict = dict(zip(hashlist, a_to_be_indexed_chunk))
+    try:
+        with futures.ThreadPoolExecutor(max_workers=workers) as read_pool:
+            pending_lookups = {}
+            unsubmitted_lookups = collections.defaultdict(list)
+            filehashes_this_run = set()
+
+            def submit_lookups(server):
+                logfiles = unsubmitted_lookups.pop(server)
+                future = lookup_pools[server].submit(
+                    _lookup_delivery_details, connection_pools[server], logfiles
+                )
+                pending_lookups[future] = logfiles
+
+            def handle_completed_lookups(timeout):
+                done, _ = futures.wait(
+                    pending_lookups,
+                    timeout=timeout,
+                    return_when=futures.FIRST_COMPLETED,
+                )
+                identified = []
+                for future in done:
+                    identified += _lookup_results(
+                        pending_lookups.pop(future), future, directories
+                    )
+
+                _index_logfiles(index, identified, directories)
+
+            # ``map`` returns results in the order of ``to_be_indexed``
+            # while the files are read ahead over the pool
+            read_results = read_pool.map(_try_hash_and_decode_header, to_be_indexed)
+            for filepath, (filehash, header) in zip(to_be_indexed, read_results):
+                handle_completed_lookups(timeout=0)
+
+                if isinstance(header, Exception):
+                    print("\nUnable to read {}".format(filepath))
+                    print(header)
+                    _move_unindexable(filepath, directories["unknown_error_in_logfile"])
+                    continue
+
+                if filehash in index:
+                    _handle_already_indexed(index, filepath, filehash, directories)
+                    continue
+
+                if filehash in filehashes_this_run:
+                    # A duplicate, removed by the next run once the first
+                    # copy has been indexed
+                    continue
+
+                filehashes_this_run.add(filehash)
+
+                if header.field_label == "":
+                    print("No field label in logfile {}".format(filepath))
+                    _move_unindexable(
+                        filepath, directories["no_field_label_in_logfile"]
+                    )
+                    continue
+
+                try:
+                    logfile = _identify_logfile_to_index(
+                        filepath,
+                        filehash,
+                        header,
+                        machine_map,
+                        centre_details,
+                        centre_server_map,
+                    )
+                except Exception:  # pylint: disable = broad-except
+                    traceback.print_exc()
+                    _move_unindexable(filepath, directories["unknown_error_in_logfile"])
+                    continue
+
+                unsubmitted_lookups[logfile.server].append(logfile)
+                if len(unsubmitted_lookups[logfile.server]) >= LOOKUP_BATCH_SIZE:
+                    submit_lookups(logfile.server)
+
+            for server in list(unsubmitted_lookups):
+                submit_lookups(server)
+
+            while pending_lookups:
+                handle_completed_lookups(timeout=None)
+    finally:
+        for pool in lookup_pools.values():
+            pool.shutdown()
+
+        for connection_pool in connection_pools.values():
+            connection_pool.close()
+
+        index.close()
 
-        hashset = set(hashlist)
+    print("Complete")
 
-        for filehash in list(hashset.intersection(indexset)):
-            file_already_in_index(
-                os.path.join(indexed_directory, index[filehash]["filepath"]),
-                to_be_indexed_dict[filehash],
-                filehash,
-            )
 
-        file_ready_to_be_indexed(
-            connections,
-            list(hashset.difference(indexset)),
-            to_be_indexed_dict,
-            unknown_error_in_logfile,
-            no_mosaiq_record_found,
-            no_field_label_in_logfile,
-            indexed_directory,
-            index_filepath,
-            index,
-            machine_map,
-            centre_details,
-            centre_server_map,
-        )
-    print("Complete")
+def _try_hash_and_decode_header(filepath):
+    try:
+        return hash_and_decode_header(filepath)
+    except OSError as e:
+        return None, e
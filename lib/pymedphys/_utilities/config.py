@@ -13,7 +13,6 @@
 # limitations under the License.
 
 
-import json
 import os
 
 
@@ -51,11 +50,14 @@ def get_metersetmap_parameters(config):
 
 
 def get_index(config):
+    # pylint: disable = import-outside-toplevel
+    from pymedphys._trf.manage.index import load_index
+
     index_filepath = os.path.join(get_data_directory(config), "index.json")
-    with open(index_filepath) as json_data_file:
-        index = json.load(json_data_file)
+    if not os.path.exists(index_filepath):
+        raise FileNotFoundError(index_filepath)
 
-    return index
+    return load_index(index_filepath)
 
 
 def get_centre(config, file_info):
@@ -12,15 +12,42 @@
 # limitations under the License.
 
 
+import functools
+
 from pymedphys._imports import numpy as np
 
+SHELL_CACHE_SIZE = 256
+
 
 def calculate_coordinates_shell(distance, num_dimensions, distance_step_size):
     """Create the shell of coordinate shifts for the given testing distance.
 
     Coordinate shifts are determined to check the evaluation dose for a
-    given distance, dimension, and step size
+    given distance, dimension, and step size.
+
+    Shells are memoised on these three inputs, so that repeated gamma
+    calculations with the same thresholds do not rebuild them. The
+    returned arrays are shared between callers and are therefore
+    read-only.
     """
+    return _cached_coordinates_shell(
+        float(distance), int(num_dimensions), float(distance_step_size)
+    )
+
+
+@functools.lru_cache(maxsize=SHELL_CACHE_SIZE)
+def _cached_coordinates_shell(distance, num_dimensions, distance_step_size):
+    coordinates = _calculate_coordinates_shell(
+        distance, num_dimensions, distance_step_size
+    )
+
+    for axis_coordinates in coordinates:
+        axis_coordinates.setflags(write=False)
+
+    return coordinates
+
+
+def _calculate_coordinates_shell(distance, num_dimensions, distance_step_size):
     if num_dimensions == 1:
         return calculate_coordinates_shell_1d(distance)
 
@@ -66,13 +93,17 @@ def calculate_coordinates_shell_3d(distance, distance_step_size):
     row_circumference = 2 * np.pi * row_radii
     amount_in_row = np.ceil(row_circumference / distance_step_size).astype(int) + 1
 
-    x_coords = []
-    y_coords = []
-    z_coords = []
-    for i, phi in enumerate(elevation):
-        azimuth = np.linspace(0, 2 * np.pi, amount_in_row[i] + 1)[:-1:]
-        x_coords.append(distance * np.sin(phi) * np.cos(azimuth))
-        y_coords.append(distance * np.sin(phi) * np.sin(azimuth))
-        z_coords.append(distance * np.cos(phi) * np.ones_like(azimuth))
+    # Each row's azimuths are ``np.linspace(0, 2 * np.pi, amount + 1)[:-1]``,
+    # which is the point index within the row times the row's step.
+    row_of_point = np.repeat(np.arange(number_of_rows), amount_in_row)
+    row_start = np.cumsum(amount_in_row) - amount_in_row
+    index_in_row = np.arange(len(row_of_point)) - row_start[row_of_point]
+
+    azimuth = index_in_row * (2 * np.pi / amount_in_row)[row_of_point]
+    phi = elevation[row_of_point]
+
+    x_coords = distance * np.sin(phi) * np.cos(azimuth)
+    y_coords = distance * np.sin(phi) * np.sin(azimuth)
+    z_coords = distance * np.cos(phi) * np.ones_like(azimuth)
 
-    return (np.hstack(x_coords), np.hstack(y_coords), np.hstack(z_coords))
+    return (x_coords, y_coords, z_coords)
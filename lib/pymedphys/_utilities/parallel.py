@@ -0,0 +1,32 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+
+def resolve_workers(workers):
+    """Convert the user ``workers`` input into a number of processes.
+
+    ``None`` and ``1`` mean run serially. ``-1`` means use all of the
+    available cores.
+    """
+    if workers is None:
+        return 1
+
+    if workers == -1:
+        return os.cpu_count() or 1
+
+    if workers < 1:
+        raise ValueError("`workers` must be a positive integer, -1, or None")
+
+    return int(workers)
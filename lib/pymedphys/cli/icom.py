@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import pymedphys._icom.archive
 import pymedphys._icom.listener
 
 
@@ -22,6 +23,7 @@ def icom_cli(subparsers):
     icom_subparsers = icom_parser.add_subparsers(dest="icom")
 
     icom_listen(icom_subparsers)
+    icom_index(icom_subparsers)
 
     return icom_parser
 
@@ -40,10 +42,44 @@ def icom_listen(icom_subparsers):
         ),
     )
 
-    parser.add_argument("ip", help="The IP address of the Linac.")
+    parser.add_argument(
+        "ip",
+        nargs="+",
+        help=(
+            "The IP address of the Linac. Provide more than one to listen "
+            "to many Linacs at once."
+        ),
+    )
     parser.add_argument(
         "directory", help="The output directory to store the iCom records."
     )
     parser.set_defaults(
         func=pymedphys._icom.listener.listen_cli  # pylint: disable = protected-access
     )
+
+
+def icom_index(icom_subparsers):
+    parser = icom_subparsers.add_parser(
+        "index",
+        help=(
+            "Build the index of every iCom patient archive within a "
+            "directory that does not already have one, so that its "
+            "timeline can be read without decompressing it."
+        ),
+    )
+
+    parser.add_argument(
+        "directory", help="The directory of iCom patient archives to index."
+    )
+    parser.add_argument(
+        "--recompress",
+        action="store_true",
+        help=(
+            "Rewrite every archive as a series of blocks, so that a "
+            "window of its frames can be read without decompressing all "
+            "of them."
+        ),
+    )
+    parser.set_defaults(
+        func=pymedphys._icom.archive.index_cli  # pylint: disable = protected-access
+    )
@@ -18,7 +18,7 @@
 
 
 from pymedphys._trf.decode.detect import detect_cli
-from pymedphys._trf.decode.trf2csv import trf2csv_cli
+from pymedphys._trf.decode.trf2csv import OUTPUT_FORMATS, trf2csv_cli
 from pymedphys._trf.manage.orchestration import orchestration_cli
 
 
@@ -51,6 +51,39 @@ def trf_to_csv(trf_subparsers):
             "current directory to csv files."
         ),
     )
+    parser.add_argument(
+        "-o",
+        "--output-directory",
+        default=None,
+        help=(
+            "The directory within which to save the converted files. "
+            "Defaults to the directory of each ``.trf`` file."
+        ),
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="csv",
+        help=(
+            "The format of the converted files. Parquet and feather require "
+            "``pyarrow`` to be installed."
+        ),
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=-1,
+        help=(
+            "The number of processes to convert the files with. Defaults "
+            "to -1, using all of the available cores."
+        ),
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Convert files whose converted files are already up to date.",
+    )
 
     parser.set_defaults(func=trf2csv_cli)
 
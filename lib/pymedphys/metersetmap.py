@@ -24,6 +24,7 @@ formats
 import textwrap as _textwrap
 
 from ._metersetmap.metersetmap import calc_metersetmap as calculate
+from ._metersetmap.metersetmap import calc_metersetmaps as calculate_batch
 from ._metersetmap.metersetmap import display_metersetmap as display
 from ._metersetmap.metersetmap import get_grid as grid
 
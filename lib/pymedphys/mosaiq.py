@@ -4,4 +4,11 @@
 
 # pylint: disable = unused-import
 
-from ._mosaiq.api import Connection, Cursor, connect, execute
+from ._mosaiq.api import (
+    Connection,
+    ConnectionPool,
+    Cursor,
+    QueryCache,
+    connect,
+    execute,
+)
@@ -0,0 +1,163 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# pylint: disable = redefined-outer-name, protected-access
+
+"""Data files should only be hashed again once they have changed."""
+
+import json
+import os
+import zipfile
+
+from pymedphys._imports import pytest
+
+from pymedphys._data import download, hashcache
+from pymedphys._utilities import filehash
+
+FILE_NAMES = ["a.txt", "b.txt", "c.txt"]
+ZIP_NAME = "d.zip"
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    data_dir = tmp_path.joinpath("data")
+    data_dir.mkdir()
+
+    hashes = {}
+    for file_name in FILE_NAMES:
+        filepath = data_dir.joinpath(file_name)
+        filepath.write_text(file_name)
+        hashes[file_name] = filehash.hash_file(filepath)
+
+    zip_filepath = data_dir.joinpath(ZIP_NAME)
+    with zipfile.ZipFile(zip_filepath, "w") as zip_file:
+        zip_file.writestr("e.txt", "e.txt")
+        zip_file.writestr("nested/f.txt", "f.txt")
+    hashes[ZIP_NAME] = filehash.hash_file(zip_filepath)
+
+    hash_filepath = tmp_path.joinpath("hashes.json")
+    hash_filepath.write_text(json.dumps(hashes))
+
+    monkeypatch.setattr(download, "get_data_dir", lambda: data_dir)
+    monkeypatch.setattr(download, "DEFAULT_HASHES_PATH", hash_filepath)
+    monkeypatch.setattr(
+        download, "get_url_map", lambda: {name: None for name in FILE_NAMES}
+    )
+
+    download.get_hashes.cache_clear()
+    download.get_verified_hashes.cache_clear()
+    yield data_dir
+    download.get_hashes.cache_clear()
+    download.get_verified_hashes.cache_clear()
+
+
+@pytest.fixture
+def hashed(monkeypatch):
+    hashed = []
+
+    def counting_hash_file(filepath):
+        hashed.append(os.path.basename(filepath))
+        return filehash.hash_file(filepath)
+
+    monkeypatch.setattr(hashcache, "hash_file", counting_hash_file)
+
+    return hashed
+
+
+def test_unchanged_files_are_not_rehashed(data_dir, hashed):
+    for _ in range(3):
+        assert download.data_path("a.txt") == data_dir.joinpath("a.txt").resolve()
+
+    assert hashed == ["a.txt"]
+
+    # A new process reads the saved record rather than the file
+    download.get_verified_hashes().save()
+    download.get_verified_hashes.cache_clear()
+    download.data_path("a.txt")
+    assert hashed == ["a.txt"]
+
+
+def test_modified_files_are_rehashed(data_dir, hashed):
+    download.data_path("a.txt")
+
+    data_dir.joinpath("a.txt").write_text("a modified file")
+
+    with pytest.raises(ValueError):
+        download.data_path("a.txt", redownload_on_hash_mismatch=False)
+
+    assert hashed == ["a.txt", "a.txt"]
+
+
+def test_download_all_prewarms_hashes(data_dir, hashed, monkeypatch):
+    saved = []
+    save = hashcache.VerifiedHashes.save
+
+    def counting_save(verified_hashes):
+        saved.append(dict(verified_hashes._unsaved))
+        save(verified_hashes)
+
+    monkeypatch.setattr(hashcache.VerifiedHashes, "save", counting_save)
+
+    paths = download.download_all(workers=2)
+
+    assert paths == [data_dir.joinpath(name).resolve() for name in FILE_NAMES]
+    assert sorted(hashed) == FILE_NAMES
+
+    # The record is written once for the whole batch
+    assert [len(unsaved) for unsaved in saved] == [len(FILE_NAMES), 0]
+
+    with pytest.raises(ValueError):
+        download.download_all(workers=0)
+
+
+def test_get_file_within_data_zip(data_dir, hashed):
+    path = download.get_file_within_data_zip(ZIP_NAME, "f.txt")
+
+    assert path == str(data_dir.joinpath("d", "nested", "f.txt").resolve())
+    assert hashed == [ZIP_NAME]
+
+    with pytest.raises(ValueError):
+        download.get_file_within_data_zip(ZIP_NAME, "g.txt")
+
+
+def test_save_merges_and_prunes(tmp_path):
+    record_path = tmp_path.joinpath("verified-hashes.json")
+    filepaths = [tmp_path.joinpath(name) for name in FILE_NAMES]
+    for filepath in filepaths:
+        filepath.write_text(filepath.name)
+
+    first = hashcache.VerifiedHashes(record_path)
+    second = hashcache.VerifiedHashes(record_path)
+
+    first.hash_file(filepaths[0])
+    second.hash_file(filepaths[1])
+    second.hash_file(filepaths[2])
+    assert not record_path.exists()
+
+    second.save()
+    first.save()
+
+    recorded = json.loads(record_path.read_text())
+    assert sorted(recorded) == [str(filepath.resolve()) for filepath in filepaths]
+
+    filepaths[2].unlink()
+    filepaths[0].write_text("a modified file")
+    first.hash_file(filepaths[0])
+    first.save()
+
+    recorded = json.loads(record_path.read_text())
+    assert sorted(recorded) == [str(filepath.resolve()) for filepath in filepaths[:2]]
+    assert recorded[str(filepaths[0].resolve())]["sha1"] == filehash.hash_file(
+        filepaths[0]
+    )
@@ -13,6 +13,8 @@
 # limitations under the License.
 
 
+from pymedphys._imports import numpy as np
+
 from pymedphys import Delivery
 
 # pylint: disable = protected-access
@@ -22,7 +24,7 @@ def test_object_consistency():
     empty = Delivery._empty()
     filtered = empty._filter_cps()
 
-    assert isinstance(filtered.monitor_units, tuple)
+    assert isinstance(filtered.monitor_units, np.ndarray)
 
     filtered._metersets(0, 0)
 
@@ -30,8 +32,40 @@ def test_object_consistency():
 def test_base_object():
     empty = Delivery._empty()
 
-    assert empty.monitor_units == tuple()
+    assert len(empty.monitor_units) == 0
 
     collection = {field: getattr(empty, field) for field in empty._fields}
 
     dummy = Delivery(**collection)
+
+
+def test_empty_shapes():
+    empty = Delivery._empty()
+
+    assert empty.monitor_units.shape == (0,)
+    assert empty.gantry.shape == (0,)
+    assert empty.collimator.shape == (0,)
+    assert empty.mlc.shape == (0, 0, 2)
+    assert empty.jaw.shape == (0, 2)
+
+
+def test_array_backed_fields():
+    delivery = Delivery(
+        [0, 1, 2], [0, 0, 0], [0, 0, 0], np.ones((3, 2, 2)), np.ones((3, 2))
+    )
+
+    for field in delivery._fields:
+        item = getattr(delivery, field)
+        assert isinstance(item, np.ndarray)
+        assert item.dtype == np.float64
+        assert not item.flags.writeable
+
+    same = Delivery(*[np.array(item) for item in delivery])
+    different = Delivery(
+        [0, 1, 3], [0, 0, 0], [0, 0, 0], np.ones((3, 2, 2)), np.ones((3, 2))
+    )
+
+    assert same == delivery
+    assert hash(same) == hash(delivery)
+    assert different != delivery
+    assert same._filter_cps() is delivery._filter_cps()
@@ -0,0 +1,104 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Calculating the deformability of a grid of points at once should agree
+with refitting the splines for each point."""
+
+# pylint: disable = protected-access
+
+from pymedphys._imports import numpy as np
+
+from pymedphys._electronfactors import core
+
+
+def test_polynomial_deformability():
+    width, ratio_perim_area, factor = _create_data()
+    xx, yy = np.meshgrid(np.linspace(2, 11, 6), np.linspace(0.2, 1.6, 5))
+
+    model = core._deformability_model(
+        tuple(width), tuple(ratio_perim_area), tuple(factor)
+    )
+    assert model.polynomial_factor is not None
+
+    deformability = core.calculate_deformability(
+        xx, yy, width, ratio_perim_area, factor
+    )
+    assert deformability.shape == xx.shape
+    assert np.allclose(
+        deformability, _each_point(xx, yy, width, ratio_perim_area, factor)
+    )
+
+    single = core.calculate_deformability(5, 0.8, width, ratio_perim_area, factor)
+    assert np.ndim(single) == 0
+    assert np.allclose(
+        single,
+        core._single_calculate_deformability(5, 0.8, width, ratio_perim_area, factor),
+    )
+
+
+def test_spline_deformability_is_memoised(monkeypatch):
+    width, ratio_perim_area, factor = _create_data()
+
+    # Residuals beyond the smoothing factor mean FITPACK no longer returns
+    # the least squares polynomial
+    factor = factor * 1000
+    x_test = np.array([2, 5, 8, 11, 5])
+    y_test = np.array([0.2, 0.8, 1.2, 1.6, 0.8])
+
+    expected = _each_point(x_test, y_test, width, ratio_perim_area, factor)
+
+    calls = []
+    single_calculate_deformability = core._single_calculate_deformability
+
+    def counting_single_calculate_deformability(*args, **kwargs):
+        calls.append(args)
+        return single_calculate_deformability(*args, **kwargs)
+
+    monkeypatch.setattr(
+        core, "_single_calculate_deformability", counting_single_calculate_deformability
+    )
+
+    for _ in range(2):
+        deformability = core.calculate_deformability(
+            x_test, y_test, width, ratio_perim_area, factor
+        )
+        assert np.allclose(deformability, expected)
+
+    assert len(calls) == 4
+
+
+def _each_point(x_test, y_test, x_data, y_data, z_data):
+    return np.reshape(
+        [
+            core._single_calculate_deformability(x, y, x_data, y_data, z_data)
+            for x, y in zip(np.ravel(x_test), np.ravel(y_test))
+        ],
+        np.shape(x_test),
+    )
+
+
+def _create_data(number_of_inserts=25):
+    rng = np.random.default_rng(1)
+    width = rng.uniform(3, 9, number_of_inserts)
+    length = width * rng.uniform(1, 2.5, number_of_inserts)
+    ratio_perim_area = core.convert2_ratio_perim_area(width, length)
+    factor = (
+        0.9
+        + 0.01 * width
+        - 0.02 * ratio_perim_area
+        + rng.normal(0, 0.005, number_of_inserts)
+    )
+
+    return width, ratio_perim_area, factor
@@ -0,0 +1,112 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""The pole of inaccessibility should find the largest circle within an
+insert at least as well as basinhopping."""
+
+import time
+
+from pymedphys._imports import numpy as np
+from pymedphys._imports import pytest
+
+from pymedphys._electronfactors import core, pole
+
+L_SHAPE = np.array([[0, 0], [4, 0], [4, 1], [1, 1], [1, 4], [0, 4]]).T
+
+
+def test_known_inserts():
+    x, y = _ellipse(width=4, length=7, angle=0.3)
+    width, length, _ = core.parameterise_insert(x, y)
+    assert width == pytest.approx(4, abs=0.01)
+    assert length == pytest.approx(7, abs=0.01)
+
+    # Constrained by the two outer edges and the inner corner
+    width, _, circle_centre = core.parameterise_insert(*L_SHAPE, precision=1e-6)
+    radius = np.sqrt(2) / (1 + np.sqrt(2))
+    assert width == pytest.approx(2 * radius, abs=1e-5)
+    assert np.allclose(circle_centre, radius, atol=1e-3)
+
+
+def test_precision_and_callback():
+    x, y = _irregular(seed=0)
+    coarse = core.parameterise_insert(x, y, precision=0.1)[0]
+    fine = core.parameterise_insert(x, y, precision=1e-5)[0]
+    assert coarse <= fine <= coarse + 0.2
+
+    improvements = []
+    core.parameterise_insert(
+        x, y, callback=lambda centre, f, accept: improvements.append(-f)
+    )
+    assert improvements == sorted(improvements)
+
+    with pytest.raises(ValueError):
+        core.parameterise_insert(x, y, method="simplex")
+
+    with pytest.raises(ValueError):
+        pole.pole_of_inaccessibility(x, y, precision=0)
+
+
+@pytest.mark.slow
+def test_agrees_with_basinhopping():
+    inserts = [_ellipse(width=6, length=6), _ellipse(width=3, length=10, angle=1)]
+    inserts += [_irregular(seed) for seed in range(5)]
+
+    pole_time = 0
+    basinhopping_time = 0
+
+    for x, y in inserts:
+        start = time.perf_counter()
+        width, length, _ = core.parameterise_insert(x, y)
+        pole_time += time.perf_counter() - start
+
+        np.random.seed(0)
+        start = time.perf_counter()
+        basinhopping_width, basinhopping_length, _ = core.parameterise_insert(
+            x, y, method="basinhopping"
+        )
+        basinhopping_time += time.perf_counter() - start
+
+        # Basinhopping can settle on a smaller circle, never a larger one
+        assert width >= basinhopping_width - 2 * pole.PRECISION
+        if width - basinhopping_width < 0.01:
+            assert length == pytest.approx(basinhopping_length, abs=0.01)
+
+    print(
+        f"Pole of inaccessibility: {pole_time / len(inserts) * 1000:.1f} ms per "
+        f"insert, basinhopping: {basinhopping_time / len(inserts) * 1000:.1f} ms "
+        "per insert"
+    )
+
+
+def _ellipse(width, length, angle=0.0, number_of_points=100):
+    t = np.linspace(0, 2 * np.pi, number_of_points, endpoint=False)
+    x = width / 2 * np.cos(t)
+    y = length / 2 * np.sin(t)
+
+    return (
+        1 + x * np.cos(angle) - y * np.sin(angle),
+        -2 + x * np.sin(angle) + y * np.cos(angle),
+    )
+
+
+def _irregular(seed, number_of_points=200):
+    rng = np.random.default_rng(seed)
+    t = np.linspace(0, 2 * np.pi, number_of_points, endpoint=False)
+    radius = 3 + sum(
+        rng.uniform(0, 0.6) * np.cos(k * t + rng.uniform(0, 2 * np.pi))
+        for k in range(1, 6)
+    )
+
+    return 2 * radius * np.cos(t), radius * np.sin(t)
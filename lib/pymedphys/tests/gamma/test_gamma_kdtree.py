@@ -0,0 +1,273 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Tests for the k-d tree gamma engine."""
+
+from pymedphys._imports import numpy as np
+from pymedphys._imports import pytest, scipy
+
+import pymedphys
+from pymedphys._gamma.implementation import gamma_kdtree
+from pymedphys._gamma.implementation import kdtree as kdtree_implementation
+
+from .test_gamma_shell import get_dummy_gamma_set
+
+
+def assert_close_to_shell(coords, reference, evaluation, **kwargs):
+    shell = pymedphys.gamma(coords, reference, coords, evaluation, **kwargs)
+    kdtree = gamma_kdtree(coords, reference, coords, evaluation, **kwargs)
+
+    if not isinstance(shell, dict):
+        shell = {None: shell}
+        kdtree = {None: kdtree}
+
+    assert shell.keys() == kdtree.keys()
+
+    for key, shell_gamma in shell.items():
+        assert np.shape(shell_gamma) == np.shape(kdtree[key])
+        assert np.array_equal(np.isnan(shell_gamma), np.isnan(kdtree[key]))
+        assert np.nanmax(np.abs(shell_gamma - kdtree[key])) <= 0.1
+
+
+def test_kdtree_agrees_with_shell():
+    coords, reference, evaluation, _ = get_dummy_gamma_set()
+
+    for local_gamma in (False, True):
+        for max_gamma in (None, 1.5):
+            assert_close_to_shell(
+                coords,
+                reference,
+                evaluation,
+                dose_percent_threshold=[2, 3],
+                distance_mm_threshold=[0.3, 0.5],
+                lower_percent_dose_cutoff=0,
+                local_gamma=local_gamma,
+                max_gamma=max_gamma,
+            )
+
+
+@pytest.mark.parametrize("local_gamma", [False, True])
+def test_kdtree_linear_dose_is_exact(local_gamma):
+    """Over a linear evaluation dose the minimum gamma is the scaled
+    distance from each reference point to a plane, which the refinement
+    upon the interpolated dose should find to within rounding."""
+    gradient = np.array([2.0, -1.0, 0.5])
+    axes_evaluation = (np.arange(-12, 12.1, 1.0),) * 3
+    axes_reference = (np.arange(-6, 6.1, 1.3),) * 3
+
+    mesh_evaluation = np.meshgrid(*axes_evaluation, indexing="ij")
+    mesh_reference = np.meshgrid(*axes_reference, indexing="ij")
+    evaluation = 50 + sum(g * item for g, item in zip(gradient, mesh_evaluation))
+    offset = np.random.default_rng(0).uniform(-4, 4, mesh_reference[0].shape)
+    reference = 50 + offset + sum(g * item for g, item in zip(gradient, mesh_reference))
+
+    distance_threshold = 2
+    if local_gamma:
+        dose_scale = 0.03 * reference
+    else:
+        dose_scale = 3
+
+    expected = np.abs(offset / dose_scale) / np.sqrt(
+        1 + distance_threshold**2 * np.sum(gradient**2) / dose_scale**2
+    )
+
+    gamma = gamma_kdtree(
+        axes_reference,
+        reference,
+        axes_evaluation,
+        evaluation,
+        dose_percent_threshold=3,
+        distance_mm_threshold=distance_threshold,
+        lower_percent_dose_cutoff=0,
+        global_normalisation=100,
+        local_gamma=local_gamma,
+    )
+
+    assert np.allclose(gamma, expected, rtol=0, atol=1e-9)
+
+
+def test_ignored_options_warn():
+    coords, reference, evaluation, _ = get_dummy_gamma_set()
+    options = dict(dose_percent_threshold=3, distance_mm_threshold=0.3)
+
+    expected = gamma_kdtree(coords, reference, coords, evaluation, **options)
+
+    for ignored_option in ({"interpolator": "scipy"}, {"skip_once_passed": True}):
+        with pytest.warns(UserWarning, match=list(ignored_option)[0]):
+            gamma = gamma_kdtree(
+                coords, reference, coords, evaluation, **options, **ignored_option
+            )
+
+        assert np.array_equal(gamma, expected, equal_nan=True)
+
+
+def test_kdtree_lower_dimensions():
+    coords, reference, evaluation, _ = get_dummy_gamma_set()
+
+    assert_close_to_shell(
+        coords[1::],
+        reference[5, :, :],
+        evaluation[5, :, :],
+        dose_percent_threshold=3,
+        distance_mm_threshold=0.3,
+        lower_percent_dose_cutoff=0,
+    )
+
+    assert_close_to_shell(
+        (coords[2],),
+        reference[5, 5, :],
+        evaluation[5, 5, :],
+        dose_percent_threshold=3,
+        distance_mm_threshold=0.3,
+        lower_percent_dose_cutoff=0,
+    )
+
+
+def test_kdtree_smooth_field_with_small_ram():
+    """Splitting the reference points into spatial blocks changes which
+    evaluation points are sampled, but should not change the result
+    beyond the refinement tolerance."""
+    grid = np.arange(0, 20, 1.0)
+    coords = (grid, grid, grid[:10])
+    mesh = np.meshgrid(*coords, indexing="ij")
+
+    reference = np.exp(
+        -((mesh[0] - 10) ** 2 + (mesh[1] - 10) ** 2 + (mesh[2] - 5) ** 2) / 50
+    )
+    evaluation = 1.02 * np.exp(
+        -((mesh[0] - 10.4) ** 2 + (mesh[1] - 9.7) ** 2 + (mesh[2] - 5.2) ** 2) / 48
+    )
+
+    for local_gamma in (False, True):
+        kwargs = dict(
+            dose_percent_threshold=2,
+            distance_mm_threshold=2,
+            interp_fraction=4,
+            local_gamma=local_gamma,
+        )
+        unlimited = gamma_kdtree(coords, reference, coords, evaluation, **kwargs)
+        blocked = gamma_kdtree(
+            coords, reference, coords, evaluation, ram_available=2**20, **kwargs
+        )
+
+        assert np.array_equal(np.isnan(unlimited), np.isnan(blocked))
+        assert np.nanmax(np.abs(unlimited - blocked)) <= 0.1
+
+
+def test_kdtree_evaluation_grid_larger_than_ram(monkeypatch):
+    """The upper bound pass over the whole evaluation grid is split into
+    blocks, and single reference points whose search covers more of the
+    grid than fits are still searched."""
+    grid = np.arange(0, 20, 1.0)
+    coords = (grid, grid, grid[:10])
+    mesh = np.meshgrid(*coords, indexing="ij")
+
+    reference = np.exp(
+        -((mesh[0] - 10) ** 2 + (mesh[1] - 10) ** 2 + (mesh[2] - 5) ** 2) / 50
+    )
+    evaluation = 1.02 * np.exp(
+        -((mesh[0] - 10.4) ** 2 + (mesh[1] - 9.7) ** 2 + (mesh[2] - 5.2) ** 2) / 48
+    )
+    kwargs = dict(dose_percent_threshold=2, distance_mm_threshold=2, interp_fraction=4)
+
+    block_sizes = []
+    blocked_evaluation_point_cloud = (
+        kdtree_implementation._blocked_evaluation_point_cloud  # pylint: disable = protected-access
+    )
+
+    def recording_blocks(*args):
+        for points, dose in blocked_evaluation_point_cloud(*args):
+            block_sizes.append(len(dose))
+            yield points, dose
+
+    monkeypatch.setattr(
+        kdtree_implementation, "_blocked_evaluation_point_cloud", recording_blocks
+    )
+
+    unlimited = gamma_kdtree(coords, reference, coords, evaluation, **kwargs)
+    assert block_sizes == [evaluation.size]
+
+    block_sizes = []
+    blocked = gamma_kdtree(
+        coords, reference, coords, evaluation, ram_available=2**16, **kwargs
+    )
+    assert len(block_sizes) > 1
+    assert sum(block_sizes) == evaluation.size
+
+    assert np.array_equal(np.isnan(unlimited), np.isnan(blocked))
+    assert np.nanmax(np.abs(unlimited - blocked)) <= 0.1
+
+
+def test_blocked_evaluation_point_cloud():
+    coords = (np.arange(4.0), np.arange(3.0) * 2, np.arange(5.0) - 2)
+    dose = np.random.default_rng(0).random((4, 3, 5))
+
+    blocks = list(
+        kdtree_implementation._blocked_evaluation_point_cloud(  # pylint: disable = protected-access
+            coords, dose, 7
+        )
+    )
+    assert [len(block_dose) for _, block_dose in blocks] == [7] * 8 + [4]
+
+    mesh = np.meshgrid(*coords, indexing="ij")
+    assert np.array_equal(
+        np.concatenate([points for points, _ in blocks]),
+        np.column_stack([np.ravel(item) for item in mesh]),
+    )
+    assert np.array_equal(
+        np.concatenate([block_dose for _, block_dose in blocks]), np.ravel(dose)
+    )
+
+
+def test_kdtree_steep_gradient_against_brute_force():
+    """Within a steep gradient the closest point lies between the
+    evaluation grid points, compare against a finely sampled search of
+    the interpolated evaluation dose."""
+    grid = np.arange(0, 12, 1.0)
+    coords = (grid, grid)
+    mesh = np.meshgrid(*coords, indexing="ij")
+
+    reference = 1 / (1 + np.exp(-(mesh[0] + 0.3 * mesh[1] - 6)))
+    evaluation = 1 / (1 + np.exp(-(mesh[0] + 0.3 * mesh[1] - 6.4) * 1.1))
+
+    distance_threshold = 1
+    dose_threshold = 0.02
+
+    kdtree = gamma_kdtree(
+        coords,
+        reference,
+        coords,
+        evaluation,
+        dose_percent_threshold=100 * dose_threshold,
+        distance_mm_threshold=distance_threshold,
+        lower_percent_dose_cutoff=0,
+    )
+
+    interpolator = scipy.interpolate.RegularGridInterpolator(coords, evaluation)
+    offsets = np.arange(-2, 2.0001, 0.01)
+    for i, j in [(4, 5), (5, 2), (6, 6), (7, 1), (5, 9)]:
+        search = np.stack(
+            np.meshgrid(grid[i] + offsets, grid[j] + offsets, indexing="ij"), axis=-1
+        ).reshape(-1, 2)
+        search = search[np.all((search >= 0) & (search <= grid[-1]), axis=-1)]
+
+        brute_force = np.min(
+            np.sqrt(
+                np.sum((search - [grid[i], grid[j]]) ** 2, axis=-1)
+                / distance_threshold**2
+                + ((interpolator(search) - reference[i, j]) / dose_threshold) ** 2
+            )
+        )
+
+        assert np.abs(kdtree[i, j] - brute_force) <= 0.02
@@ -19,9 +19,11 @@
 
 
 from pymedphys._imports import numpy as np
+from pymedphys._imports import pytest, scipy
 
 import pymedphys
 import pymedphys._utilities.createshells
+from pymedphys._gamma.implementation.shell import GammaInternalFixedOptions
 
 
 def does_gamma_scale_as_expected(
@@ -211,3 +213,138 @@ def test_distance_0_gives_1_point():
     )
 
     assert len(x) == 1 & len(y) == 1 & len(z) == 1
+
+
+def test_shells_are_cached_and_read_only():
+    """Repeated requests for the same shell should return the same
+    read-only arrays."""
+    first = pymedphys._utilities.createshells.calculate_coordinates_shell(1, 3, 0.1)
+    second = pymedphys._utilities.createshells.calculate_coordinates_shell(
+        np.float64(1), 3, 0.1
+    )
+
+    assert first is second
+
+    for axis_coordinates in first:
+        assert not axis_coordinates.flags.writeable
+
+
+def test_vectorised_shell_matches_row_by_row():
+    """Confirm the vectorised sphere is identical to building it one row
+    of elevation at a time."""
+    distance_step_size = 0.03
+
+    for distance in np.arange(0, 2, 0.13):
+        number_of_rows = np.ceil(np.pi * distance / distance_step_size).astype(int) + 1
+        elevation = np.linspace(0, np.pi, number_of_rows)
+        amount_in_row = (
+            np.ceil(
+                2 * np.pi * distance * np.sin(elevation) / distance_step_size
+            ).astype(int)
+            + 1
+        )
+
+        expected = [[], [], []]
+        for i, phi in enumerate(elevation):
+            azimuth = np.linspace(0, 2 * np.pi, amount_in_row[i] + 1)[:-1:]
+            expected[0].append(distance * np.sin(phi) * np.cos(azimuth))
+            expected[1].append(distance * np.sin(phi) * np.sin(azimuth))
+            expected[2].append(distance * np.cos(phi) * np.ones_like(azimuth))
+
+        result = pymedphys._utilities.createshells.calculate_coordinates_shell_3d(
+            distance, distance_step_size
+        )
+
+        for axis_expected, axis_result in zip(expected, result):
+            assert np.array_equal(np.hstack(axis_expected), axis_result)
+
+
+def test_options_own_evaluation_interpolator():
+    """The evaluation interpolator is built once alongside a contiguous
+    float64 copy of the evaluation dose."""
+    coords, reference, evaluation, _ = get_dummy_gamma_set()
+    evaluation = np.asfortranarray(evaluation, dtype=np.float32)
+
+    for interpolator in ("scipy", "econforge"):
+        options = GammaInternalFixedOptions.from_user_inputs(
+            coords, reference, coords, evaluation, 3, 0.3, interpolator=interpolator
+        )
+
+        assert options.dose_evaluation.dtype == np.float64
+        assert options.dose_evaluation.flags.c_contiguous
+
+        points = np.array([[0.1, 0.2, 0.3], [0.35, 0.15, 0.25]])
+        assert np.allclose(
+            options.evaluation_interpolator(points[None, :, :])[0],
+            scipy.interpolate.interpn(coords, evaluation.astype(float), points),
+        )
+
+    with pytest.raises(ValueError):
+        GammaInternalFixedOptions.from_user_inputs(
+            coords, reference, coords, evaluation, 3, 0.3, interpolator="nearest"
+        )
+
+
+def test_single_precision_gamma():
+    """Single precision gamma should be within the documented bound of
+    double precision."""
+    coords, reference, evaluation, _ = get_dummy_gamma_set()
+
+    for local_gamma in (False, True):
+        kwargs = dict(lower_percent_dose_cutoff=0, local_gamma=local_gamma)
+
+        double = pymedphys.gamma(
+            coords, reference, coords, evaluation, [1, 3], [0.1, 0.3], **kwargs
+        )
+        single = pymedphys.gamma(
+            coords,
+            reference,
+            coords,
+            evaluation,
+            [1, 3],
+            [0.1, 0.3],
+            precision="float32",
+            **kwargs,
+        )
+
+        for key, double_gamma in double.items():
+            assert single[key].dtype == np.float32
+            assert np.array_equal(np.isnan(double_gamma), np.isnan(single[key]))
+            assert np.nanmax(np.abs(double_gamma - single[key])) < 1e-4
+
+    with pytest.raises(ValueError):
+        pymedphys.gamma(
+            coords, reference, coords, evaluation, 3, 0.3, precision="float16"
+        )
+
+
+def test_parallel_gamma_matches_serial():
+    """Confirm that distributing the reference points over a process pool
+    gives bit-identical results to the serial calculation."""
+    coords, reference, evaluation, _ = get_dummy_gamma_set()
+
+    for interpolator in ("scipy", "econforge"):
+        for local_gamma in (False, True):
+            kwargs = dict(
+                lower_percent_dose_cutoff=0,
+                interpolator=interpolator,
+                local_gamma=local_gamma,
+            )
+
+            serial = pymedphys.gamma(
+                coords, reference, coords, evaluation, [2, 3], [0.3, 0.5], **kwargs
+            )
+            parallel = pymedphys.gamma(
+                coords,
+                reference,
+                coords,
+                evaluation,
+                [2, 3],
+                [0.3, 0.5],
+                workers=3,
+                **kwargs,
+            )
+
+            assert serial.keys() == parallel.keys()
+            for key, serial_gamma in serial.items():
+                assert np.array_equal(serial_gamma, parallel[key], equal_nan=True)
@@ -0,0 +1,197 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Tests for the tile by tile gamma generator."""
+
+from pymedphys._imports import numpy as np
+from pymedphys._imports import pytest
+
+import pymedphys
+from pymedphys._gamma.implementation import gamma_shell_tiles, parallel, shell
+from pymedphys._gamma.utilities import calculate_pass_rate
+
+from .test_gamma_shell import get_dummy_gamma_set
+
+
+def test_tiles_reassemble_into_gamma():
+    coords, reference, evaluation, _ = get_dummy_gamma_set()
+
+    for local_gamma in (False, True):
+        kwargs = dict(lower_percent_dose_cutoff=0, local_gamma=local_gamma)
+
+        expected = pymedphys.gamma(
+            coords, reference, coords, evaluation, [2, 3], [0.3, 0.5], **kwargs
+        )
+        reassembled = {
+            key: np.full_like(gamma, np.nan) for key, gamma in expected.items()
+        }
+
+        tiles = list(
+            gamma_shell_tiles(
+                coords,
+                reference,
+                coords,
+                evaluation,
+                [2, 3],
+                [0.3, 0.5],
+                tile_shape=(3, 5, 14),
+                **kwargs,
+            )
+        )
+
+        assert len(tiles) == 4 * 3
+        assert tiles[-1].points_remaining == 0
+
+        for tile in tiles:
+            for key, gamma in tile.gamma.items():
+                reassembled[key][tile.tile] = gamma
+
+        for key, gamma in expected.items():
+            assert np.array_equal(gamma, reassembled[key], equal_nan=True)
+            assert tiles[-1].pass_rate[key] == calculate_pass_rate(gamma)
+
+
+def test_stop_once_verdict_is_decided():
+    coords, reference, evaluation, _ = get_dummy_gamma_set()
+    kwargs = dict(lower_percent_dose_cutoff=0, tile_shape=(1, 12, 14))
+
+    all_tiles = list(
+        gamma_shell_tiles(coords, reference, coords, evaluation, 3, 0.3, **kwargs)
+    )
+    final_pass_rate = all_tiles[-1].pass_rate
+
+    decided_tiles = list(
+        gamma_shell_tiles(
+            coords,
+            reference,
+            coords,
+            evaluation,
+            3,
+            0.3,
+            pass_rate_criterion=50,
+            **kwargs,
+        )
+    )
+
+    assert len(decided_tiles) < len(all_tiles)
+    assert decided_tiles[-1].points_remaining > 0
+    assert final_pass_rate >= 50
+
+    # A criterion only decided by the final point runs every tile
+    unreachable = list(
+        gamma_shell_tiles(
+            coords,
+            reference,
+            coords,
+            evaluation,
+            3,
+            0.3,
+            pass_rate_criterion=final_pass_rate,
+            **kwargs,
+        )
+    )
+    assert len(unreachable) == len(all_tiles)
+
+
+def test_closing_cancels_remaining_tiles():
+    coords, reference, evaluation, _ = get_dummy_gamma_set()
+
+    tiles = gamma_shell_tiles(
+        coords,
+        reference,
+        coords,
+        evaluation,
+        3,
+        0.3,
+        lower_percent_dose_cutoff=0,
+        tile_shape=(1, 12, 14),
+    )
+
+    first = next(tiles)
+    assert first.tile == (slice(0, 1), slice(0, 12), slice(0, 14))
+
+    tiles.close()
+    assert next(tiles, None) is None
+
+
+def test_quiet_is_deprecated():
+    coords, reference, evaluation, _ = get_dummy_gamma_set()
+
+    tiles = gamma_shell_tiles(coords, reference, coords, evaluation, 3, 0.3, quiet=True)
+
+    with pytest.deprecated_call():
+        next(tiles)
+
+    tiles.close()
+
+
+def test_one_pool_is_shared_by_every_tile(monkeypatch):
+    coords, reference, evaluation, _ = get_dummy_gamma_set()
+    args = (coords, reference, coords, evaluation, [2, 3], [0.3, 0.5])
+    kwargs = dict(lower_percent_dose_cutoff=0, tile_shape=(3, 5, 14))
+
+    pools = []
+    enter = parallel.MinDoseDifferencePool.__enter__
+
+    def recording_enter(pool):
+        pools.append(pool)
+        return enter(pool)
+
+    monkeypatch.setattr(parallel.MinDoseDifferencePool, "__enter__", recording_enter)
+
+    serial = list(pymedphys.gamma_tiles(*args, **kwargs))
+    assert pools == []
+
+    tiles = pymedphys.gamma_tiles(*args, workers=2, **kwargs)
+    first = next(tiles)
+    assert len(pools) == 1
+
+    pooled = [first] + list(tiles)
+    assert len(pools) == 1
+    assert pools[0]._executor is None  # pylint: disable = protected-access
+
+    assert len(pooled) == len(serial)
+    for serial_tile, pooled_tile in zip(serial, pooled):
+        assert serial_tile.tile == pooled_tile.tile
+        for key, gamma in serial_tile.gamma.items():
+            assert np.array_equal(gamma, pooled_tile.gamma[key], equal_nan=True)
+
+
+def test_evaluation_interpolator_is_built_once(monkeypatch):
+    coords, reference, evaluation, _ = get_dummy_gamma_set()
+
+    built = []
+    build_evaluation_interpolator = shell.build_evaluation_interpolator
+
+    def recording_build(*args):
+        built.append(args)
+        return build_evaluation_interpolator(*args)
+
+    monkeypatch.setattr(shell, "build_evaluation_interpolator", recording_build)
+
+    tiles = list(
+        gamma_shell_tiles(
+            coords,
+            reference,
+            coords,
+            evaluation,
+            3,
+            0.3,
+            lower_percent_dose_cutoff=0,
+            tile_shape=(3, 5, 14),
+        )
+    )
+
+    assert len(tiles) > 1
+    assert len(built) == 1
@@ -0,0 +1,171 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""The index of an iCOM archive should describe its frames, and allow a
+window of them to be read by only decompressing the blocks that hold
+them."""
+
+import lzma
+import random
+
+from pymedphys._imports import numpy as np
+
+from pymedphys._icom import archive, mappings
+
+NUM_FRAMES = 120
+
+
+def test_write_archive(tmp_path):
+    filepath = tmp_path.joinpath("20261018_090000.xz")
+    frames = _create_frames()
+
+    index = archive.write_archive(filepath, frames, block_size=1000)
+
+    with lzma.open(filepath, "r") as f:
+        assert f.read() == b"".join(frames)
+
+    assert len(index.blocks) > 10
+    _assert_index_describes_frames(index, frames)
+    _assert_indices_equal(archive.load_index(filepath), index)
+
+
+def test_written_files_have_default_permissions(tmp_path):
+    filepath = tmp_path.joinpath("20261018_090000.xz")
+    archive.write_archive(filepath, _create_frames(), block_size=1000)
+
+    plain_filepath = tmp_path.joinpath("plain")
+    with open(plain_filepath, "wb"):
+        pass
+
+    expected_mode = plain_filepath.stat().st_mode
+    assert filepath.stat().st_mode == expected_mode
+    assert archive.index_path(filepath).stat().st_mode == expected_mode
+
+
+def test_read_frames_within_window(tmp_path, monkeypatch):
+    filepath = tmp_path.joinpath("20261018_090000.xz")
+    frames = _create_frames()
+    index = archive.write_archive(filepath, frames, block_size=1000)
+
+    decompressors = []
+    original_decompressor = lzma.LZMADecompressor
+
+    def counting_decompressor():
+        decompressors.append(None)
+        return original_decompressor()
+
+    monkeypatch.setattr(archive.lzma, "LZMADecompressor", counting_decompressor)
+
+    window = archive.read_frames(filepath, "2026-10-1809:00:30", "2026-10-1809:00:49")
+    assert window == frames[30:50]
+    assert 0 < len(decompressors) < len(index.blocks) / 2
+
+    assert archive.read_frames(filepath) == frames
+    assert archive.read_frames(filepath, start="2026-10-1810:00:00") == []
+
+
+def test_rebuild_index_of_existing_archive(tmp_path):
+    filepath = tmp_path.joinpath("20261018_090000.xz")
+    frames = _create_frames()
+
+    with lzma.open(filepath, "w") as f:
+        f.write(b"".join(frames))
+
+    assert archive.load_index(filepath) is None
+
+    index = archive.get_index(filepath)
+    assert len(index.blocks) == 1
+    _assert_index_describes_frames(index, frames)
+    _assert_indices_equal(archive.load_index(filepath), index)
+
+    assert archive.read_frames(
+        filepath, "2026-10-1809:00:10", "2026-10-1809:00:10"
+    ) == [frames[10]]
+
+    recompressed_index = archive.rebuild_index(filepath, recompress=True)
+    assert len(recompressed_index.blocks) == 1
+    _assert_index_describes_frames(recompressed_index, frames)
+
+    with lzma.open(filepath, "r") as f:
+        assert f.read() == b"".join(frames)
+
+
+def test_stale_index_is_ignored(tmp_path):
+    filepath = tmp_path.joinpath("20261018_090000.xz")
+    frames = _create_frames()
+    archive.write_archive(filepath, frames)
+
+    with lzma.open(filepath, "w") as f:
+        f.write(b"".join(frames[:10]))
+
+    assert archive.load_index(filepath) is None
+    assert archive.read_frames(filepath) == frames[:10]
+
+
+def test_index_archives(tmp_path):
+    frames = _create_frames()
+    filepaths = [tmp_path.joinpath(name, "20261018_090000.xz") for name in ("a", "b")]
+    for filepath in filepaths:
+        filepath.parent.mkdir()
+        with lzma.open(filepath, "w") as f:
+            f.write(b"".join(frames))
+
+    archive.index_archives(tmp_path)
+
+    for filepath in filepaths:
+        _assert_index_describes_frames(archive.load_index(filepath), frames)
+
+
+def _assert_index_describes_frames(index, frames):
+    assert index.timestamps == [frame[8:26].decode() for frame in frames]
+    assert index.machine_ids == [None] + ["2619"] * (len(frames) - 1)
+
+    assert np.isnan(index.metersets[0])
+    assert np.allclose(index.metersets[1:], np.arange(1, len(frames)) / 2)
+
+    data = b"".join(frames)
+    for offset, length, frame in zip(index.offsets, index.lengths, frames):
+        assert data[offset : offset + length] == frame
+
+
+def _assert_indices_equal(first, second):
+    assert first.timestamps == second.timestamps
+    assert first.machine_ids == second.machine_ids
+    assert np.array_equal(first.metersets, second.metersets, equal_nan=True)
+    assert np.array_equal(first.offsets, second.offsets)
+    assert np.array_equal(first.lengths, second.lengths)
+    assert first.blocks == second.blocks
+
+
+def _create_frames():
+    return [_create_frame(i) for i in range(NUM_FRAMES)]
+
+
+def _create_frame(i):
+    timestamp = f"2026-10-1809:{i // 60:02d}:{i % 60:02d}".encode()
+    fields = bytes(random.Random(i).randrange(0, 40) for _ in range(100))
+
+    # The first frame is missing its machine ID and meterset
+    if i > 0:
+        fields += _field(b"\x10\x00", "Machine ID", b"2619")
+        fields += _field(b"\x080", "Delivery MU", str(i / 2).encode())
+
+    return b"\x00" * 8 + timestamp + bytes([i % 256]) + fields
+
+
+def _field(group, label, value):
+    key = mappings.ICOM[label][0]
+
+    return group + key + bytes([len(value)]) + b"\x00\x00\x00" + value
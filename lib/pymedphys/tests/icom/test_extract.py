@@ -0,0 +1,210 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Reading fields from an iCOM message in place should agree with
+extracting each of them in turn."""
+
+import lzma
+import time
+
+from pymedphys._imports import numpy as np
+from pymedphys._imports import pytest
+
+from pymedphys._data import download
+from pymedphys._icom import delivery, extract, mappings
+
+PATIENT_GROUP = b"\x10\x00"
+TREATMENT_GROUP = b"\x080"
+BEAM_LIMITING_DEVICE_GROUP = b"\n0"
+
+
+def test_get_field_agrees_with_extract():
+    message = _create_message(counter=5, meterset=b"-32767", later_meterset=b"12.5")
+
+    for label in mappings.ICOM:
+        _, expected = extract.extract(message, label)
+        assert extract.get_field(message, label) == expected
+
+    assert extract.get_field(message, "Delivery MU") == 12.5
+    assert extract.get_field(message, "Interlocks") == ["DOOR", "TERMINATE"]
+
+    for label, number in ((b"MLCX", 160), (b"ASYMY", 2), (b"MLCX", 10)):
+        _, expected = extract.extract_coll(message, label, number)
+        assert extract.get_positions(message, label, number) == expected
+
+
+def test_missing_fields():
+    message = _create_message(counter=0, patient_id=None)
+
+    assert extract.get_field(message, "Patient ID") is None
+    assert extract.get_field(message, "Previous Interlocks") == []
+
+    with pytest.raises(ValueError):
+        extract.get_positions(message, b"ASYMX", 2)
+
+    with pytest.raises(ValueError):
+        extract.get_positions(message, b"ASYMY", 3)
+
+
+def test_delivery_from_icom_stream():
+    meterset = [b"0.0", b"1.5", b"3.0", b"0.0", b"2.0"]
+    stream = b"".join(
+        _create_message(counter=i, meterset=mu) for i, mu in enumerate(meterset)
+    )
+
+    mu, gantry, collimator, mlc, jaw = delivery.delivery_from_icom_stream(stream)
+
+    assert np.allclose(mu, [0, 1.5, 3, 3, 5])
+    assert np.allclose(gantry, 180.5)
+    assert np.allclose(collimator, 90)
+    assert mlc.shape == (5, 80, 2)
+    assert np.allclose(jaw, [[-105, 102]] * 5)
+
+    _, _, _, expected_mlc, _ = delivery.get_delivery_data_items(
+        _create_message(counter=0)
+    )
+    assert np.allclose(mlc, expected_mlc)
+
+
+def test_batch_conversion_agrees_with_each_frame():
+    rng = np.random.default_rng(0)
+    frames = [
+        _create_message(
+            counter=i,
+            meterset=f"{i / 4:.1f}".encode(),
+            leaf_positions=rng.uniform(-20, 20, 160),
+        )
+        for i in range(20)
+    ]
+
+    batch = delivery.delivery_from_icom_frames(frames)
+    each_frame = [delivery.get_delivery_data_items(frame) for frame in frames]
+
+    for i, (_, gantry, collimator, mlc, jaw) in enumerate(each_frame):
+        assert batch[1][i] == gantry
+        assert batch[2][i] == collimator
+        assert np.array_equal(batch[3][i], mlc)
+        assert np.array_equal(batch[4][i], jaw)
+
+    assert np.allclose(batch[0], np.arange(20) / 4, atol=0.05)
+
+
+@pytest.mark.slow
+def test_bundled_icom_streams():
+    paths = download.zip_data_paths("metersetmap-gui-e2e-data.zip")
+    icom_paths = [path for path in paths if path.suffix == ".xz"]
+
+    for icom_path in icom_paths:
+        with lzma.open(icom_path, "r") as f:
+            icom_stream = f.read()
+
+        messages = extract.get_data_points(icom_stream)
+
+        start = time.perf_counter()
+        items = [delivery.get_delivery_data_items(message) for message in messages]
+        get_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        extracted = [_extract_delivery_data_items(message) for message in messages]
+        extract_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        delivery.delivery_from_icom_frames(messages)
+        batch_time = time.perf_counter() - start
+
+        print(
+            f"{icom_path.name}: {len(messages) / get_time:.0f} messages/s read "
+            f"in place, {len(messages) / extract_time:.0f} messages/s extracted, "
+            f"{len(messages) / batch_time:.0f} messages/s converted as a batch"
+        )
+
+        for message_items, extracted_items in zip(items, extracted):
+            for item, extracted_item in zip(message_items, extracted_items):
+                assert np.allclose(item, extracted_item)
+
+
+def _extract_delivery_data_items(message):
+    shrunk_stream, meterset = extract.extract(message, "Delivery MU")
+    shrunk_stream, gantry = extract.extract(shrunk_stream, "Gantry")
+    shrunk_stream, collimator = extract.extract(shrunk_stream, "Collimator")
+    shrunk_stream, raw_mlc = extract.extract_coll(shrunk_stream, b"MLCX", 160)
+    shrunk_stream, raw_jaw = extract.extract_coll(shrunk_stream, b"ASYMY", 2)
+
+    return (
+        meterset,
+        gantry,
+        collimator,
+        delivery._convert_icom_mlc_to_delivery_coords(  # pylint: disable = protected-access
+            raw_mlc
+        ),
+        delivery._convert_icom_jaw_to_delivery_coords(  # pylint: disable = protected-access
+            raw_jaw
+        ),
+    )
+
+
+def _field(group, label, value):
+    key = mappings.ICOM[label][0] if isinstance(label, str) else label
+
+    return group + key + bytes([len(value)]) + b"\x00\x00\x00" + value
+
+
+def _device(label, positions):
+    return _field(BEAM_LIMITING_DEVICE_GROUP, b"\xb8\x00DS\x00R", label) + b"".join(
+        _field(
+            BEAM_LIMITING_DEVICE_GROUP,
+            b"\x1c\x01DS\x00R",
+            position,
+        )
+        for position in positions
+    )
+
+
+def _create_message(
+    counter,
+    meterset=b"25.0",
+    later_meterset=None,
+    patient_id=b"012345",
+    leaf_positions=None,
+):
+    if leaf_positions is None:
+        leaf_positions = [-5 + i * 0.05 for i in range(160)]
+
+    fields = [b"\x00\x01\x02\x03"]
+
+    if patient_id is not None:
+        fields += [
+            _field(PATIENT_GROUP, "Patient ID", patient_id),
+            _field(PATIENT_GROUP, "Patient Name", b"DOE, JANE"),
+        ]
+
+    fields += [
+        _field(PATIENT_GROUP, "Machine ID", b"2619"),
+        _field(TREATMENT_GROUP, "Energy", b"6 MV"),
+        _field(TREATMENT_GROUP, "Delivery MU", meterset),
+        _field(TREATMENT_GROUP, "Gantry", b"180.5"),
+        _field(TREATMENT_GROUP, "Collimator", b"90.0"),
+        _field(TREATMENT_GROUP, "Table Isocentric", b"0"),
+        _field(TREATMENT_GROUP, "Table Vertical", b"-12.5"),
+        _field(TREATMENT_GROUP, "Interlocks", b"DOOR"),
+        _field(TREATMENT_GROUP, "Interlocks", b"TERMINATE"),
+        _device(b"ASYMY", [b"10.2", b"-10.5"]),
+        _device(b"MLCX", [f"{position:.2f}".encode() for position in leaf_positions]),
+    ]
+
+    if later_meterset is not None:
+        fields.append(_field(TREATMENT_GROUP, "Delivery MU", later_meterset))
+
+    return b"\x00" * 8 + b"2026-10-1809:30:00" + bytes([counter]) + b"".join(fields)
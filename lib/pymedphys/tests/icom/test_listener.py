@@ -0,0 +1,152 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Splitting an iCOM stream into frames as it arrives should agree with
+splitting the whole stream at once."""
+
+import asyncio
+import random
+import sys
+import time
+
+from pymedphys._imports import pytest
+
+from pymedphys._icom import extract, listener
+
+# Live files are named by the frame counter, which wraps at 256
+NUM_FRAMES = 200
+
+
+def test_frame_buffer_agrees_with_get_data_points():
+    stream = _create_stream(NUM_FRAMES)
+    expected_frames = extract.get_data_points(stream)[:-1]
+
+    rng = random.Random(0)
+    for max_read_size in (1, 7, 30, 500, 2**16):
+        frame_buffer = listener.FrameBuffer()
+        frames = []
+
+        position = 0
+        while position < len(stream):
+            read_size = rng.randint(1, max_read_size)
+            frames += frame_buffer.feed(stream[position : position + read_size])
+            position += read_size
+
+        assert frames == expected_frames
+        assert len(frame_buffer) == len(extract.get_data_points(stream)[-1])
+
+
+def test_frame_buffer_is_bounded():
+    frame_buffer = listener.FrameBuffer(max_size=1000)
+
+    assert frame_buffer.feed(_create_frame(0)) == []
+    for _ in range(10):
+        assert frame_buffer.feed(b"\x00" * 300) == []
+        assert len(frame_buffer) <= 1300
+
+    frames = frame_buffer.feed(_create_frame(1) + _create_frame(2))
+    assert frames == [_create_frame(1)]
+
+
+@pytest.mark.skipif(
+    sys.platform != "linux", reason="Relies on the whole of 127.0.0.0/8 being local"
+)
+def test_listen_to_many_linacs(tmp_path):
+    ips = ["127.0.0.1", "127.0.0.2"]
+    asyncio.run(_listen_to_mock_linacs(ips, tmp_path))
+
+    for ip in ips:
+        live_files = sorted(tmp_path.joinpath("live", ip).glob("*.txt"))
+        assert len(live_files) == NUM_FRAMES - 1
+
+        for i, live_file in enumerate(live_files):
+            assert live_file.read_bytes() == _create_frame(i)
+
+
+@pytest.mark.skipif(
+    sys.platform != "linux", reason="Relies on the whole of 127.0.0.0/8 being local"
+)
+def test_queued_frames_are_saved_on_shutdown(tmp_path, monkeypatch):
+    save_an_icom_batch = listener.save_an_icom_batch
+
+    def slowly_save_an_icom_batch(*args):
+        time.sleep(0.002)
+        save_an_icom_batch(*args)
+
+    monkeypatch.setattr(listener, "save_an_icom_batch", slowly_save_an_icom_batch)
+
+    ip = "127.0.0.1"
+    asyncio.run(_listen_to_mock_linacs([ip], tmp_path, num_live_files=20))
+
+    live_files = sorted(tmp_path.joinpath("live", ip).glob("*.txt"))
+    assert len(live_files) == NUM_FRAMES - 1
+
+
+async def _listen_to_mock_linacs(ips, data_dir, num_live_files=None):
+    """Listen until ``num_live_files`` have been saved for every Linac,
+    then cancel every task, as ``asyncio.run`` does on a keyboard
+    interrupt."""
+    if num_live_files is None:
+        num_live_files = NUM_FRAMES - 1
+
+    stream = _create_stream(NUM_FRAMES)
+
+    async def send_stream(_, writer):
+        # Sent in small pieces so that frames are split across reads
+        for i in range(0, len(stream), 1000):
+            writer.write(stream[i : i + 1000])
+            await writer.drain()
+
+        writer.close()
+
+    first_server = await asyncio.start_server(send_stream, ips[0], 0)
+    port = first_server.sockets[0].getsockname()[1]
+    servers = [first_server] + [
+        await asyncio.start_server(send_stream, ip, port) for ip in ips[1:]
+    ]
+
+    listening = asyncio.ensure_future(
+        listener.listen_to_linacs(ips, data_dir, port=port)
+    )
+
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        saved = len(list(data_dir.glob("live/*/*.txt")))
+        if saved >= len(ips) * num_live_files:
+            break
+
+        await asyncio.sleep(0.01)
+
+    for task in asyncio.all_tasks():
+        if task is not asyncio.current_task():
+            task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(asyncio.shield(listening), 10)
+
+    for server in servers:
+        server.close()
+        await server.wait_closed()
+
+
+def _create_stream(num_frames):
+    return b"".join(_create_frame(i) for i in range(num_frames))
+
+
+def _create_frame(i):
+    timestamp = f"2026-10-18{9 + i // 3600:02d}:{i // 60 % 60:02d}:{i % 60:02d}"
+    payload = bytes(random.Random(i).randrange(0, 40) for _ in range(100 + i % 50))
+
+    return b"\x00" * 8 + timestamp.encode() + bytes([i % 256]) + payload
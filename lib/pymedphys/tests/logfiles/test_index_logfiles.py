@@ -0,0 +1,191 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""The logfile indexing pipeline, with the Mosaiq server replaced by a
+stand in which has treatment records for all but one of the logfiles."""
+
+import datetime
+import functools
+import json
+
+from pymedphys._imports import pytest
+
+from pymedphys._mosaiq import connect as _connect
+from pymedphys._mosaiq import pool as _pool
+from pymedphys._trf.manage import index as _index
+
+from ..trf._synthetic import create_trf_contents
+
+CENTRE_MAP = {
+    "a_centre": {"timezone": "Australia/Sydney", "mosaiq_sql_server": "msq:1433"}
+}
+MACHINE_MAP = {"2619": {"centre": "a_centre"}}
+
+TREATMENTS = {("1-1", "AP G0"): 1, ("1-2", "LAT G90"): 2}
+
+
+class _Connection:
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    queried = []
+
+    def execute(connection, query, parameters=None):
+        queried.append(parameters)
+        start = datetime.datetime.fromisoformat(parameters["window_start"])
+        end = datetime.datetime.fromisoformat(parameters["window_end"])
+
+        return [
+            ("123456", field_id, "PHANTOM", "A", False, 13, True)
+            + (field_label, field_name, start, end)
+            for (field_label, field_name), field_id in TREATMENTS.items()
+        ]
+
+    monkeypatch.setattr(
+        _index._pp_mosaiq,
+        "ConnectionPool",
+        functools.partial(_pool.ConnectionPool, username="user", password="pass"),
+    )
+    monkeypatch.setattr(
+        _connect, "connect_with_credentials", lambda **kwargs: _Connection()
+    )
+    monkeypatch.setattr(_index._pp_mosaiq, "execute", execute)
+
+    return queried
+
+
+@pytest.fixture
+def looked_up_fields(monkeypatch):
+    field_names = []
+    get_mosaiq_delivery_details_bulk = _index.get_mosaiq_delivery_details_bulk
+
+    def recording_get_mosaiq_delivery_details_bulk(connection, deliveries, **kwargs):
+        field_names.extend(field_name for _, _, _, field_name in deliveries)
+        return get_mosaiq_delivery_details_bulk(connection, deliveries, **kwargs)
+
+    monkeypatch.setattr(
+        _index,
+        "get_mosaiq_delivery_details_bulk",
+        recording_get_mosaiq_delivery_details_bulk,
+    )
+
+    return field_names
+
+
+def write_logfiles(data_directory):
+    to_be_indexed = data_directory / "to_be_indexed" / "a_linac"
+    to_be_indexed.mkdir(parents=True)
+
+    fields = {
+        "0.trf": "1-1/AP G0",
+        "1.trf": "1-2/LAT G90",
+        "2.trf": "1-3/Not in Mosaiq",
+        "3.trf": "No label",
+    }
+    for seed, (filename, field) in enumerate(fields.items()):
+        to_be_indexed.joinpath(filename).write_bytes(
+            create_trf_contents(20, seed=seed, field=field)
+        )
+
+    to_be_indexed.joinpath("4.trf").write_bytes(b"not a logfile")
+
+    return to_be_indexed
+
+
+def index_logfiles(data_directory, **kwargs):
+    _index.index_logfiles(CENTRE_MAP, MACHINE_MAP, data_directory, **kwargs)
+
+    return json.loads((data_directory / "index.json").read_text())
+
+
+def test_index_logfiles(tmp_path, lookups):
+    to_be_indexed = write_logfiles(tmp_path)
+    index = index_logfiles(tmp_path, workers=3, compact_every=1)
+
+    # A single query for the three logfiles delivered on the same day
+    assert len(lookups) == 1
+    assert sorted(
+        entry["logfile_header"]["field_name"] for entry in index.values()
+    ) == [
+        "AP G0",
+        "LAT G90",
+    ]
+
+    for entry in index.values():
+        assert tmp_path.joinpath("indexed", entry["filepath"]).exists()
+
+    assert list(to_be_indexed.iterdir()) == []
+    for directory, filename in [
+        ("no_mosaiq_record_found", "2.trf"),
+        ("no_field_label_in_logfile", "3.trf"),
+        ("unknown_error_in_logfile", "4.trf"),
+    ]:
+        assert tmp_path.joinpath(directory, filename).exists()
+
+    assert not tmp_path.joinpath(_index.JOURNAL_FILENAME).exists()
+
+    # Logfiles already within the index are removed without a lookup
+    to_be_indexed.joinpath("0.trf").write_bytes(
+        create_trf_contents(20, seed=0, field="1-1/AP G0")
+    )
+    assert index_logfiles(tmp_path) == index
+    assert len(lookups) == 1
+    assert list(to_be_indexed.iterdir()) == []
+
+
+def test_interrupted_run_is_resumed(
+    tmp_path, lookups, looked_up_fields
+):  # pylint: disable = unused-argument
+    write_logfiles(tmp_path / "uninterrupted")
+    expected_index = index_logfiles(tmp_path / "uninterrupted", workers=1)
+
+    # An entry journaled without its logfile having been moved, followed by
+    # a partially written entry
+    filehash, entry = next(
+        (filehash, entry)
+        for filehash, entry in expected_index.items()
+        if entry["logfile_header"]["field_name"] == "AP G0"
+    )
+    data_directory = tmp_path / "interrupted"
+    to_be_indexed = write_logfiles(data_directory)
+    data_directory.joinpath(_index.JOURNAL_FILENAME).write_text(
+        json.dumps({filehash: entry}) + '\n{"a partial'
+    )
+    del looked_up_fields[:]
+
+    assert index_logfiles(data_directory) == expected_index
+    assert "AP G0" not in looked_up_fields
+    assert "LAT G90" in looked_up_fields
+    assert data_directory.joinpath("indexed", entry["filepath"]).exists()
+    assert list(to_be_indexed.iterdir()) == []
+
+
+def test_journal_is_compacted(tmp_path):
+    index_filepath = tmp_path / "index.json"
+    index = _index.LogfileIndex(index_filepath, compact_every=2)
+
+    for i in range(3):
+        index.append(str(i), {"filepath": str(i)})
+
+    assert list(json.loads(index_filepath.read_text())) == ["0", "1"]
+    assert list(_index.load_index(index_filepath)) == ["0", "1", "2"]
+
+    index.close()
+
+    assert list(json.loads(index_filepath.read_text())) == ["0", "1", "2"]
+    assert not tmp_path.joinpath(_index.JOURNAL_FILENAME).exists()
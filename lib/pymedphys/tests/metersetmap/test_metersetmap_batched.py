@@ -0,0 +1,90 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""The batched MetersetMap kernel should reproduce summing the MetersetMap
+of each control point interval in turn."""
+
+from pymedphys._imports import numpy as np
+
+from pymedphys._metersetmap.metersetmap import (
+    calc_metersetmap,
+    calc_single_control_point,
+    get_grid,
+)
+
+LEAF_PAIR_WIDTHS = (10, 5, 5, 5, 5, 5, 5, 10)
+MAX_LEAF_GAP = 60
+
+
+def create_delivery(num_control_points, seed):
+    rng = np.random.default_rng(seed)
+
+    mu = np.cumsum(np.concatenate([[0], rng.uniform(0, 2, num_control_points - 1)]))
+    mu[3] = mu[2]
+
+    left = rng.uniform(-25, 10, (num_control_points, len(LEAF_PAIR_WIDTHS)))
+    right = left + rng.uniform(-0.5, 20, left.shape)
+    mlc = np.stack([-left, right], axis=-1)
+
+    jaw = np.stack(
+        [
+            rng.uniform(-10, 25, num_control_points),
+            rng.uniform(-10, 25, num_control_points),
+        ],
+        axis=-1,
+    )
+    jaw = np.maximum(jaw, -np.flip(jaw, axis=-1) + 0.3)
+
+    return mu, mlc, jaw
+
+
+def metersetmap_by_control_point(mu, mlc, jaw, grid_resolution):
+    full_grid = get_grid(MAX_LEAF_GAP, grid_resolution, LEAF_PAIR_WIDTHS)
+    metersetmap = np.zeros((len(full_grid["jaw"]), len(full_grid["mlc"])))
+
+    for i in range(len(mu) - 1):
+        grid, metersetmap_of_slice = calc_single_control_point(
+            mlc[i : i + 2],
+            jaw[i : i + 2],
+            mu[i + 1] - mu[i],
+            leaf_pair_widths=LEAF_PAIR_WIDTHS,
+            grid_resolution=grid_resolution,
+        )
+
+        rows = np.round((grid["jaw"] - full_grid["jaw"][0]) / grid_resolution)
+        cols = np.round((grid["mlc"] - full_grid["mlc"][0]) / grid_resolution)
+        metersetmap[np.ix_(rows.astype(int), cols.astype(int))] += metersetmap_of_slice
+
+    return metersetmap
+
+
+def test_batched_matches_each_control_point():
+    for seed, grid_resolution in ((0, 1), (1, 0.5), (2, 2.5)):
+        mu, mlc, jaw = create_delivery(12, seed)
+
+        expected = metersetmap_by_control_point(mu, mlc, jaw, grid_resolution)
+
+        for ram_available in (None, 2**16):
+            metersetmap = calc_metersetmap(
+                mu,
+                mlc,
+                jaw,
+                grid_resolution=grid_resolution,
+                max_leaf_gap=MAX_LEAF_GAP,
+                leaf_pair_widths=LEAF_PAIR_WIDTHS,
+                ram_available=ram_available,
+            )
+
+            assert np.allclose(metersetmap, expected, atol=1e-9, rtol=0)
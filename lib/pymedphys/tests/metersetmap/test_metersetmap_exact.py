@@ -0,0 +1,83 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""The exactly time integrated MetersetMap should be the limit of the
+sampled MetersetMap as the number of time steps increases."""
+
+from pymedphys._imports import numpy as np
+from pymedphys._imports import pytest
+
+from pymedphys._metersetmap.intervals import _integral_of_clipped_line
+from pymedphys._metersetmap.metersetmap import calc_metersetmap
+
+from .test_metersetmap_batched import LEAF_PAIR_WIDTHS, MAX_LEAF_GAP, create_delivery
+
+
+def test_exact_is_limit_of_sampled():
+    for seed, grid_resolution in ((0, 1), (1, 0.5), (2, 2.5)):
+        mu, mlc, jaw = create_delivery(12, seed)
+        kwargs = dict(
+            grid_resolution=grid_resolution,
+            max_leaf_gap=MAX_LEAF_GAP,
+            leaf_pair_widths=LEAF_PAIR_WIDTHS,
+        )
+
+        exact = calc_metersetmap(mu, mlc, jaw, time_integration="exact", **kwargs)
+        assert np.allclose(
+            calc_metersetmap(
+                mu, mlc, jaw, time_integration="exact", ram_available=2**14, **kwargs
+            ),
+            exact,
+            atol=1e-9,
+            rtol=0,
+        )
+
+        errors = [
+            np.max(
+                np.abs(
+                    calc_metersetmap(
+                        mu, mlc, jaw, min_step_per_pixel=min_step_per_pixel, **kwargs
+                    )
+                    - exact
+                )
+            )
+            for min_step_per_pixel in (10, 100, 1000)
+        ]
+
+        assert errors[0] > errors[1] > errors[2]
+        assert errors[2] < 1e-3
+
+
+def test_integral_of_clipped_line():
+    alpha = np.array([-1, 0.5, 0.25, 2, 1.5, -0.5])
+    beta = np.array([0.5, 0, 0.5, -4, -1, 3])
+
+    expected = [0, 0.5, 0.5, 0.25 + 0.125, 0.5 + 0.375, 1 / 6 + 0.5]
+
+    assert np.allclose(_integral_of_clipped_line(alpha, beta), expected)
+
+
+def test_unknown_time_integration():
+    mu, mlc, jaw = create_delivery(4, 0)
+
+    with pytest.raises(ValueError):
+        calc_metersetmap(
+            mu,
+            mlc,
+            jaw,
+            max_leaf_gap=MAX_LEAF_GAP,
+            leaf_pair_widths=LEAF_PAIR_WIDTHS,
+            time_integration="trapezoid",
+        )
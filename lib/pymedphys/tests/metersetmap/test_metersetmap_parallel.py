@@ -0,0 +1,70 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Calculating a batch of MetersetMaps over a process pool should give the
+same MetersetMaps, in the same order, as calculating each in turn."""
+
+from pymedphys._imports import numpy as np
+
+import pymedphys
+
+from .test_metersetmap_batched import LEAF_PAIR_WIDTHS, MAX_LEAF_GAP, create_delivery
+
+KWARGS = dict(max_leaf_gap=MAX_LEAF_GAP, leaf_pair_widths=LEAF_PAIR_WIDTHS)
+
+
+def create_gantry_delivery():
+    mu, mlc, jaw = create_delivery(12, 3)
+    gantry = np.repeat([0, 90, 180], 4)
+
+    return pymedphys.Delivery(mu, gantry, np.zeros_like(gantry), mlc, jaw)
+
+
+def test_batch_matches_serial():
+    deliveries = [create_delivery(num, seed) for num, seed in ((5, 0), (9, 1), (7, 2))]
+    deliveries.append(create_gantry_delivery())
+
+    expected = [
+        pymedphys.metersetmap.calculate(mu, mlc, jaw, **KWARGS)
+        for mu, mlc, jaw in deliveries[:-1]
+    ]
+    expected.append(
+        pymedphys.metersetmap.calculate(
+            deliveries[-1].monitor_units,
+            deliveries[-1].mlc,
+            deliveries[-1].jaw,
+            **KWARGS,
+        )
+    )
+
+    for workers in (None, 2):
+        metersetmaps = pymedphys.metersetmap.calculate_batch(
+            deliveries, workers=workers, **KWARGS
+        )
+
+        assert len(metersetmaps) == len(expected)
+        for metersetmap, expected_metersetmap in zip(metersetmaps, expected):
+            assert np.array_equal(metersetmap, expected_metersetmap)
+
+
+def test_delivery_gantry_angles_over_workers():
+    delivery = create_gantry_delivery()
+
+    serial = delivery.metersetmap(gantry_angles=(0, 90, 180), **KWARGS)
+    parallel = delivery.metersetmap(gantry_angles=(0, 90, 180), workers=2, **KWARGS)
+
+    assert len(parallel) == 3
+    for parallel_metersetmap, serial_metersetmap in zip(parallel, serial):
+        assert np.array_equal(parallel_metersetmap, serial_metersetmap)
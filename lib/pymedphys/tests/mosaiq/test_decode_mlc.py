@@ -0,0 +1,109 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Decoding Mosaiq leaf sets should agree with unpacking each leaf in
+turn."""
+
+import struct
+
+from pymedphys._imports import numpy as np
+from pymedphys._imports import pandas as pd
+from pymedphys._imports import pytest
+
+from pymedphys._mosaiq import delivery
+from pymedphys._mosaiq.delivery import decode_msq_mlc
+
+
+def decode_by_leaf(raw_bytes):
+    if len(raw_bytes[0]) % 2 == 1:
+        raw_bytes = [item + b"\x00" for item in raw_bytes]
+
+    return (
+        np.array(
+            [
+                [
+                    struct.unpack("<h", control_point[2 * i : 2 * i + 2])
+                    for i in range(len(control_point) // 2)
+                ]
+                for control_point in raw_bytes
+            ]
+        )
+        / 100
+    )
+
+
+def create_leaf_sets(num_control_points=180, num_leaves=80, seed=0):
+    rng = np.random.default_rng(seed)
+    positions = rng.integers(-2000, 2000, (num_control_points, num_leaves))
+
+    return [row.astype("<i2").tobytes() for row in positions]
+
+
+def test_decode_matches_by_leaf():
+    raw_bytes = create_leaf_sets()
+    expected = decode_by_leaf(raw_bytes)
+
+    assert np.array_equal(decode_msq_mlc(raw_bytes), expected)
+    assert np.array_equal(decode_msq_mlc(np.array(raw_bytes, dtype=bytes)), expected)
+
+
+def test_odd_byte_workaround():
+    # A final leaf whose upper byte is null, which is otherwise lost
+    raw_bytes = [
+        leaf_set[:-2] + bytes([i + 1, 0])
+        for i, leaf_set in enumerate(create_leaf_sets())
+    ]
+    truncated = [leaf_set[:-1] for leaf_set in raw_bytes]
+    expected = decode_by_leaf(raw_bytes)
+
+    assert np.array_equal(decode_msq_mlc(truncated), expected)
+    assert np.array_equal(decode_msq_mlc(np.array(raw_bytes, dtype=bytes)), expected)
+
+
+def test_unequal_lengths():
+    raw_bytes = create_leaf_sets(num_control_points=3)
+    raw_bytes[1] = raw_bytes[1][:-2]
+
+    with pytest.raises(ValueError):
+        decode_msq_mlc(raw_bytes)
+
+
+def test_from_mosaiq_checks_leaf_set_lengths(monkeypatch):
+    raw_bytes = create_leaf_sets(num_control_points=2)
+    tx_field_points = pd.DataFrame(
+        {
+            "Index": [0.0, 1.0],
+            "A_Leaf_Set": raw_bytes,
+            "B_Leaf_Set": raw_bytes,
+            "Gantry_Ang": [180.0, 180.0],
+            "Coll_Ang": [0.0, 0.0],
+            "Coll_Y1": [5.0, 5.0],
+            "Coll_Y2": [5.0, 5.0],
+        }
+    )
+    monkeypatch.setattr(
+        delivery,
+        "delivery_data_sql",
+        lambda connection, field_id, cache=None: (100.0, tx_field_points),
+    )
+
+    mosaiq_delivery = delivery.DeliveryMosaiq.from_mosaiq(None, 1)
+    assert np.shape(mosaiq_delivery.mlc) == (2, 80, 2)
+
+    # Leaf sets which differ only by a trailing null byte, which a fixed
+    # width bytes array would pad to the same width
+    tx_field_points["A_Leaf_Set"] = [b"\x01\x00\x02", b"\x03\x00\x04\x00"]
+    with pytest.raises(ValueError):
+        delivery.DeliveryMosaiq.from_mosaiq(None, 1)
@@ -0,0 +1,136 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""The bulk delivery details lookup should agree with looking up each
+delivery in turn."""
+
+import datetime
+
+from pymedphys._imports import pytest
+
+from pymedphys._mosaiq import api
+from pymedphys._mosaiq.delivery import (
+    MultipleMosaiqEntries,
+    NoMosaiqEntries,
+    get_mosaiq_delivery_details,
+    get_mosaiq_delivery_details_bulk,
+)
+
+from . import _connect
+from .data import mimics
+from .test_mimicked_db import A_TREATMENT_DATETIME, FIELD_ID, FIELD_NAME, MACHINE_ID
+
+
+def treatment(patient_id, field_id, field_label, field_name, start, end):
+    return (patient_id, field_id, "PHANTOM", "A", False, 13, True) + (
+        field_label,
+        field_name,
+        datetime.datetime.fromisoformat(start),
+        datetime.datetime.fromisoformat(end),
+    )
+
+
+TREATMENTS = {
+    "2619": [
+        treatment(
+            "1", 10, "1-1", "AP G0", "2021-01-01 09:00:00", "2021-01-01 09:02:00"
+        ),
+        treatment(
+            "2", 20, "1-1", "AP G0", "2021-01-01 09:05:00", "2021-01-01 09:07:00"
+        ),
+        treatment(
+            "3", 30, "1-1", "AP G0", "2021-01-01 10:00:00", "2021-01-01 10:02:00"
+        ),
+        treatment(
+            "4", 40, "1-1", "AP G0", "2021-01-01 10:00:30", "2021-01-01 10:02:30"
+        ),
+        treatment("5", 50, "2-1 ", "lat", "2021-01-02 09:00:00", "2021-01-02 09:02:00"),
+    ],
+    "2694": [
+        treatment(
+            "6", 60, "1-1", "AP G0", "2021-01-01 09:00:00", "2021-01-01 09:02:00"
+        ),
+    ],
+}
+
+
+@pytest.fixture
+def queries(monkeypatch):
+    queried = []
+
+    def execute(connection, query, parameters=None):
+        queried.append(parameters)
+
+        start = datetime.datetime.fromisoformat(parameters["window_start"])
+        end = datetime.datetime.fromisoformat(parameters["window_end"])
+        buffer = datetime.timedelta(seconds=parameters["buffer"])
+
+        return [
+            row
+            for row in TREATMENTS[parameters["machine"]]
+            if row[9] <= end + buffer and row[10] >= start - buffer
+        ]
+
+    monkeypatch.setattr(api, "execute", execute)
+
+    return queried
+
+
+def test_bulk_lookup(queries):
+    deliveries = [
+        ("2619", "2021-01-01 09:01:00", "1-1", "AP G0"),
+        # Disagrees within the buffer but not without it
+        ("2619", "2021-01-01 09:02:00", "1-1", "AP G0"),
+        # Disagrees even without the buffer
+        ("2619", "2021-01-01 10:01:00", "1-1", "AP G0"),
+        ("2619", "2021-01-01 12:00:00", "1-1", "AP G0"),
+        # Matched as MSSQL would, ignoring case and trailing spaces
+        ("2619", "2021-01-02 09:01:00", "2-1", "LAT"),
+        ("2694", "2021-01-01 09:01:00", "1-1", "AP G0"),
+    ]
+
+    results = get_mosaiq_delivery_details_bulk(None, deliveries, buffer=240)
+
+    # One query for each machine and date
+    assert len(queries) == 3
+
+    assert results[0].patient_id == "1"
+    assert results[0].field_type == "VMAT"
+    assert results[1].patient_id == "1"
+    assert isinstance(results[2], MultipleMosaiqEntries)
+    assert isinstance(results[3], NoMosaiqEntries)
+    assert results[4].field_id == 50
+    assert results[5].patient_id == "6"
+
+
+@pytest.mark.mosaiqdb
+def test_bulk_lookup_agrees_with_single_lookups():
+    mimics.create_db_with_tables()
+    connection = _connect.connect(database=mimics.DATABASE)
+
+    deliveries = [
+        (MACHINE_ID, A_TREATMENT_DATETIME, "1-1", FIELD_NAME),
+        (MACHINE_ID, "2020-04-27 23:00:00", "1-1", FIELD_NAME),
+    ]
+    results = get_mosaiq_delivery_details_bulk(connection, deliveries, buffer=240)
+
+    assert results[0].field_id == FIELD_ID
+    assert results[0] == get_mosaiq_delivery_details(
+        connection, *deliveries[0], buffer=240
+    )
+
+    assert isinstance(results[1], NoMosaiqEntries)
+    with pytest.raises(NoMosaiqEntries):
+        get_mosaiq_delivery_details(connection, *deliveries[1], buffer=240)
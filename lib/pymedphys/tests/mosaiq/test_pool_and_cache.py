@@ -0,0 +1,174 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""The Mosaiq connection pool and query cache, with stand in connections
+which record the queries made with them."""
+
+import threading
+import time
+from concurrent import futures
+
+from pymedphys._imports import pytest
+
+import pymedphys
+from pymedphys._mosaiq import connect as _connect
+
+
+class _Cursor:
+    def __init__(self, connection):
+        self._connection = connection
+
+    def execute(self, query, parameters=None):
+        if self._connection.broken:
+            raise ConnectionError("The connection was lost")
+
+        self._connection.queries.append((query, parameters))
+
+    def fetchall(self):
+        return [(len(self._connection.queries),)]
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+class _Connection:
+    def __init__(self, hostname="msq"):
+        self.server = (hostname, 1433, "MOSAIQ")
+        self.queries = []
+        self.broken = False
+        self.closed = False
+
+    def cursor(self):
+        return _Cursor(self)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def created(monkeypatch):
+    connections = []
+
+    def connect_with_credentials(**kwargs):
+        connections.append(_Connection(kwargs["hostname"]))
+        return connections[-1]
+
+    monkeypatch.setattr(_connect, "connect_with_credentials", connect_with_credentials)
+
+    return connections
+
+
+def create_pool(**kwargs):
+    return pymedphys.mosaiq.ConnectionPool(
+        "msq", username="user", password="pass", **kwargs
+    )
+
+
+def test_pool_is_bounded_and_reused(created):
+    pool = create_pool(max_size=2)
+    in_use = []
+    max_in_use = [0]
+    lock = threading.Lock()
+
+    def borrow(_):
+        with pool.connection() as connection:
+            with lock:
+                in_use.append(connection)
+                max_in_use[0] = max(max_in_use[0], len(in_use))
+
+            time.sleep(0.01)
+
+            with lock:
+                in_use.remove(connection)
+
+    with futures.ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(borrow, range(32)))
+
+    assert max_in_use[0] <= 2
+    assert len(created) <= 2
+    assert pool.size == len(created)
+
+    with pool.connection():
+        with pool.connection():
+            with pytest.raises(TimeoutError):
+                with pool.connection(timeout=0.01):
+                    pass
+
+    pool.close()
+    assert all(connection.closed for connection in created)
+
+    with pytest.raises(ValueError):
+        with pool.connection():
+            pass
+
+
+def test_broken_connections_are_replaced(created):
+    with create_pool(max_size=1) as pool:
+        with pytest.raises(ConnectionError):
+            with pool.connection() as connection:
+                connection.broken = True
+                pymedphys.mosaiq.execute(connection, "SELECT Pat_ID1 FROM Patient")
+
+        with pool.connection() as connection:
+            assert connection is created[1]
+
+        # Healthy connections are only checked once they have been idle
+        pool.health_check_interval = 0
+        with pool.connection() as connection:
+            assert connection is created[1]
+
+        assert [query for query, _ in created[1].queries] == ["SELECT 1"]
+
+
+def test_query_cache():
+    cache = pymedphys.mosaiq.QueryCache(max_size=2)
+    connection = _Connection()
+    query = "SELECT FLD_ID FROM TxField WHERE FLD_ID = %(field_id)s"
+
+    def execute(field_id, a_connection=connection):
+        return pymedphys.mosaiq.execute(
+            a_connection, query, {"field_id": field_id}, cache=cache
+        )
+
+    assert execute(1) == execute(1)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Results are cached per server
+    execute(1, a_connection=_Connection(hostname="another"))
+    assert cache.misses == 2
+
+    # The least recently used result is evicted
+    execute(2)
+    execute(1)
+    assert cache.misses == 4
+
+    cache.invalidate(query, {"field_id": 2})
+    execute(1)
+    execute(2)
+    assert cache.misses == 5
+
+    cache.invalidate()
+    assert len(cache) == 0
+
+    expiring_cache = pymedphys.mosaiq.QueryCache(ttl=0)
+    pymedphys.mosaiq.execute(connection, query, {"field_id": 1}, cache=expiring_cache)
+    pymedphys.mosaiq.execute(connection, query, {"field_id": 1}, cache=expiring_cache)
+    assert expiring_cache.misses == 2
@@ -0,0 +1,75 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Create synthetic TRF files in the layout expected by the decoder, for
+tests which don't require real logfiles."""
+
+from pymedphys._imports import numpy as np
+
+from pymedphys._trf.decode.constants import CONFIG
+
+MLC_STATUS_ITEM_PART = "2170_111"
+
+
+def create_trf_contents(num_rows=100, version=4, seed=0, field="1-1/AP G0"):
+    rng = np.random.default_rng(seed)
+
+    item_part_keys = [
+        key
+        for key in CONFIG["item_part_names"]
+        if version == 4 or key != MLC_STATUS_ITEM_PART
+    ]
+    item_parts = np.array(
+        [int(part) for key in item_part_keys for part in key.split("_")],
+        dtype=np.int16,
+    )
+
+    header = b"".join(
+        [
+            b"\x00",
+            b"20/09/24 06:29:58 Z",
+            b"\x00",
+            b"+02:00",
+            b"\x00",
+            field.encode(),
+            b"\x00",
+            b"2619",
+            np.array([100], dtype=np.float64).tobytes(),
+            np.array([version, len(item_part_keys)], dtype=np.int32).tobytes(),
+            item_parts.tobytes(),
+        ]
+    )
+
+    config = CONFIG["version_row"][str(version)]
+    values = rng.integers(-2000, 2000, (num_rows, len(item_part_keys)))
+
+    names = [CONFIG["item_part_names"][key] for key in item_part_keys]
+    values[:, names.index("Linac State/Actual Value (None)")] = rng.choice(
+        [int(code) for code in CONFIG["linac_state_codes"]], num_rows
+    )
+    values[:, names.index("Wedge Position/Actual Value (None)")] = rng.choice(
+        [int(code) for code in CONFIG["wedge_codes"]], num_rows
+    )
+
+    values = values.astype(config["dtype"])
+
+    table = values.view(np.uint8).reshape(num_rows, -1)
+    if version > 1:
+        timestamps = rng.integers(0, 2**62, num_rows, dtype=np.int64)
+        table = np.concatenate(
+            [timestamps.view(np.uint8).reshape(num_rows, 8), table], axis=1
+        )
+
+    return header + table.tobytes()
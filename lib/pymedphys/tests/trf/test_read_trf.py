@@ -0,0 +1,82 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Reading a subset of the columns and rows of a memory mapped TRF should
+agree with selecting them from the fully decoded table."""
+
+from pymedphys._imports import pandas as pd
+from pymedphys._imports import pytest
+
+from pymedphys._trf.decode.constants import GANTRY_NAME
+from pymedphys._trf.decode.delivery import DeliveryLogfile
+from pymedphys._trf.decode.trf2pandas import read_trf
+
+from ._synthetic import create_trf_contents
+
+
+@pytest.fixture
+def trf_path(tmp_path):
+    path = tmp_path / "synthetic.trf"
+    path.write_bytes(create_trf_contents(300, version=4))
+
+    return path
+
+
+def test_path_and_file_agree(trf_path):
+    header, table = read_trf(trf_path)
+
+    with open(trf_path, "rb") as f:
+        file_header, file_table = read_trf(f)
+
+    pd.testing.assert_frame_equal(header, file_header)
+    pd.testing.assert_frame_equal(table, file_table)
+
+
+def test_column_and_row_selection(trf_path):
+    _, table = read_trf(trf_path)
+
+    columns = ["unknown2", "Y2 Leaf 3/Scaled Actual (mm)", GANTRY_NAME]
+    _, selected = read_trf(trf_path, columns=columns)
+    pd.testing.assert_frame_equal(selected, table[columns])
+
+    for rows in (slice(100, 150), slice(-20, None), slice(5, 200, 7), slice(10, 10)):
+        _, selected = read_trf(trf_path, columns=[GANTRY_NAME], rows=rows)
+        pd.testing.assert_frame_equal(selected, table[[GANTRY_NAME]].iloc[rows])
+
+
+def test_invalid_selections(trf_path):
+    with pytest.raises(ValueError):
+        read_trf(trf_path, columns=["Not a column"])
+
+    with pytest.raises(ValueError):
+        read_trf(trf_path, rows=slice(None, None, -1))
+
+
+def test_empty_file(tmp_path):
+    empty_path = tmp_path / "empty.trf"
+    empty_path.write_bytes(b"")
+
+    with pytest.raises(ValueError, match="Unexpected header content found"):
+        read_trf(empty_path, cache=False)
+
+    with open(empty_path, "rb") as f:
+        with pytest.raises(ValueError, match="Unexpected header content found"):
+            read_trf(f, cache=False)
+
+
+def test_delivery_from_trf(trf_path):
+    _, table = read_trf(trf_path)
+
+    assert DeliveryLogfile.from_trf(trf_path) == DeliveryLogfile._from_pandas(table)
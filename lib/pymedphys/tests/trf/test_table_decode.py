@@ -0,0 +1,92 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""The structured dtype table decoder should agree exactly with decoding
+the table row by row."""
+
+import time
+
+from pymedphys._imports import pandas as pd
+from pymedphys._imports import pytest
+
+from pymedphys._trf.decode.partition import split_into_header_table
+from pymedphys._trf.decode.table import decode_trf_table, decode_trf_table_by_row
+from pymedphys._trf.decode.trf2pandas import header_as_dataframe
+
+from ._synthetic import create_trf_contents
+
+
+def split_synthetic_trf(num_rows, version):
+    trf_header_contents, trf_table_contents = split_into_header_table(
+        create_trf_contents(num_rows, version, seed=version)
+    )
+    header_dataframe = header_as_dataframe(trf_header_contents)
+
+    return trf_table_contents, header_dataframe
+
+
+def decode_by_row(trf_table_contents, header_dataframe):
+    return decode_trf_table_by_row(
+        trf_table_contents,
+        header_dataframe["version"].values[0],
+        header_dataframe["item_parts_length"].values[0],
+        header_dataframe["item_parts"].values[0],
+    )
+
+
+@pytest.mark.parametrize("version", [1, 2, 3, 4])
+def test_structured_decode_matches_row_by_row(version):
+    trf_table_contents, header_dataframe = split_synthetic_trf(200, version)
+
+    decoded = decode_trf_table(trf_table_contents, header_dataframe)
+    expected = decode_by_row(trf_table_contents, header_dataframe)
+
+    pd.testing.assert_frame_equal(decoded, expected, check_exact=True)
+    assert decoded.to_csv() == expected.to_csv()
+
+
+def test_final_row_cut_short():
+    trf_table_contents, header_dataframe = split_synthetic_trf(20, 4)
+
+    complete = decode_trf_table(trf_table_contents, header_dataframe)
+    cut_short = decode_trf_table(trf_table_contents[:-400], header_dataframe)
+
+    assert len(cut_short) == len(complete)
+    assert cut_short.iloc[-1].isna().any()
+    pd.testing.assert_frame_equal(
+        cut_short.iloc[:-1], complete.iloc[:-1], check_dtype=False
+    )
+
+
+@pytest.mark.slow
+def test_decoder_throughput():
+    for version in (1, 4):
+        trf_table_contents, header_dataframe = split_synthetic_trf(5000, version)
+        megabytes = len(trf_table_contents) / 2**20
+
+        start = time.perf_counter()
+        decode_trf_table(trf_table_contents, header_dataframe)
+        structured = time.perf_counter() - start
+
+        start = time.perf_counter()
+        decode_by_row(trf_table_contents, header_dataframe)
+        by_row = time.perf_counter() - start
+
+        print(
+            f"Version {version}: structured {megabytes / structured:.1f} MB/s, "
+            f"row by row {megabytes / by_row:.1f} MB/s"
+        )
+
+        assert structured < by_row / 10
@@ -0,0 +1,119 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Batch conversion of trf files should match converting each in turn,
+skipping those already converted and recording those that fail."""
+
+import argparse
+
+from pymedphys._imports import pandas as pd
+from pymedphys._imports import pytest
+
+from pymedphys._trf.decode import trf2pandas as _trf2pandas
+from pymedphys._trf.decode.cache import DecodedTrfCache
+from pymedphys._trf.decode.trf2csv import trf2csv, trf2csv_batch, trf2csv_by_directory
+from pymedphys.cli.trf import trf_cli
+
+from ._synthetic import create_trf_contents
+
+
+@pytest.fixture
+def trf_paths(tmp_path):
+    paths = []
+    for seed in range(3):
+        path = tmp_path / f"{seed}.trf"
+        path.write_bytes(create_trf_contents(50, version=4, seed=seed))
+        paths.append(path)
+
+    return paths
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_batch_matches_single_conversion(trf_paths, tmp_path, workers):
+    corrupt_path = tmp_path / "corrupt.trf"
+    corrupt_path.write_bytes(b"not a logfile")
+
+    batch_directory = tmp_path / "batch"
+    batch_directory.mkdir()
+    result = trf2csv_batch(
+        trf_paths + [corrupt_path], output_directory=batch_directory, workers=workers
+    )
+
+    assert sorted(result.converted) == sorted(trf_paths)
+    assert result.skipped == []
+    assert list(result.failed) == [corrupt_path]
+
+    for path in trf_paths:
+        _, table_filepath = trf2csv(path)
+        expected = pd.read_csv(table_filepath, index_col=0)
+        converted = pd.read_csv(batch_directory / table_filepath.name, index_col=0)
+
+        pd.testing.assert_frame_equal(converted, expected)
+
+
+def test_up_to_date_files_are_skipped(trf_paths):
+    trf2csv_batch(trf_paths[:2])
+
+    result = trf2csv_batch(trf_paths)
+    assert result.converted == trf_paths[2:]
+    assert result.skipped == trf_paths[:2]
+
+    result = trf2csv_batch(trf_paths, skip_up_to_date=False)
+    assert result.converted == trf_paths
+
+
+def test_decoded_cache_is_not_used(trf_paths, tmp_path, monkeypatch):
+    decoded_cache = DecodedTrfCache(tmp_path / "decoded_cache")
+    monkeypatch.setattr(_trf2pandas, "get_default_cache", lambda: decoded_cache)
+
+    result = trf2csv_batch(trf_paths)
+
+    assert result.converted == trf_paths
+    assert not decoded_cache.directory.exists()
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_by_directory_raises_on_failure(trf_paths, tmp_path, workers):
+    output_directory = tmp_path / "output"
+    output_directory.mkdir()
+
+    result = trf2csv_by_directory(tmp_path, output_directory, workers=workers)
+    assert sorted(result.converted) == sorted(str(path) for path in trf_paths)
+    assert result.failed == {}
+
+    (tmp_path / "corrupt.trf").write_bytes(b"not a logfile")
+    with pytest.raises(ValueError):
+        trf2csv_by_directory(tmp_path, output_directory, workers=workers)
+
+
+def test_invalid_output_format(trf_paths):
+    with pytest.raises(ValueError):
+        trf2csv_batch(trf_paths, output_format="xlsx")
+
+
+def test_cli(trf_paths, tmp_path):
+    parser = argparse.ArgumentParser()
+    trf_cli(parser.add_subparsers())
+    args = parser.parse_args(
+        ["trf", "to-csv", str(tmp_path / "*.trf"), "--workers", "1"]
+    )
+    args.func(args)
+
+    for path in trf_paths:
+        assert path.with_name(f"{path.stem}_table.csv").exists()
+
+    (tmp_path / "corrupt.trf").write_bytes(b"not a logfile")
+    with pytest.raises(SystemExit):
+        args.func(args)
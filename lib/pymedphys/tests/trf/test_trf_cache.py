@@ -0,0 +1,153 @@
+# Copyright (C) 2026 PyMedPhys Contributors
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Logfiles read through the decoded TRF cache should agree with decoding
+them directly."""
+
+import os
+
+from pymedphys._imports import pandas as pd
+from pymedphys._imports import pytest
+
+from pymedphys._data import hashcache
+from pymedphys._trf.decode import cache as _cache
+from pymedphys._trf.decode import trf2pandas as _trf2pandas
+from pymedphys._trf.decode.constants import GANTRY_NAME
+from pymedphys._trf.decode.delivery import DeliveryLogfile
+from pymedphys._trf.decode.trf2pandas import read_trf
+
+from ._synthetic import create_trf_contents
+
+
+@pytest.fixture
+def trf_path(tmp_path):
+    path = tmp_path / "synthetic.trf"
+    path.write_bytes(create_trf_contents(300, version=4))
+
+    return path
+
+
+@pytest.fixture
+def decoded_cache(tmp_path):
+    return _cache.DecodedTrfCache(tmp_path / "decoded_cache")
+
+
+def assert_read_equal(trf, decoded_cache, **kwargs):
+    header, table = read_trf(trf, cache=False, **kwargs)
+    cached_header, cached_table = read_trf(trf, cache=decoded_cache, **kwargs)
+
+    pd.testing.assert_frame_equal(header, cached_header)
+    pd.testing.assert_frame_equal(table, cached_table)
+
+
+def test_cache_round_trip(trf_path, decoded_cache):
+    for _ in range(2):
+        assert_read_equal(trf_path, decoded_cache)
+        assert_read_equal(
+            trf_path, decoded_cache, columns=[GANTRY_NAME], rows=slice(10, 100, 3)
+        )
+
+        with open(trf_path, "rb") as f:
+            assert_read_equal(f, decoded_cache)
+
+    assert len(list(decoded_cache.directory.glob("*.npz"))) == 1
+
+    with pytest.raises(ValueError):
+        read_trf(trf_path, columns=["Not a column"], cache=decoded_cache)
+
+
+def test_cache_hit_does_not_decode(trf_path, decoded_cache, monkeypatch):
+    read_trf(trf_path, cache=decoded_cache)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("The TRF should not have been decoded")
+
+    monkeypatch.setattr(_trf2pandas, "_decode_trf_contents", fail)
+    _, table = read_trf(trf_path, columns=[GANTRY_NAME], cache=decoded_cache)
+
+    assert list(table.columns) == [GANTRY_NAME]
+
+
+def test_unchanged_file_is_not_rehashed(trf_path, decoded_cache, monkeypatch):
+    read_trf(trf_path, cache=decoded_cache)
+    decoded_cache.verified_hashes.save()
+    assert decoded_cache.verified_hashes.filepath.exists()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("The TRF should not have been hashed again")
+
+    monkeypatch.setattr(hashcache, "hash_file", fail)
+    reloaded_cache = _cache.DecodedTrfCache(decoded_cache.directory)
+
+    assert_read_equal(trf_path, reloaded_cache)
+
+
+def test_decoder_version_invalidates(trf_path, decoded_cache, monkeypatch):
+    read_trf(trf_path, cache=decoded_cache)
+    monkeypatch.setattr(_cache, "DECODER_VERSION", _cache.DECODER_VERSION + 1)
+
+    file_hash = decoded_cache.hash_file(trf_path)
+    assert decoded_cache.load(file_hash) is None
+
+
+def test_corrupt_entry_is_replaced(trf_path, decoded_cache):
+    read_trf(trf_path, cache=decoded_cache)
+
+    filepath = decoded_cache.filepath(decoded_cache.hash_file(trf_path))
+    filepath.write_bytes(b"not a decoded logfile")
+
+    assert_read_equal(trf_path, decoded_cache)
+    assert decoded_cache.load(decoded_cache.hash_file(trf_path)) is not None
+
+
+def test_least_recently_used_are_evicted(tmp_path, decoded_cache):
+    paths = []
+    for seed in range(3):
+        path = tmp_path / f"{seed}.trf"
+        path.write_bytes(create_trf_contents(300, version=4, seed=seed))
+        paths.append(path)
+
+    read_trf(paths[0], cache=decoded_cache)
+    entry_size = (
+        decoded_cache.filepath(decoded_cache.hash_file(paths[0])).stat().st_size
+    )
+    decoded_cache.max_bytes = int(2.5 * entry_size)
+
+    read_trf(paths[1], cache=decoded_cache)
+    stored = {
+        path: decoded_cache.filepath(decoded_cache.hash_file(path)) for path in paths
+    }
+
+    # Use the first so that the second is the least recently used
+    read_trf(paths[0], cache=decoded_cache)
+    mtime = stored[paths[1]].stat().st_mtime + 10
+    os.utime(stored[paths[0]], (mtime, mtime))
+
+    read_trf(paths[2], cache=decoded_cache)
+
+    assert stored[paths[0]].exists()
+    assert not stored[paths[1]].exists()
+    assert stored[paths[2]].exists()
+
+
+def test_delivery_from_trf_with_cache(trf_path, decoded_cache, monkeypatch):
+    expected = DeliveryLogfile.from_trf(trf_path)
+
+    monkeypatch.setattr(_cache, "get_default_cache", lambda: decoded_cache)
+    monkeypatch.setattr(_trf2pandas, "get_default_cache", lambda: decoded_cache)
+
+    assert DeliveryLogfile.from_trf(trf_path) == expected
+    assert DeliveryLogfile.from_trf(trf_path) == expected
+    assert len(list(decoded_cache.directory.glob("*.npz"))) == 1